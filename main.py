@@ -36,18 +36,27 @@ def process_invoice(pipeline: InvoicePipeline,
                    input_file: str,
                    config: Dict[str, Any],
                    output_path: Optional[str] = None,
-                   use_french: bool = False) -> ProcessingResult:
-    try:
-        # Read input file (PDF or markdown)
-        markdown_content, converted_markdown_path = read_input_file(input_file, config)
-        
-    except Exception as e:
-        return ProcessingResult(success=False, output_path=None, 
-                              error=str(e))
+                   use_french: bool = False,
+                   resume: bool = False,
+                   document_key: Optional[str] = None) -> ProcessingResult:
+    # Large markdown files are chunked straight from a memory map
+    if pipeline.can_stream(input_file):
+        print(f"Streaming markdown input: {input_file} ({Path(input_file).stat().st_size} bytes)")
+        result = pipeline.process_invoice(resume=resume, document_key=document_key,
+                                          input_path=input_file)
+        converted_markdown_path = None
+    else:
+        try:
+            # Read input file (PDF or markdown)
+            markdown_content, converted_markdown_path = read_input_file(input_file, config)
+            
+        except Exception as e:
+            return ProcessingResult(success=False, output_path=None, 
+                                  error=str(e))
 
-    # Process the invoice
-    print(f"Processing content ({len(markdown_content)} characters)...")
-    result = pipeline.process_invoice(markdown_content)
+        # Process the invoice
+        print(f"Processing content ({len(markdown_content)} characters)...")
+        result = pipeline.process_invoice(markdown_content, resume=resume, document_key=document_key)
     
     if result["processing_errors"]:
         errors = "\n".join(result["processing_errors"])
@@ -114,6 +123,9 @@ def main():
     parser.add_argument('--french-output', action='store_true', help='Use French translated output')
     parser.add_argument('--save-markdown', action='store_true', help='Save converted markdown (for PDF inputs)')
     parser.add_argument('--keep-converted', action='store_true', help='Keep converted markdown file after processing')
+    parser.add_argument('--resume', action='store_true', help='Resume from checkpoints of a previous run on the same document and config')
+    parser.add_argument('--incremental', action='store_true', help='Reprocess only chunks changed since the previous revision')
+    parser.add_argument('--document-key', help='Key identifying the document across revisions (default: input file name)')
     
     args = parser.parse_args()
     
@@ -140,7 +152,9 @@ def main():
             input_file=args.input_file,
             config=config,
             output_path=args.output,
-            use_french=args.french_output
+            use_french=args.french_output,
+            resume=args.resume,
+            document_key=(args.document_key or Path(args.input_file).stem) if args.incremental else None
         )
         
         if result.success:
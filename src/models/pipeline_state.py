@@ -4,7 +4,9 @@ from typing import List, Dict, Any, Optional
 from .invoice_models import ProcessedOffer
 
 class PipelineState(TypedDict):
+    run_id: str
     raw_markdown: str
+    input_path: Optional[str]
     translated_markdown: Optional[str]
     overlapping_chunks: List[Dict[str, Any]]
     structure_with_delimiters: Optional[Dict[str, Any]]
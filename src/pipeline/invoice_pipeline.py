@@ -1,14 +1,35 @@
 # src/pipeline/invoice_pipeline.py
+import asyncio
 import json
+import threading
+import uuid
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Iterator
 from datetime import datetime
 from langgraph.graph import StateGraph, END
 from ..models.pipeline_state import PipelineState
-from ..processors.markdown_chunker import MarkdownChunker
+from ..processors.markdown_chunker import MarkdownChunker, ChunkView, compute_chunk_token_budget
 from ..processors.structure_delimiter_extractor import StructureDelimiterExtractor
 from ..processors.section_detail_analyzer import SectionDetailAnalyzer
 from ..processors.translator import DocumentTranslator
+from ..models.invoice_models import ProcessedOffer
+from ..processors.incremental_updater import IncrementalUpdater
+from ..processors.boilerplate_stripper import BoilerplateStripper
+from ..utils.checkpoint_store import CheckpointStore
+from ..utils.io import is_pdf_file
+
+@dataclass
+class PipelineRun:
+    """Per-document state of one process_invoice call"""
+    run_id: str
+    results_dir: Path
+    resume: bool = False
+    checkpoints: Optional[CheckpointStore] = None
+    incremental: Optional[IncrementalUpdater] = None
+    # Memory-mapped input when chunks are streamed from a file
+    document_buffer: Any = None
 
 class InvoicePipeline:
     def __init__(self, config: Dict[str, Any]):
@@ -18,14 +39,26 @@ class InvoicePipeline:
         self.results_dir = Path(config.get('results_dir', 'pipeline_results'))
         self.results_dir.mkdir(parents=True, exist_ok=True)
         
-        # Add timestamp to results
-        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
         # Initialize processors
         self.markdown_chunker = MarkdownChunker(config)
         self.offer_item_extractor = StructureDelimiterExtractor(config)  # Formerly structure_extractor
         self.section_analyzer = SectionDetailAnalyzer(config)  # Update these variable names for consistency
         self.translator = DocumentTranslator(config)
+        # Running headers/footers repeated on every page are removed before chunking
+        self.boilerplate_stripper = BoilerplateStripper(config) if config.get('strip_boilerplate', False) else None
+        
+        # Size chunks from the model context instead of a fixed character count
+        if config.get('chunk_sizing', 'characters') == 'tokens':
+            self.markdown_chunker.set_token_budget(compute_chunk_token_budget(
+                config, self.offer_item_extractor.prompt_overhead_tokens()
+            ))
+        
+        # Checkpoints are scoped to the document being processed
+        self.enable_checkpoints = config.get('enable_checkpoints', True)
+        
+        # Documents in progress by run_id; processors are shared between runs
+        self._runs: Dict[str, PipelineRun] = {}
+        self._runs_lock = threading.Lock()
         
         # Build the graph
         self.graph = self._build_graph()
@@ -39,6 +72,8 @@ class InvoicePipeline:
         print(f"  Structure Model: {self.config.get('structure_model', 'llama3.2:3b')}")
         print(f"  Analysis Model: {self.config.get('analysis_model', 'llama3.2:7b')}")
         print(f"  Max Chunk Size: {self.config.get('max_chunk_size', 2000)} characters")
+        if self.markdown_chunker.token_budget:
+            print(f"  Chunk Token Budget: {self.markdown_chunker.token_budget} tokens")
         print()
 
     def _build_graph(self) -> StateGraph:
@@ -64,16 +99,25 @@ class InvoicePipeline:
     
     def _translate_to_english_node(self, state: PipelineState) -> PipelineState:
         """Optional Phase 0: Translate French markdown to English"""
+        run = self._get_run(state)
         try:
             if self.config.get('enable_translation', False):
+                checkpoint = self._load_checkpoint(run, '0_translation')
+                if checkpoint is not None:
+                    state["translated_markdown"] = checkpoint["translated_markdown"]
+                    return state
+                
                 print("Phase 0: Translating document to English...")
                 translated_markdown = self.translator.translate_markdown_to_english(
                     state["raw_markdown"]
                 )
                 state["translated_markdown"] = translated_markdown
                 print(f"  Translation completed")
+                if translated_markdown is not None:
+                    self._save_checkpoint(run, '0_translation', {"translated_markdown": translated_markdown})
                 # Save analysis result
                 self._save_intermediate_result(
+                    run,
                     self._get_result_filename('0_translation'),
                     translated_markdown
                 )
@@ -88,19 +132,44 @@ class InvoicePipeline:
     
     def _chunk_markdown_node(self, state: PipelineState) -> PipelineState:
         """Phase 1: Create overlapping chunks from markdown"""
+        run = self._get_run(state)
         try:
-            print("Phase 1: Creating overlapping markdown chunks...")
-            
             # Use translated content if available, otherwise original
             content_to_chunk = state["translated_markdown"] or state["raw_markdown"]
+            if state["input_path"]:
+                content_to_chunk = run.document_buffer
+            
+            checkpoint = self._load_checkpoint(run, '1_chunks')
+            if checkpoint is not None:
+                try:
+                    state["overlapping_chunks"] = [ChunkView.from_dict(content_to_chunk, record)
+                                                   for record in checkpoint]
+                    return state
+                except ValueError as e:
+                    print(f"Warning: Ignoring chunk checkpoint, rechunking: {e}")
+            
+            if state["input_path"]:
+                # Chunks are produced lazily while Phase 2 consumes them
+                print("Phase 1: Streaming markdown chunks into structure extraction...")
+                return state
+            if self.markdown_chunker.uses_feedback:
+                # Chunk boundaries follow the items Phase 2 completes
+                print("Phase 1: Chunk boundaries deferred to structure extraction (adaptive overlap)")
+                return state
             
+            print("Phase 1: Creating overlapping markdown chunks...")
+            
+            # Chunks are offset views over content_to_chunk, saved without content
             overlapping_chunks = self.markdown_chunker.create_overlapping_chunks(content_to_chunk)
             state["overlapping_chunks"] = overlapping_chunks
+            chunk_records = [chunk.to_dict() for chunk in overlapping_chunks]
+            self._save_checkpoint(run, '1_chunks', chunk_records)
             
             # Save chunks result
             self._save_intermediate_result(
+                run,
                 self._get_result_filename('1_chunks'), 
-                overlapping_chunks
+                chunk_records
             )
         except Exception as e:
             state["processing_errors"].append(f"Markdown chunking error: {str(e)}")
@@ -109,19 +178,54 @@ class InvoicePipeline:
     
     def _extract_structure_delimiters_node(self, state: PipelineState) -> PipelineState:
         """Phase 2: Extract offer items structure"""
+        run = self._get_run(state)
         try:
-            if state["overlapping_chunks"]:
+            checkpoint = self._load_checkpoint(run, '2_structure')
+            if checkpoint is not None:
+                state["structure_with_delimiters"] = checkpoint["structure_with_delimiters"]
+                if run.incremental:
+                    run.incremental.record_structure_chunks(state["overlapping_chunks"],
+                                                             checkpoint["structure_chunks"])
+                return state
+            
+            streaming = (state["input_path"] or self.markdown_chunker.uses_feedback) \
+                and not state["overlapping_chunks"]
+            if state["overlapping_chunks"] or streaming:
+                # Unchanged chunks of a previous revision skip the LLM
+                cached_chunk_items = {}
+                if run.incremental:
+                    cached_chunk_items = run.incremental.reusable_chunk_items(state["overlapping_chunks"])
+                
+                # Adaptive chunking starts each chunk after the last complete item
+                completed_offsets = {}
+                def record_completed_offset(chunk, chunk_items):
+                    completed_offsets[chunk['chunk_index']] = \
+                        self.offer_item_extractor.last_complete_item_end(chunk, chunk_items)
+                
                 structure_with_delimiters, structure_chunks = self.offer_item_extractor.extract_structure_from_chunks(
-                    state["overlapping_chunks"]
+                    self._stream_chunks(run, state, completed_offsets) if streaming else state["overlapping_chunks"],
+                    cached_chunk_items=cached_chunk_items,
+                    on_chunk_extracted=record_completed_offset if streaming else None
                 )
+                if streaming:
+                    self._finish_streamed_chunks(run, state["overlapping_chunks"])
+                if run.incremental:
+                    run.incremental.record_structure_chunks(state["overlapping_chunks"], structure_chunks)
+                    run.incremental.assign_stable_ids(structure_with_delimiters)
                 state["structure_with_delimiters"] = structure_with_delimiters
+                self._save_checkpoint(run, '2_structure', {
+                    "structure_with_delimiters": structure_with_delimiters,
+                    "structure_chunks": structure_chunks
+                })
                 
                 # Save structure result
                 self._save_intermediate_result(
+                    run,
                     self._get_result_filename('2_structure_consolidated'),
                     structure_with_delimiters
                 )
                 self._save_intermediate_result(
+                    run,
                     self._get_result_filename('2_structure_chunks'),
                     structure_chunks
                 )
@@ -132,20 +236,47 @@ class InvoicePipeline:
     
     def _analyze_sections_detailed_node(self, state: PipelineState) -> PipelineState:
         """Phase 3: Analyze offer items"""
+        run = self._get_run(state)
         try:
+            checkpoint = self._load_checkpoint(run, '3_detailed_structure')
+            if checkpoint is not None:
+                state["structure_with_delimiters"] = checkpoint
+                # The run that wrote the checkpoint may have stopped before the manifest, or had no key
+                if run.incremental:
+                    run.incremental.save(checkpoint)
+                return state
+            
             if state["structure_with_delimiters"] and state["overlapping_chunks"]:
                 print("Phase 3: Analyzing individual offer items in detail...")
                 
+                # Items finished before an interruption are not analyzed again
+                completed_items = {}
+                if run.resume and run.checkpoints:
+                    completed_items = run.checkpoints.load_items('3_detailed_structure')
+                    if completed_items:
+                        print(f"  Resuming: {len(completed_items)} items already analyzed")
+                if run.incremental:
+                    completed_items = {
+                        **run.incremental.reusable_details(state["structure_with_delimiters"]),
+                        **completed_items
+                    }
+                
                 detailed_structure = self.section_analyzer.analyze_offer_items_detailed(
                     state["structure_with_delimiters"],
-                    state["overlapping_chunks"]
+                    state["overlapping_chunks"],
+                    completed_items=completed_items,
+                    on_item_analyzed=partial(self._save_item_checkpoint, run)
                 )
                 
                 # Update the structure with detailed analysis
                 state["structure_with_delimiters"] = detailed_structure
+                self._save_checkpoint(run, '3_detailed_structure', detailed_structure)
+                if run.incremental:
+                    run.incremental.save(detailed_structure)
 
                 # Save structure result
                 self._save_intermediate_result(
+                    run,
                     self._get_result_filename('3_detailed_structure'),
                     detailed_structure
                 )
@@ -160,13 +291,21 @@ class InvoicePipeline:
     
     def _translate_to_french_node(self, state: PipelineState) -> PipelineState:
         """Optional Phase 5: Translate final offer back to French"""
+        run = self._get_run(state)
         try:
             if self.config.get('enable_translation', False) and state["final_json"]:
+                checkpoint = self._load_checkpoint(run, '5_translation')
+                if checkpoint is not None:
+                    state["final_json_translated"] = ProcessedOffer(**checkpoint)
+                    return state
+                
                 print("Phase 5: Translating final offer back to French...")
                 translated_offer = self.translator.translate_offer_to_french(
                     state["final_json"]
                 )
                 state["final_json_translated"] = translated_offer
+                if translated_offer:
+                    self._save_checkpoint(run, '5_translation', translated_offer.model_dump())
                 print(f"  French translation completed")
             else:
                 state["final_json_translated"] = None
@@ -176,11 +315,33 @@ class InvoicePipeline:
         
         return state
     
-    def _save_intermediate_result(self, filename: str, content: Any) -> None:
-        """Save intermediate results to a file"""
-        # Add timestamp to filename
-        timestamped_filename = f"{self.timestamp}_{filename}"
-        output_path = self.results_dir / timestamped_filename
+    def _get_run(self, state: PipelineState) -> PipelineRun:
+        with self._runs_lock:
+            return self._runs[state["run_id"]]
+    
+    def _load_checkpoint(self, run: PipelineRun, phase: str) -> Any:
+        """Load a phase checkpoint when resuming, None otherwise"""
+        if not run.resume or run.checkpoints is None:
+            return None
+        
+        data = run.checkpoints.load_phase(phase)
+        if data is not None:
+            print(f"Phase {phase}: Resuming from checkpoint in {run.checkpoints.run_dir}")
+        return data
+    
+    def _save_checkpoint(self, run: PipelineRun, phase: str, data: Any) -> None:
+        """Save a completed phase output for later resume"""
+        if run.checkpoints is not None:
+            run.checkpoints.save_phase(phase, data)
+    
+    def _save_item_checkpoint(self, run: PipelineRun, item_id: str, details: Dict[str, Any]) -> None:
+        """Save a completed Phase 3 item for later resume"""
+        if run.checkpoints is not None:
+            run.checkpoints.save_item('3_detailed_structure', item_id, details)
+    
+    def _save_intermediate_result(self, run: PipelineRun, filename: str, content: Any) -> None:
+        """Save intermediate results to the run's results directory"""
+        output_path = run.results_dir / filename
         
         try:
             if isinstance(content, (dict, list)):
@@ -200,10 +361,91 @@ class InvoicePipeline:
         """Generate standardized filename for results"""
         return f"phase_{phase}.{extension}"
     
-    def process_invoice(self, markdown_content: str) -> PipelineState:
-        """Process markdown through the enhanced pipeline with translation"""
+    def can_stream(self, input_path: str) -> bool:
+        """Whether chunks can be streamed from the input file instead of loading it"""
+        return self.config.get('stream_chunks', False) and not is_pdf_file(input_path) \
+            and not self.config.get('enable_translation', False)
+    
+    def _stream_chunks(self, run: PipelineRun, state: PipelineState, completed_offsets: Dict[int, Optional[int]]) -> Iterator[ChunkView]:
+        """Chunk the input lazily, collecting the chunks into the state"""
+        document = run.document_buffer if state["input_path"] else \
+            (state["translated_markdown"] or state["raw_markdown"])
+        if self.markdown_chunker.uses_feedback:
+            chunks = self.markdown_chunker.iter_adaptive_chunks(
+                document, lambda chunk: completed_offsets.get(chunk['chunk_index']))
+        else:
+            chunks = self.markdown_chunker.iter_chunks(document)
+        for chunk in chunks:
+            state["overlapping_chunks"].append(chunk)
+            yield chunk
+    
+    def _finish_streamed_chunks(self, run: PipelineRun, overlapping_chunks: List[ChunkView]) -> None:
+        """Record the Phase 1 results of chunks produced during Phase 2"""
+        for chunk in overlapping_chunks:
+            chunk['total_chunks'] = len(overlapping_chunks)
+        print(f"  Streamed {len(overlapping_chunks)} chunks")
+        
+        chunk_records = [chunk.to_dict() for chunk in overlapping_chunks]
+        self._save_checkpoint(run, '1_chunks', chunk_records)
+        self._save_intermediate_result(
+            run,
+            self._get_result_filename('1_chunks'),
+            chunk_records
+        )
+    
+    def process_invoice(self, markdown_content: Optional[str] = None, resume: bool = False,
+                        document_key: Optional[str] = None,
+                        input_path: Optional[str] = None) -> PipelineState:
+        """Process markdown through the enhanced pipeline with translation
+        
+        With a document_key, the run is diffed against the previous run stored
+        under the same key and only changed chunks are reprocessed. With an
+        input_path instead of markdown_content, the file is memory-mapped and
+        chunked while structure extraction runs (see can_stream).
+        
+        Each call is an independent run with its own results directory, so one
+        pipeline can process several documents concurrently from threads.
+        """
+        run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        run = PipelineRun(run_id=run_id, results_dir=self.results_dir / run_id, resume=resume)
+        run.results_dir.mkdir(parents=True, exist_ok=True)
+        
+        if input_path is not None:
+            mapped = MarkdownChunker.open_buffer(input_path)
+            # Chunks, including those resumed from a checkpoint, are views over this buffer
+            run.document_buffer = self.markdown_chunker.prepare_buffer(mapped)
+            if isinstance(run.document_buffer, str):
+                print(f"Warning: {self.markdown_chunker.chunking_mode} chunking decodes the whole input "
+                      "into memory; only fixed and content_defined modes stream it")
+            if document_key:
+                print("Warning: Incremental updates are not supported for streamed input, processing in full")
+                document_key = None
+            if self.boilerplate_stripper:
+                print("Warning: Boilerplate stripping is not supported for streamed input")
+        elif self.boilerplate_stripper and markdown_content:
+            markdown_content, boilerplate_report = self.boilerplate_stripper.strip(markdown_content)
+            if boilerplate_report.get('skipped'):
+                print(f"Boilerplate: nothing removed, {boilerplate_report['skipped']} in the markdown")
+            else:
+                print(f"Boilerplate: removed {boilerplate_report['removed_lines']} repeated header/footer lines "
+                      f"({len(boilerplate_report['patterns'])} patterns), saved ~{boilerplate_report['tokens_saved']} "
+                      f"of {boilerplate_report['tokens_before']} tokens")
+            self._save_intermediate_result(run, self._get_result_filename('0_boilerplate'), boilerplate_report)
+        if document_key and self.markdown_chunker.uses_feedback:
+            # Adaptive boundaries follow the previous chunk's extraction, so no chunk can be reused
+            print("Warning: Incremental updates are not supported with adaptive overlap, processing in full")
+            document_key = None
+        # Checkpoints are keyed by the file as mapped, whatever the chunking mode decodes
+        document = mapped if input_path is not None else markdown_content
+        
+        run.incremental = IncrementalUpdater(self.config, document_key) if document_key else None
+        if self.enable_checkpoints:
+            run.checkpoints = CheckpointStore.for_document(self.config, document)
+        
         initial_state = PipelineState(
-            raw_markdown=markdown_content,
+            run_id=run_id,
+            raw_markdown=markdown_content or "",
+            input_path=input_path,
             translated_markdown=None,
             overlapping_chunks=[],
             structure_with_delimiters=None,
@@ -213,8 +455,25 @@ class InvoicePipeline:
             processing_errors=[]
         )
         
-        print(f"Starting enhanced pipeline with {len(markdown_content)} characters...")
-        result = self.graph.invoke(initial_state)
-        print("Pipeline processing complete!")
+        if input_path is not None:
+            print(f"[{run_id}] Starting enhanced pipeline with {len(document)} bytes streamed from {input_path}...")
+        else:
+            print(f"[{run_id}] Starting enhanced pipeline with {len(markdown_content)} characters...")
+        
+        with self._runs_lock:
+            self._runs[run_id] = run
+        try:
+            result = self.graph.invoke(initial_state)
+        finally:
+            with self._runs_lock:
+                del self._runs[run_id]
+        print(f"[{run_id}] Pipeline processing complete! Results in {run.results_dir}")
         
         return result
+    
+    async def aprocess_invoice(self, markdown_content: Optional[str] = None, resume: bool = False,
+                               document_key: Optional[str] = None,
+                               input_path: Optional[str] = None) -> PipelineState:
+        """Run process_invoice in a worker thread, for concurrent documents in asyncio tasks"""
+        return await asyncio.to_thread(self.process_invoice, markdown_content, resume,
+                                       document_key, input_path)
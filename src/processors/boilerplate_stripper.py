@@ -0,0 +1,131 @@
+# src/processors/boilerplate_stripper.py
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+from .markdown_blocks import HEADING_PATTERN, LIST_ITEM_PATTERN
+from .cfc_hierarchy import CFC_HEADING_PATTERN
+from .markdown_chunker import count_tokens
+
+# Page separators of paginated marker output ("{3}-----...") and form feeds
+PAGE_SEPARATOR_PATTERN = re.compile(r'^\s*(?:\{\d+\}-{10,}|\f+)\s*$')
+# Page numbers: "Page 3", "Seite 3 von 12", "page 3/12", or a line that is only "3", "- 3 -" or "3/12"
+PAGE_NUMBER_PATTERN = re.compile(r'\b(?:page|seite|pagina|p\.)\s*\d+(?:\s*(?:/|sur|von|of|de|di)\s*\d+)?\b',
+                                 re.IGNORECASE)
+PAGE_NUMBER_LINE_PATTERN = re.compile(r'^[-–\s]*\d+(?:\s*/\s*\d+)?[-–\s]*$')
+# Carry-forward lines: "A reporter Fr. 12'345.50", "Report CHF 1 234,50", "Übertrag: 12.345,50 €"
+CARRY_FORWARD_PATTERN = re.compile(
+    r"\b(?:à reporter|a reporter|reporté|report|übertrag|transport|carried forward|brought forward)\b"
+    r"[^\d\n]{0,20}?(?P<amount>\d[\d'’ .,]*\d|\d)",
+    re.IGNORECASE
+)
+
+class BoilerplateStripper:
+    """Removes running page headers, footers and carry-forward lines
+
+    A line is boilerplate when, up to its page number or carried-forward
+    amount, it repeats on at least min_pages pages. Only the first and last
+    edge_lines lines of each page are considered, so the markdown must keep
+    its page separators; without them nothing is removed. Table rows (repeated table headers),
+    list items, headings and lines between table rows are never removed.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.min_pages = config.get('boilerplate_min_pages', 3)
+        self.edge_lines = config.get('boilerplate_edge_lines', 3)
+        self.max_line_chars = config.get('boilerplate_max_line_chars', 200)
+
+    def strip(self, content: str) -> Tuple[str, Dict[str, Any]]:
+        """Content without boilerplate lines and page separators, and a report of what was removed"""
+        # A form feed inside a line starts a new page there
+        lines = content.replace('\f', '\n\f\n').split('\n') if '\f' in content else content.split('\n')
+        separators = [i for i, line in enumerate(lines) if PAGE_SEPARATOR_PATTERN.match(line)]
+        if not separators:
+            # Repeated lines of unpaginated text are as likely to be items as headers
+            tokens = count_tokens(content)
+            return content, {'removed_lines': 0, 'page_separators': 0, 'patterns': [],
+                             'tokens_before': tokens, 'tokens_after': tokens, 'tokens_saved': 0,
+                             'skipped': 'no page separators'}
+
+        # Occurrences of each key among the page edge lines, and the pages they span
+        occurrences: Dict[str, List[int]] = {}
+        pages: Dict[str, set] = {}
+        for index, page in self._page_edge_lines(lines, separators):
+            key = self._line_key(lines[index])
+            if key is not None:
+                occurrences.setdefault(key, []).append(index)
+                pages.setdefault(key, set()).add(page)
+
+        boilerplate = {key for key, key_pages in pages.items() if len(key_pages) >= self.min_pages}
+        removed = set(separators)
+        for key in boilerplate:
+            removed.update(occurrences[key])
+
+        kept = self._collapse_blank_lines([line for i, line in enumerate(lines) if i not in removed])
+        stripped = '\n'.join(kept)
+
+        tokens_before = count_tokens(content)
+        tokens_after = count_tokens(stripped)
+        report = {
+            'removed_lines': len(removed) - len(separators),
+            'page_separators': len(separators),
+            'patterns': sorted(
+                ({'line': lines[occurrences[key][0]].strip(), 'pages': len(pages[key])} for key in boilerplate),
+                key=lambda pattern: -pattern['pages']
+            ),
+            'tokens_before': tokens_before,
+            'tokens_after': tokens_after,
+            'tokens_saved': tokens_before - tokens_after
+        }
+        return stripped, report
+
+    def _line_key(self, line: str) -> Optional[str]:
+        """Comparison key of a line, None for lines that are never boilerplate"""
+        stripped = line.strip()
+        if not stripped or len(stripped) > self.max_line_chars:
+            return None
+        if PAGE_NUMBER_LINE_PATTERN.match(stripped):
+            return '#'
+        if stripped.startswith('|') or LIST_ITEM_PATTERN.match(line):
+            return None
+        if HEADING_PATTERN.match(line) or CFC_HEADING_PATTERN.match(line):
+            return None
+        # Only the page number and a carried-forward amount differ from page to
+        # page; other numbers belong to the line
+        key = PAGE_NUMBER_PATTERN.sub('#', stripped.lower().replace('*', '').replace('_', ''))
+        key = CARRY_FORWARD_PATTERN.sub(lambda match: match.group(0)[:match.start('amount') - match.start()] + '#',
+                                        key)
+        return ' '.join(key.split())
+
+    def _page_edge_lines(self, lines: List[str], separators: List[int]) -> List[Tuple[int, int]]:
+        """(line index, page) of the first and last non-blank lines of every page
+
+        Lines with table rows right above and below them are inside a table and left out.
+        """
+        boundaries = [-1] + separators + [len(lines)]
+        edges = []
+        for page in range(len(boundaries) - 1):
+            page_lines = [i for i in range(boundaries[page] + 1, boundaries[page + 1]) if lines[i].strip()]
+            edge = set(page_lines[:self.edge_lines] + page_lines[-self.edge_lines:])
+            for position, index in enumerate(page_lines):
+                if index in edge and not self._inside_table(lines, page_lines, position):
+                    edges.append((index, page))
+        return edges
+
+    @staticmethod
+    def _inside_table(lines: List[str], page_lines: List[int], position: int) -> bool:
+        """Whether the non-blank lines before and after a page line are both table rows"""
+        if position == 0 or position == len(page_lines) - 1:
+            return False
+        return (lines[page_lines[position - 1]].lstrip().startswith('|')
+                and lines[page_lines[position + 1]].lstrip().startswith('|'))
+
+    @staticmethod
+    def _collapse_blank_lines(lines: List[str]) -> List[str]:
+        """Drop blank lines beyond two in a row, left behind by removed lines"""
+        collapsed = []
+        blank_run = 0
+        for line in lines:
+            blank_run = blank_run + 1 if not line.strip() else 0
+            if blank_run <= 2:
+                collapsed.append(line)
+        return collapsed
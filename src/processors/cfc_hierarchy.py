@@ -0,0 +1,92 @@
+# src/processors/cfc_hierarchy.py
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# "243. A. DISTRIBUTION DE CHALEUR" (main group) or "243. A. 1. Tuyauteries"
+# (sub-group), optionally as a markdown heading or in bold
+CFC_HEADING_PATTERN = re.compile(
+    r'^\s{0,3}(?:#{1,6}\s+)?(?:\*\*|__)?\s*'
+    r'(?P<code>\d{3})\.\s*(?P<letter>[A-Z])\.\s*(?:(?P<number>\d{1,2})\.\s*)?'
+    r'(?P<title>[^\s.|].*?)\s*(?:\*\*|__)?\s*#*\s*$'
+)
+# Table of contents entries end in leader dots and a page number
+LEADER_PATTERN = re.compile(r'\.{4,}|…{2,}')
+# Sub-group of the items listed directly under a main heading
+DIRECT_ITEMS_SUB_GROUP = "General"
+
+@dataclass
+class GroupRegion:
+    start: int
+    end: int
+    main_key: str  # "243. A."
+    main_name: str
+    sub_key: Optional[str] = None  # "243. A. 1.", None for items directly under the main group
+    sub_name: Optional[str] = None
+
+    @property
+    def heading_path(self) -> List[str]:
+        """Main group name, then sub-group name when the region has one"""
+        return [self.main_name] + ([self.sub_name] if self.sub_name else [])
+
+def _heading_text(match: re.Match) -> str:
+    number = f" {match.group('number')}." if match.group('number') else ''
+    return f"{match.group('code')}. {match.group('letter')}.{number} {match.group('title')}"
+
+def parse_cfc_regions(content: str) -> List[GroupRegion]:
+    """Split a document into regions by its CFC-numbered headings, in one pass
+
+    Each region runs from a group heading to the next one and is assigned to
+    its main group and sub-group. Repeated headings (page carry-overs, "suite")
+    map to the group of their first occurrence by code. A main group seen
+    first through one of its sub-groups is named by its code until its own
+    heading appears. Content before the first heading belongs to no region.
+    """
+    regions: List[GroupRegion] = []
+    main_names: Dict[str, str] = {}
+    sub_names: Dict[str, str] = {}
+    current: Optional[GroupRegion] = None
+    position = 0
+    content_length = len(content)
+
+    while position < content_length:
+        newline = content.find('\n', position)
+        line_end = content_length if newline == -1 else newline + 1
+        line = content[position:line_end]
+        match = CFC_HEADING_PATTERN.match(line.rstrip('\n'))
+
+        if match and not LEADER_PATTERN.search(line):
+            main_key = f"{match.group('code')}. {match.group('letter')}."
+            if match.group('number'):
+                sub_key = f"{main_key} {match.group('number')}."
+                sub_name = sub_names.setdefault(sub_key, _heading_text(match))
+                # A sub-group heading before its main group names the main by code
+                main_name = main_names.setdefault(main_key, main_key)
+            else:
+                sub_key = sub_name = None
+                if main_names.get(main_key, main_key) == main_key:
+                    # First heading of this main group, or it replaces the code placeholder
+                    main_names[main_key] = _heading_text(match)
+                main_name = main_names[main_key]
+
+            if current is not None:
+                current.end = position
+                regions.append(current)
+            current = GroupRegion(position, content_length, main_key, main_name, sub_key, sub_name)
+
+        position = line_end
+
+    if current is not None:
+        regions.append(current)
+    # Regions before a late main heading still carry its placeholder
+    for region in regions:
+        region.main_name = main_names[region.main_key]
+    return regions
+
+def has_body(content: str, region: GroupRegion) -> bool:
+    """Whether a region has content besides its heading line
+
+    A main heading directly followed by its first sub-group heading has no
+    items of its own.
+    """
+    return bool(content[region.start:region.end].partition('\n')[2].strip())
@@ -0,0 +1,76 @@
+# src/processors/chunk_relevance.py
+import json
+import math
+import re
+from typing import Dict, Optional
+
+from .cfc_hierarchy import CFC_HEADING_PATTERN, LEADER_PATTERN
+
+# A number followed by a unit, in running text or in the next table cell
+UNIT_PATTERN = re.compile(r"\d\s*\|?\s*(?:m[²³23]?|ml|kg|t|pces?|pcs|pc|h|gl|fft|ens|st|u|l)\b", re.IGNORECASE)
+ITEM_KEYWORD_PATTERN = re.compile(
+    r"\b(?:fourniture|pose|y\s+compris|DN\s*\d+|PN\s*\d+|ø|livraison|montage|raccordement|"
+    r"quantit[ée]|qt[ée]|prix|unit[ée]|pce)\b", re.IGNORECASE)
+LEGAL_KEYWORD_PATTERN = re.compile(
+    r"\b(?:article|conditions?|contrat|responsabilit[ée]|garantie|assurances?|paiements?|"
+    r"p[ée]nalit[ée]s?|litiges?|r[ée]siliation|juridiction|norme\s+SIA|soumissionnaire|adjudication)\b",
+    re.IGNORECASE)
+# Table of contents entries: leader dots or ellipses, then a page number
+TOC_LINE_PATTERN = re.compile(r"(?:\.{4,}|…{2,})\s*\d+\s*$")
+
+# Logistic weights over the features below; replaced by a weights file
+# (same keys, e.g. fitted offline on labelled chunks) with relevance_weights_path
+DEFAULT_WEIGHTS = {
+    'bias': -1.0,
+    'table_lines': 2.5,
+    'numeric_density': 4.0,
+    'unit_quantities': 3.0,
+    'item_keywords': 2.0,
+    'cfc_headings': 2.0,
+    'legal_keywords': -3.0,
+    'toc_lines': -4.0,
+}
+
+class ChunkRelevanceFilter:
+    """Local score of how likely a chunk contains offer items
+
+    Scores are a logistic function of cheap text features: table and numeric
+    density, quantities with units, item and legal vocabulary, and table of
+    contents lines. Chunks scoring below the threshold skip Phase 2.
+    """
+
+    def __init__(self, threshold: float = 0.3, weights_path: Optional[str] = None):
+        self.threshold = threshold
+        self.weights = dict(DEFAULT_WEIGHTS)
+        if weights_path:
+            with open(weights_path, 'r', encoding='utf-8') as f:
+                self.weights.update(json.load(f))
+
+    def features(self, text: str) -> Dict[str, float]:
+        """Feature values in [0, 1]"""
+        lines = [line for line in text.split('\n') if line.strip()]
+        line_count = max(1, len(lines))
+        non_space = max(1, len(text) - sum(char.isspace() for char in text))
+        per_kilochar = max(1.0, len(text) / 1000)
+
+        return {
+            'table_lines': sum(line.lstrip().startswith('|') for line in lines) / line_count,
+            'numeric_density': min(1.0, sum(char.isdigit() for char in text) / non_space * 4),
+            'unit_quantities': min(1.0, len(UNIT_PATTERN.findall(text)) / per_kilochar / 5),
+            'item_keywords': min(1.0, len(ITEM_KEYWORD_PATTERN.findall(text)) / per_kilochar / 5),
+            'cfc_headings': float(any(CFC_HEADING_PATTERN.match(line) and not LEADER_PATTERN.search(line)
+                                      for line in lines)),
+            'legal_keywords': min(1.0, len(LEGAL_KEYWORD_PATTERN.findall(text)) / per_kilochar / 5),
+            'toc_lines': sum(bool(TOC_LINE_PATTERN.search(line)) for line in lines) / line_count,
+        }
+
+    def score(self, text: str) -> float:
+        """Probability-like relevance score of a chunk"""
+        features = self.features(text)
+        logit = self.weights.get('bias', 0.0) + sum(
+            self.weights.get(name, 0.0) * value for name, value in features.items()
+        )
+        return 1 / (1 + math.exp(-logit))
+
+    def is_relevant(self, text: str) -> bool:
+        return self.score(text) >= self.threshold
@@ -0,0 +1,200 @@
+# src/processors/incremental_updater.py
+import json
+import re
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from .markdown_chunker import chunk_content_hash
+
+def _normalize_name(name: str) -> str:
+    return re.sub(r'[^\w\s]', '', (name or '').lower()).strip()
+
+class IncrementalUpdater:
+    """Reuse a previous run of the same document so only changed chunks are reprocessed
+    
+    A chunk is clean when its content hash was seen in the previous run. A changed
+    chunk also dirties the chunk right after it, which shares its overlap region and
+    receives its extraction as previous context.
+    """
+
+    def __init__(self, config: Dict[str, Any], document_key: str):
+        checkpoint_dir = config.get('checkpoint_dir') or \
+            Path(config.get('results_dir', 'pipeline_results')) / 'checkpoints'
+        safe_key = re.sub(r'[^\w.-]', '_', document_key)
+        self.manifest_path = Path(checkpoint_dir) / 'documents' / f"{safe_key}.json"
+        self.previous = self._load_manifest()
+        
+        self.chunk_hashes: List[str] = []
+        self.structure_chunks: List[Dict[str, Any]] = []
+        self.clean_hashes = set()
+
+    def _load_manifest(self) -> Optional[Dict[str, Any]]:
+        if not self.manifest_path.exists():
+            return None
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            print(f"Incremental: loaded previous run with {len(manifest.get('chunks', []))} chunks")
+            return manifest
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable incremental manifest {self.manifest_path}: {e}")
+            return None
+
+    def reusable_chunk_items(self, chunks: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+        """Return previous Phase 2 extractions for clean chunks, keyed by chunk index"""
+        clean_indices = self._mark_clean_chunks(chunks)
+        if not self.previous:
+            return {}
+        
+        previous_items = self.previous.get('chunk_items', {})
+        reusable = {}
+        for index in clean_indices:
+            # Fresh copy: merged items are mutated during structure building
+            reusable[chunks[index]['chunk_index']] = json.loads(json.dumps(previous_items[self.chunk_hashes[index]]))
+        
+        print(f"Incremental: reusing {len(reusable)}/{len(chunks)} chunks, "
+              f"{len(chunks) - len(reusable)} to re-extract")
+        return reusable
+
+    def record_structure_chunks(self, chunks: List[Dict[str, Any]], structure_chunks: List[Dict[str, Any]]):
+        """Remember Phase 2 per-chunk extractions for the next revision
+        
+        Also marks clean chunks, for runs resumed after Phase 2 that skipped
+        reusable_chunk_items.
+        """
+        self._mark_clean_chunks(chunks)
+        self.structure_chunks = structure_chunks
+
+    def _mark_clean_chunks(self, chunks: List[Dict[str, Any]]) -> List[int]:
+        """Hash the chunks and collect the clean ones; returns their positions"""
+        self.chunk_hashes = [chunk_content_hash(chunk) for chunk in chunks]
+        self.clean_hashes = set()
+        if not self.previous:
+            return []
+        
+        previous_items = self.previous.get('chunk_items', {})
+        clean_indices = []
+        previous_dirty = False
+        for index, content_hash in enumerate(self.chunk_hashes):
+            if content_hash in previous_items and not previous_dirty:
+                clean_indices.append(index)
+                self.clean_hashes.add(content_hash)
+            previous_dirty = content_hash not in previous_items
+        return clean_indices
+
+    def _item_key(self, item: Dict[str, Any]) -> str:
+        return f"{_normalize_name(item.get('name'))}|{' '.join((item.get('start_delimiter') or '').split())}"
+
+    def assign_stable_ids(self, structure: Dict[str, Any]) -> None:
+        """Carry group and item IDs over from the previous run, numbering new ones after them"""
+        if not self.previous:
+            return
+        
+        previous_groups = self.previous.get('groups', {})
+        previous_items = defaultdict(deque)
+        for record in self.previous.get('items', []):
+            previous_items[(record['group_key'], record['item_key'])].append(record['offer_item_id'])
+        
+        def next_free(used: set, prefix: str) -> str:
+            index = 1
+            while f"{prefix}{index}" in used:
+                index += 1
+            return f"{prefix}{index}"
+        
+        main_groups = structure.get('offer_item_groups', [])
+        # Reserve every previous ID first so new groups never take one over
+        used_ids = set(previous_groups.values())
+        for main_group in main_groups:
+            main_key = _normalize_name(main_group['name'])
+            main_id = previous_groups.get(main_key) or next_free(used_ids, '')
+            used_ids.add(main_id)
+            main_group['offer_item_group_id'] = main_id
+            
+            for sub_group in main_group.get('offer_groups', []):
+                sub_key = f"{main_key}/{_normalize_name(sub_group['name'])}"
+                sub_id = previous_groups.get(sub_key)
+                if not sub_id or not sub_id.startswith(f"{main_id}."):
+                    sub_id = next_free(used_ids, f"{main_id}.")
+                used_ids.add(sub_id)
+                sub_group['offer_item_group_id'] = sub_id
+                sub_group['parent_main_group_id'] = main_id
+                
+                used_item_ids = {record['offer_item_id'] for record in self.previous.get('items', [])
+                                 if record['offer_item_id'].startswith(f"{sub_id}.")}
+                items = sub_group.get('offer_items', [])
+                new_items = []
+                for item in items:
+                    candidates = previous_items.get((sub_key, self._item_key(item)))
+                    if candidates and candidates[0].startswith(f"{sub_id}."):
+                        item['offer_item_id'] = candidates.popleft()
+                    else:
+                        new_items.append(item)
+                for item in new_items:
+                    item['offer_item_id'] = next_free(used_item_ids, f"{sub_id}.")
+                    used_item_ids.add(item['offer_item_id'])
+                for item in items:
+                    item['parent_sub_group_id'] = sub_id
+                    item['parent_main_group_id'] = main_id
+
+    def reusable_details(self, structure: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Return previous Phase 3 details for items of clean chunks, keyed by offer_item_id"""
+        if not self.previous:
+            return {}
+        
+        previous_details = {
+            (record['offer_item_id'], record['item_key'], record['chunk_hash']): record['details']
+            for record in self.previous.get('items', [])
+            if record.get('details')
+            and record['details'].get('extraction_metadata', {}).get('confidence_level') != 'none'
+        }
+        reusable = {}
+        total_items = 0
+        for main_group in structure.get('offer_item_groups', []):
+            for sub_group in main_group.get('offer_groups', []):
+                for item in sub_group.get('offer_items', []):
+                    total_items += 1
+                    content_hash = (item.get('chunk_id') or '').rsplit('_', 1)[-1]
+                    if content_hash not in self.clean_hashes:
+                        continue
+                    key = (item['offer_item_id'], self._item_key(item), content_hash)
+                    if key in previous_details:
+                        reusable[item['offer_item_id']] = previous_details[key]
+        
+        print(f"Incremental: reusing details for {len(reusable)}/{total_items} items")
+        return reusable
+
+    def save(self, detailed_structure: Dict[str, Any]) -> None:
+        """Persist this run as the baseline for the next revision"""
+        groups = {}
+        items = []
+        for main_group in detailed_structure.get('offer_item_groups', []):
+            main_key = _normalize_name(main_group['name'])
+            groups[main_key] = main_group['offer_item_group_id']
+            for sub_group in main_group.get('offer_groups', []):
+                sub_key = f"{main_key}/{_normalize_name(sub_group['name'])}"
+                groups[sub_key] = sub_group['offer_item_group_id']
+                for item in sub_group.get('offer_items', []):
+                    items.append({
+                        'group_key': sub_key,
+                        'item_key': self._item_key(item),
+                        'offer_item_id': item['offer_item_id'],
+                        'chunk_hash': (item.get('chunk_id') or '').rsplit('_', 1)[-1],
+                        'details': item.get('details')
+                    })
+        
+        manifest = {
+            'chunks': self.chunk_hashes,
+            'chunk_items': dict(zip(self.chunk_hashes, self.structure_chunks)),
+            'groups': groups,
+            'items': items
+        }
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.manifest_path.with_suffix('.json.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, default=str)
+            temp_path.replace(self.manifest_path)
+            print(f"Incremental: saved baseline to {self.manifest_path}")
+        except Exception as e:
+            print(f"Error saving incremental manifest: {e}")
@@ -0,0 +1,87 @@
+# src/processors/markdown_blocks.py
+import re
+from dataclasses import dataclass, field
+from typing import List
+
+HEADING_PATTERN = re.compile(r'^\s{0,3}(#{1,6})\s+(.*?)\s*#*\s*$')
+LIST_ITEM_PATTERN = re.compile(r'^\s*(?:[-*+]|\d+[.)])\s+')
+
+@dataclass
+class MarkdownBlock:
+    block_type: str  # heading, table, list or paragraph
+    start: int
+    end: int
+    level: int = 0  # heading level, 0 for other blocks
+    text: str = ""  # heading text, empty for other blocks
+    heading_path: List[str] = field(default_factory=list)  # enclosing headings, outermost first
+
+def _line_type(line: str) -> str:
+    stripped = line.strip()
+    if not stripped:
+        return 'blank'
+    if HEADING_PATTERN.match(line):
+        return 'heading'
+    if stripped.startswith('|'):
+        return 'table'
+    if LIST_ITEM_PATTERN.match(line):
+        return 'list'
+    return 'paragraph'
+
+def parse_markdown_blocks(content: str) -> List[MarkdownBlock]:
+    """Parse markdown into contiguous heading, table, list and paragraph blocks
+    
+    Blocks tile the content: blank lines are attached to the preceding block, and
+    every block records the heading path it sits under.
+    """
+    blocks: List[MarkdownBlock] = []
+    heading_stack: List[MarkdownBlock] = []
+    current = None
+    position = 0
+    content_length = len(content)
+    
+    while position < content_length:
+        newline = content.find('\n', position)
+        line_end = content_length if newline == -1 else newline + 1
+        line = content[position:line_end]
+        line_type = _line_type(line)
+        
+        if line_type == 'blank':
+            if current is None:
+                current = MarkdownBlock('paragraph', position, line_end,
+                                        heading_path=[h.text for h in heading_stack])
+                blocks.append(current)
+            current.end = line_end
+            # A blank line closes the block, except between items of one list
+            if current.block_type != 'list':
+                current = None
+            position = line_end
+            continue
+        
+        continues_block = current is not None and (
+            (line_type == current.block_type and line_type in ('table', 'list', 'paragraph')) or
+            # Indented continuation lines of a list item stay in the list
+            (current.block_type == 'list' and line_type == 'paragraph' and line[:1].isspace())
+        )
+        if continues_block and current.block_type == 'list' and content[current.end - 2:current.end] == '\n\n' \
+                and line_type != 'list':
+            continues_block = False
+        
+        if continues_block:
+            current.end = line_end
+        elif line_type == 'heading':
+            match = HEADING_PATTERN.match(line)
+            level = len(match.group(1))
+            while heading_stack and heading_stack[-1].level >= level:
+                heading_stack.pop()
+            current = MarkdownBlock('heading', position, line_end, level=level, text=match.group(2).strip(),
+                                    heading_path=[h.text for h in heading_stack])
+            blocks.append(current)
+            heading_stack.append(current)
+        else:
+            current = MarkdownBlock(line_type, position, line_end,
+                                    heading_path=[h.text for h in heading_stack])
+            blocks.append(current)
+        
+        position = line_end
+    
+    return blocks
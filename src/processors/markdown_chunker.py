@@ -1,107 +1,703 @@
 # src/processors/markdown_chunker.py
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple, Optional, Iterator, Union, Callable
+from collections import deque
+from pathlib import Path
 import hashlib
+import mmap
+import zlib
+from functools import lru_cache
+
+from .markdown_blocks import parse_markdown_blocks, MarkdownBlock
+from .cfc_hierarchy import parse_cfc_regions, has_body
+
+# A document is either an in-memory string or a read-only memory map of a
+# UTF-8 file, in which case offsets and sizes are in bytes
+DocumentBuffer = Union[str, mmap.mmap, bytes]
+
+class ChunkView:
+    """Compact chunk record over the shared document; content is sliced on access
+    
+    Supports the mapping access (chunk['content'], chunk.get(...)) used for the
+    former chunk dicts, and to_dict() for offset-only serialization.
+    """
+    __slots__ = ('document', 'chunk_id', 'chunk_index', 'total_chunks', 'start_char', 'end_char',
+                 'estimated_tokens', 'overlap_with_previous', 'overlap_with_next', 'heading_path')
+    
+    FIELDS = ('chunk_id', 'chunk_index', 'total_chunks', 'start_char', 'end_char',
+              'estimated_tokens', 'overlap_with_previous', 'overlap_with_next', 'heading_path')
+    
+    def __init__(self, document: DocumentBuffer, chunk_id: str, chunk_index: int, total_chunks: int,
+                 start_char: int, end_char: int, estimated_tokens: int,
+                 overlap_with_previous: bool, overlap_with_next: bool,
+                 heading_path: Optional[List[str]] = None):
+        self.document = document
+        self.chunk_id = chunk_id
+        self.chunk_index = chunk_index
+        self.total_chunks = total_chunks
+        self.start_char = start_char
+        self.end_char = end_char
+        self.estimated_tokens = estimated_tokens
+        self.overlap_with_previous = overlap_with_previous
+        self.overlap_with_next = overlap_with_next
+        self.heading_path = heading_path
+    
+    @property
+    def content(self) -> str:
+        text = self.document[self.start_char:self.end_char]
+        return text if isinstance(text, str) else text.decode('utf-8', errors='replace')
+    
+    def __getitem__(self, key: str) -> Any:
+        if key == 'content' or key in self.FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+    
+    def __setitem__(self, key: str, value: Any):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+    
+    def __contains__(self, key: str) -> bool:
+        return key == 'content' or (key in self.FIELDS and getattr(self, key) is not None)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None) if key == 'content' or key in self.FIELDS else None
+        return default if value is None else value
+    
+    @staticmethod
+    def offset_unit_of(document: DocumentBuffer) -> str:
+        """'chars' for offsets into text, 'bytes' for offsets into a mapped file"""
+        return 'chars' if isinstance(document, str) else 'bytes'
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Offset record without content, for intermediate results and checkpoints"""
+        record = {field: getattr(self, field) for field in self.FIELDS if getattr(self, field) is not None}
+        record['offset_unit'] = self.offset_unit_of(self.document)
+        return record
+    
+    @classmethod
+    def from_dict(cls, document: DocumentBuffer, data: Dict[str, Any]) -> 'ChunkView':
+        """Rebuild a chunk over its document; offsets must be in the document's unit"""
+        offset_unit = cls.offset_unit_of(document)
+        if data.get('offset_unit', offset_unit) != offset_unit:
+            raise ValueError(f"Chunk offsets are in {data['offset_unit']}, "
+                             f"the document is addressed in {offset_unit}")
+        return cls(document, **{field: data.get(field) for field in cls.FIELDS})
+    
+    def document_offset(self, position: int) -> int:
+        """Document offset of a character position within content"""
+        if isinstance(self.document, str):
+            return self.start_char + position
+        return self.start_char + len(self.content[:position].encode('utf-8'))
+    
+    def __repr__(self) -> str:
+        return f"ChunkView({self.chunk_id}, {self.start_char}-{self.end_char})"
 
 class MarkdownChunker:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.chunk_size = config.get('chunk_size', 4000)  # Characters per chunk
         self.overlap_size = config.get('overlap_size', 400)  # Overlap between chunks
+        if self.overlap_size >= self.chunk_size:
+            raise ValueError(f"overlap_size ({self.overlap_size}) must be smaller than "
+                             f"chunk_size ({self.chunk_size})")
         self.context_window_size = config.get('context_window_size', 8192)
         
+        # "fixed" character windows, "content_defined" rolling-hash boundaries,
+        # "structure" packing of whole markdown blocks or "headings" regions
+        # of the CFC group headings
+        self.chunking_mode = config.get('chunking_mode', 'fixed')
+        self.cdc_min_size = config.get('cdc_min_size', self.chunk_size // 4)
+        self.cdc_max_size = config.get('cdc_max_size', self.chunk_size * 2)
+        self.cdc_window_lines = config.get('cdc_window_lines', 2)
+        self.chunk_token_budget = config.get('chunk_token_budget', self.chunk_size // 4)
+        self.structure_overlap_blocks = config.get('structure_overlap_blocks', 0)
+        
+        # Token budget per chunk, set when chunks are sized from the model context
+        self.token_budget = None
+        self.min_chunk_ratio = config.get('min_chunk_ratio', 0.25)
+        
+        # "adaptive" starts each fixed chunk where the previous chunk's last
+        # complete item ended, as reported by Phase 2, instead of a blind window
+        self.overlap_mode = config.get('overlap_mode', 'fixed')
+        self.max_adaptive_overlap = config.get('max_adaptive_overlap', self.chunk_size // 2)
+        
+        # Per-chunk boundary output is opt-in
+        self.debug_chunking = config.get('debug_chunking', False)
+        
+    
+    def set_token_budget(self, token_budget: int):
+        """Size chunks so each fits the model context together with its prompt"""
+        self.token_budget = token_budget
+        self.chunk_token_budget = token_budget
+    
+    @staticmethod
+    def open_buffer(path: Union[str, Path]) -> DocumentBuffer:
+        """Memory-map a UTF-8 markdown file for chunking without loading it"""
+        with open(path, 'rb') as f:
+            if Path(path).stat().st_size == 0:
+                return b''
+            # The map stays valid after the file object is closed
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    def prepare_buffer(self, buffer: DocumentBuffer) -> DocumentBuffer:
+        """The buffer chunks of this mode are views over
+        
+        Block and heading parsing need text, so structure and headings modes
+        decode a mapped file in full: they are neither streaming nor
+        memory-bounded, and their offsets are in characters.
+        """
+        if self.chunking_mode in ('structure', 'headings') and not isinstance(buffer, str):
+            return bytes(buffer).decode('utf-8', errors='replace')
+        return buffer
     
-    def create_overlapping_chunks(self, markdown_content: str) -> List[Dict[str, Any]]:
+    def create_overlapping_chunks(self, markdown_content: str) -> List[ChunkView]:
         """Create overlapping chunks from markdown content"""
-        chunks = []
-        content_length = len(markdown_content)
+        chunks = list(self.iter_chunks(markdown_content))
         
-        if content_length <= self.chunk_size:
-            # Single chunk if content is small
-            chunks.append({
-                'chunk_id': self._generate_chunk_id(markdown_content, 0),
-                'chunk_index': 0,
-                'total_chunks': 1,
-                'content': markdown_content,
-                'start_char': 0,
-                'end_char': content_length,
-                'estimated_tokens': estimate_tokens(markdown_content),
-                'overlap_with_previous': False,
-                'overlap_with_next': False
-            })
-            return chunks
+        # Update total_chunks for all chunks
+        total_chunks = len(chunks)
+        for chunk in chunks:
+            chunk['total_chunks'] = total_chunks
+        
+        print(f"Created {total_chunks} {self.chunking_mode} chunks from {len(markdown_content)} characters")
+        return chunks
+    
+    def iter_chunks(self, source: Union[DocumentBuffer, Path]) -> Iterator[ChunkView]:
+        """Yield chunks as their boundaries are found
+        
+        source is markdown text, an open buffer, or a Path that is memory-mapped.
+        Streamed chunks have total_chunks set to None.
+        """
+        buffer = self.prepare_buffer(self.open_buffer(source) if isinstance(source, Path) else source)
         
+        chunks = self._iter_mode_chunks(buffer)
+        if self.token_budget and self.chunking_mode != 'headings':
+            # Heading regions are already split to the budget and must not be merged
+            chunks = self._iter_fitted_chunks(buffer, chunks)
+        yield from chunks
+    
+    @property
+    def uses_feedback(self) -> bool:
+        """Whether chunk boundaries depend on extraction results"""
+        return self.overlap_mode == 'adaptive' and self.chunking_mode == 'fixed'
+    
+    def iter_adaptive_chunks(self, source: Union[DocumentBuffer, Path],
+                             completed_offset: Callable[[ChunkView], Optional[int]]) -> Iterator[ChunkView]:
+        """Yield fixed-size chunks that overlap only by the unfinished item
+        
+        After a chunk is consumed, completed_offset(chunk) returns the document
+        offset where its last complete item ended, or None. The next chunk starts
+        at the following line, so only the item cut by the boundary is sent
+        again. Without feedback the configured overlap_size is used.
+        """
+        buffer = self.open_buffer(source) if isinstance(source, Path) else source
+        content_length = len(buffer)
+        chunk_size = self._effective_chunk_size(buffer)
+        overlap_size = self._overlap_for(chunk_size)
+        newline = self._newline(buffer)
+        start = 0
+        previous_end = 0
+        chunk_index = 0
+        overlap_saved = 0
+        
+        while start < content_length:
+            end = min(start + chunk_size, content_length)
+            if end < content_length:
+                end = self._find_natural_break(buffer, start, end)
+            
+            chunk = self._make_chunk(
+                buffer, start, end, chunk_index, None,
+                overlap_with_previous=start < previous_end,
+                overlap_with_next=end < content_length
+            )
+            yield chunk
+            
+            if end >= content_length:
+                break
+            
+            blind_start = max(start + 1, end - overlap_size)
+            next_start = blind_start
+            offset = completed_offset(chunk)
+            if offset is not None and start < offset <= end:
+                # Resume on the line after the last complete item
+                line_end = buffer.find(newline, offset, end)
+                offset = end if line_end == -1 else line_end + 1
+                # A huge unfinished item must not stall progress
+                next_start = max(offset, end - self.max_adaptive_overlap, start + 1)
+                overlap_saved += max(0, next_start - blind_start)
+            
+            self._debug(f'adaptive chunk {chunk_index}: {start}-{end}, next start {next_start}')
+            start = self._align_forward(buffer, min(next_start, end))
+            previous_end = end
+            chunk_index += 1
+        
+        if overlap_saved:
+            print(f"  Adaptive overlap avoided resending {overlap_saved} characters")
+    
+    def _iter_mode_chunks(self, buffer: DocumentBuffer) -> Iterator[ChunkView]:
+        """Yield chunks with the configured chunking mode"""
+        content_length = len(buffer)
+        chunk_size = self._effective_chunk_size(buffer)
+        
+        if self.chunking_mode == 'headings':
+            yield from self._iter_heading_chunks(buffer, chunk_size)
+        elif content_length <= chunk_size:
+            # Single chunk if content is small
+            yield self._make_chunk(buffer, 0, content_length, 0, 1,
+                                   overlap_with_previous=False, overlap_with_next=False)
+        elif self.chunking_mode == 'content_defined':
+            yield from self._iter_content_defined_chunks(buffer)
+        elif self.chunking_mode == 'structure':
+            yield from self._create_structure_chunks(buffer)
+        else:
+            yield from self._iter_fixed_chunks(buffer, chunk_size)
+    
+    def _iter_fixed_chunks(self, buffer: DocumentBuffer, chunk_size: int) -> Iterator[ChunkView]:
+        """Yield fixed-size chunks adjusted to natural breaks"""
+        content_length = len(buffer)
+        overlap_size = self._overlap_for(chunk_size)
         start = 0
         chunk_index = 0
         
         while start < content_length:
             # Calculate end position
-            end = min(start + self.chunk_size, content_length)
+            end = min(start + chunk_size, content_length)
             
             # Try to break at natural boundaries (paragraphs, then sentences)
             if end < content_length:
-                end = self._find_natural_break(markdown_content, start, end)
-            
-            chunk_content = markdown_content[start:end]
-            print(f'chunk delimeter start: {start}, end: {end}.')  # Debug output
-            chunks.append({
-                'chunk_id': self._generate_chunk_id(chunk_content, chunk_index),
-                'chunk_index': chunk_index,
-                'total_chunks': 0,  # Will be updated after all chunks are created
-                'content': chunk_content,
-                'start_char': start,
-                'end_char': end,
-                'estimated_tokens': estimate_tokens(chunk_content),
-                'overlap_with_previous': chunk_index > 0,
-                'overlap_with_next': end < content_length
-            })
+                end = self._find_natural_break(buffer, start, end)
+            
+            self._debug(f'chunk delimeter start: {start}, end: {end}.')
+            yield self._make_chunk(
+                buffer, start, end, chunk_index, None,
+                overlap_with_previous=chunk_index > 0,
+                overlap_with_next=end < content_length
+            )
             
             # Move start position with overlap
             if end >= content_length:
                 break
             
-            start = end - self.overlap_size
+            # Forward alignment keeps start strictly increasing on a mapped file
+            start = self._align_forward(buffer, max(start + 1, end - overlap_size))
             chunk_index += 1
+    
+    def _iter_heading_chunks(self, content: str, chunk_size: int) -> Iterator[ChunkView]:
+        """Yield one chunk per CFC group region, splitting regions larger than chunk_size
         
-        # Update total_chunks for all chunks
-        total_chunks = len(chunks)
-        for chunk in chunks:
-            chunk['total_chunks'] = total_chunks
+        Each chunk's heading_path is its main group and sub-group, so Phase 2
+        only has to list the items. Text before the first group heading is
+        chunked without a heading_path.
+        """
+        regions = parse_cfc_regions(content)
+        if not regions:
+            print("  No CFC group headings found, using fixed chunks")
+            yield from self._iter_fixed_chunks(content, chunk_size)
+            return
         
-        print(f"Created {total_chunks} overlapping chunks from {content_length} characters")
-        return chunks
+        spans = [(0, regions[0].start, None)] if content[:regions[0].start].strip() else []
+        spans += [(region.start, region.end, region.heading_path) for region in regions
+                  if has_body(content, region)]
+        
+        overlap_size = self._overlap_for(chunk_size)
+        chunk_index = 0
+        for span_start, span_end, heading_path in spans:
+            start = span_start
+            while start < span_end:
+                end = min(start + chunk_size, span_end)
+                if end < span_end:
+                    end = min(self._find_natural_break(content, start, end), span_end)
+                
+                self._debug(f'region chunk {chunk_index}: {start}-{end} under {heading_path}')
+                yield self._make_chunk(
+                    content, start, end, chunk_index, None,
+                    overlap_with_previous=start > span_start,
+                    overlap_with_next=end < span_end,
+                    heading_path=heading_path
+                )
+                chunk_index += 1
+                
+                if end >= span_end:
+                    break
+                start = max(start + 1, end - overlap_size)
     
-    def _find_natural_break(self, content: str, start: int, preferred_end: int, window: int= 150) -> int:
+    def _find_natural_break(self, content: DocumentBuffer, start: int, preferred_end: int, window: int= 150) -> int:
         """Find natural break point near preferred end"""
+        newline = self._newline(content)
+        sentence_endings = ('.', '!', '?') if isinstance(content, str) else (b'.', b'!', b'?')
+        
         # Look for paragraph breaks first
         search_start = max(start, preferred_end - window)
         search_end = min(len(content), preferred_end + window)
         
         # Look for double newlines (paragraph breaks)
         for i in range(search_end, search_start, -1):
-            if i < len(content) - 1 and content[i:i+2] == '\n\n':
+            if i < len(content) - 1 and content[i:i+2] == newline * 2:
                 return i + 2
         
         # Look for single newlines
+        search_end = min(search_end, len(content) - 1)
         for i in range(search_end, search_start, -1):
-            if content[i] == '\n':
+            if content[i:i+1] == newline:
                 return i + 1
         
         # Look for sentence endings
         for i in range(search_end, search_start, -1):
-            if content[i] in '.!?':
+            if content[i:i+1] in sentence_endings:
                 return i + 1
         
         # Fallback to preferred end
-        return preferred_end
+        return self._align(content, preferred_end)
+    
+    @staticmethod
+    def _newline(content: DocumentBuffer) -> Union[str, bytes]:
+        return '\n' if isinstance(content, str) else b'\n'
+    
+    @staticmethod
+    def _align(content: DocumentBuffer, position: int) -> int:
+        """Move a byte offset back to the start of a UTF-8 character"""
+        if isinstance(content, str):
+            return position
+        while 0 < position < len(content) and (content[position] & 0xC0) == 0x80:
+            position -= 1
+        return position
+    
+    @staticmethod
+    def _align_forward(content: DocumentBuffer, position: int) -> int:
+        """Move a byte offset forward to the start of the next UTF-8 character"""
+        if isinstance(content, str):
+            return position
+        while 0 < position < len(content) and (content[position] & 0xC0) == 0x80:
+            position += 1
+        return position
+    
+    def _overlap_for(self, chunk_size: int) -> int:
+        """Overlap for chunks of chunk_size; a token budget can shrink chunks below overlap_size"""
+        return min(self.overlap_size, chunk_size // 2)
+    
+    def _debug(self, message: str):
+        if self.debug_chunking:
+            print(message)
+    
+    def _effective_chunk_size(self, buffer: DocumentBuffer) -> int:
+        """Characters per chunk, derived from the token budget when one is set"""
+        if not self.token_budget:
+            return self.chunk_size
+        # Convert tokens to characters with the document's own density, sampled
+        # from its beginning so large mapped files are not scanned twice
+        sample = buffer[:1_000_000]
+        chars_per_token = len(sample) / max(1, count_tokens(sample))
+        # Keep a margin so local density variations rarely need a split
+        return max(1, int(self.token_budget * chars_per_token * 0.9))
+    
+    def _iter_fitted_chunks(self, buffer: DocumentBuffer, chunks: Iterator[ChunkView]) -> Iterator[ChunkView]:
+        """Split chunks that would overflow the token budget and merge a tiny trailing chunk"""
+        def iter_ranges():
+            for chunk in chunks:
+                if chunk['estimated_tokens'] <= self.token_budget:
+                    yield chunk['start_char'], chunk['end_char'], chunk.get('heading_path')
+                    continue
+                
+                # Split at natural breaks until every piece fits
+                start = chunk['start_char']
+                while start < chunk['end_char']:
+                    end = chunk['end_char']
+                    tokens = count_tokens(buffer[start:end])
+                    while tokens > self.token_budget and end - start > 1:
+                        # Shrink proportionally to the overflow, then snap to a natural break
+                        preferred_end = start + max(1, int((end - start) * self.token_budget / tokens * 0.95))
+                        previous_end = end
+                        end = self._find_natural_break(buffer, start, preferred_end)
+                        if end <= start or end >= previous_end:
+                            end = self._align(buffer, preferred_end)
+                            if end <= start:
+                                end = preferred_end
+                        tokens = count_tokens(buffer[start:end])
+                    yield start, end, chunk.get('heading_path')
+                    start = end
+        
+        # Two ranges of lookahead: the next range sets overlap flags and the
+        # last pair may still fold together at the end of the document
+        held = []
+        chunk_index = 0
+        previous_end = None
+        for current in iter_ranges():
+            held.append(current)
+            if len(held) < 3:
+                continue
+            start, end, heading_path = held.pop(0)
+            yield self._make_chunk(
+                buffer, start, end, chunk_index, None,
+                overlap_with_previous=previous_end is not None and start < previous_end,
+                overlap_with_next=held[0][0] < end,
+                heading_path=heading_path
+            )
+            previous_end = end
+            chunk_index += 1
+        
+        # Fold a tiny trailing chunk into its predecessor when the result still fits
+        if len(held) == 2:
+            (previous_start, _, previous_path), (last_start, last_end, _) = held
+            if count_tokens(buffer[last_start:last_end]) < self.min_chunk_ratio * self.token_budget \
+                    and count_tokens(buffer[previous_start:last_end]) <= self.token_budget:
+                held = [(previous_start, last_end, previous_path)]
+        
+        for position, (start, end, heading_path) in enumerate(held):
+            yield self._make_chunk(
+                buffer, start, end, chunk_index, None,
+                overlap_with_previous=previous_end is not None and start < previous_end,
+                overlap_with_next=position < len(held) - 1 and held[position + 1][0] < end,
+                heading_path=heading_path
+            )
+            previous_end = end
+            chunk_index += 1
+    
+    def _iter_content_defined_chunks(self, buffer: DocumentBuffer) -> Iterator[ChunkView]:
+        """Yield chunks whose boundaries depend only on nearby content
+        
+        Inserting text only changes the chunks around the edit; all other chunks,
+        including their overlap, keep identical content and hashes.
+        """
+        content_length = len(buffer)
+        newline_char = self._newline(buffer)
+        previous_start = None
+        
+        for chunk_index, (segment_start, end) in enumerate(self._iter_content_defined_boundaries(buffer)):
+            start = segment_start
+            if previous_start is not None and self.overlap_size:
+                # Overlap starts on a line boundary inside the previous segment
+                overlap_start = max(previous_start, segment_start - self.overlap_size)
+                newline = buffer.find(newline_char, overlap_start, segment_start - 1)
+                start = newline + 1 if newline != -1 else segment_start
+            
+            yield self._make_chunk(
+                buffer, start, end, chunk_index, None,
+                overlap_with_previous=start < segment_start,
+                overlap_with_next=end < content_length and self.overlap_size > 0
+            )
+            previous_start = segment_start
+    
+    def _iter_content_defined_boundaries(self, content: DocumentBuffer) -> Iterator[Tuple[int, int]]:
+        """Yield (start, end) segments cut at content-defined line breaks"""
+        content_length = len(content)
+        newline_char = self._newline(content)
+        segment_start = 0
+        position = 0
+        window = deque(maxlen=self.cdc_window_lines)
+        # The last segment is held back so a tiny tail can be folded into it
+        pending = None
+        
+        def emit(segment):
+            nonlocal pending
+            previous, pending = pending, segment
+            return previous
+        
+        while position < content_length:
+            newline = content.find(newline_char, position)
+            line_end = content_length if newline == -1 else newline + 1
+            line = content[position:line_end]
+            
+            # Cut before a line that would push the segment past the max size
+            if line_end - segment_start > self.cdc_max_size and position > segment_start:
+                ready = emit((segment_start, position))
+                if ready:
+                    yield ready
+                segment_start = position
+            
+            # A single line longer than the max size gets hard cuts
+            while line_end - segment_start > self.cdc_max_size:
+                cut = self._align(content, segment_start + self.cdc_max_size)
+                ready = emit((segment_start, cut))
+                if ready:
+                    yield ready
+                segment_start = cut
+            
+            window.append(line if isinstance(line, bytes) else line.encode('utf-8'))
+            if line_end - segment_start >= self.cdc_min_size and self._is_content_boundary(window):
+                ready = emit((segment_start, line_end))
+                if ready:
+                    yield ready
+                segment_start = line_end
+            
+            position = line_end
+        
+        if segment_start < content_length:
+            # Fold a tiny tail into the previous segment when it still fits
+            if pending and content_length - segment_start < self.cdc_min_size \
+                    and content_length - pending[0] <= self.cdc_max_size:
+                pending = (pending[0], content_length)
+            else:
+                ready = emit((segment_start, content_length))
+                if ready:
+                    yield ready
+        
+        if pending:
+            yield pending
     
-    def _generate_chunk_id(self, content: str, index: int) -> str:
+    def _is_content_boundary(self, window: deque) -> bool:
+        """Rolling hash test over the last lines, weighted so chunks average chunk_size"""
+        line_length = len(window[-1].strip())
+        if not line_length:
+            return False
+        window_hash = zlib.crc32(b'\n'.join(window))
+        return window_hash / 2**32 < line_length / self.chunk_size
+    
+    def _create_structure_chunks(self, markdown_content: str) -> List[ChunkView]:
+        """Pack whole headings, tables, lists and paragraphs into token-budgeted chunks
+        
+        Tables and item descriptions are never split unless a single block exceeds
+        the budget, in which case it is split at row/line boundaries. Each chunk
+        carries the heading path it starts under.
+        """
+        blocks = parse_markdown_blocks(markdown_content)
+        groups: List[List[MarkdownBlock]] = []
+        current: List[MarkdownBlock] = []
+        current_tokens = 0
+        
+        def flush():
+            nonlocal current, current_tokens
+            # Trailing headings belong with the content that follows them
+            carried = []
+            while current and current[-1].block_type == 'heading' and len(current) > 1:
+                carried.insert(0, current.pop())
+            if current:
+                groups.append(current)
+            current = carried
+            current_tokens = sum(self._block_tokens(markdown_content, block) for block in carried)
+        
+        for block in blocks:
+            block_tokens = self._block_tokens(markdown_content, block)
+            
+            if block_tokens > self.chunk_token_budget:
+                flush()
+                for piece in self._split_block(markdown_content, block):
+                    current.append(piece)
+                    flush()
+                continue
+            
+            if current and current_tokens + block_tokens > self.chunk_token_budget:
+                flush()
+            current.append(block)
+            current_tokens += block_tokens
+        
+        if current:
+            groups.append(current)
+        
+        chunks = []
+        content_length = len(markdown_content)
+        for chunk_index, group in enumerate(groups):
+            start = group[0].start
+            if chunk_index > 0 and self.structure_overlap_blocks:
+                overlap_blocks = groups[chunk_index - 1][-self.structure_overlap_blocks:]
+                start = overlap_blocks[0].start
+            end = group[-1].end
+            
+            first_block = group[0]
+            heading_path = first_block.heading_path + \
+                ([first_block.text] if first_block.block_type == 'heading' else [])
+            chunks.append(self._make_chunk(
+                markdown_content, start, end, chunk_index, len(groups),
+                overlap_with_previous=start < group[0].start,
+                overlap_with_next=end < content_length and self.structure_overlap_blocks > 0,
+                heading_path=heading_path
+            ))
+        
+        return chunks
+    
+    def _block_tokens(self, content: str, block: MarkdownBlock) -> int:
+        return count_tokens(content[block.start:block.end])
+    
+    def _split_block(self, content: str, block: MarkdownBlock) -> List[MarkdownBlock]:
+        """Split an oversized block at line boundaries into budget-sized pieces"""
+        pieces = []
+        piece_start = block.start
+        piece_tokens = 0
+        position = block.start
+        
+        while position < block.end:
+            newline = content.find('\n', position, block.end)
+            line_end = block.end if newline == -1 else newline + 1
+            line_tokens = count_tokens(content[position:line_end])
+            if piece_tokens and piece_tokens + line_tokens > self.chunk_token_budget:
+                pieces.append(MarkdownBlock(block.block_type, piece_start, position,
+                                            heading_path=block.heading_path))
+                piece_start = position
+                piece_tokens = 0
+            piece_tokens += line_tokens
+            position = line_end
+        
+        pieces.append(MarkdownBlock(block.block_type, piece_start, block.end,
+                                    heading_path=block.heading_path))
+        return pieces
+    
+    def _make_chunk(self, document: DocumentBuffer, start: int, end: int, chunk_index: int,
+                    total_chunks: Optional[int], overlap_with_previous: bool, overlap_with_next: bool,
+                    heading_path: Optional[List[str]] = None) -> ChunkView:
+        """Create a chunk view; the content slice only lives while hashing"""
+        chunk_content = document[start:end]
+        return ChunkView(
+            document,
+            chunk_id=self._generate_chunk_id(chunk_content, chunk_index),
+            chunk_index=chunk_index,
+            total_chunks=total_chunks,
+            start_char=start,
+            end_char=end,
+            estimated_tokens=count_tokens(chunk_content),
+            overlap_with_previous=overlap_with_previous,
+            overlap_with_next=overlap_with_next,
+            heading_path=heading_path
+        )
+    
+    def _generate_chunk_id(self, content: Union[str, bytes], index: int) -> str:
         """Generate unique chunk ID"""
-        content_hash = hashlib.md5(content.encode()).hexdigest()[:8]
+        content_bytes = content.encode() if isinstance(content, str) else content
+        content_hash = hashlib.md5(content_bytes).hexdigest()[:8]
         return f"chunk_{index}_{content_hash}"
 
 
 
 
+def compute_chunk_token_budget(config: Dict[str, Any], prompt_overhead_tokens: int) -> int:
+    """Tokens available for chunk content: context window minus prompt and expected output"""
+    context_window = config.get('context_window_size', 8192)
+    provider_config = config.get('llm_providers', {}).get('structure_extraction', {})
+    expected_output = provider_config.get('max_tokens', 2048)
+    
+    # The tokenizer counting chunks is not necessarily the model's own
+    margin = config.get('chunk_token_margin', 0.1)
+    budget = int((context_window - prompt_overhead_tokens - expected_output) * (1 - margin))
+    if budget < config.get('min_chunk_token_budget', 256):
+        raise ValueError(
+            f"Context window of {context_window} tokens leaves no room for chunk content "
+            f"(prompt: {prompt_overhead_tokens}, output: {expected_output})"
+        )
+    return budget
+
+def chunk_content_hash(chunk: Dict[str, Any]) -> str:
+    """Content hash part of a chunk ID, independent of the chunk's position"""
+    return chunk['chunk_id'].rsplit('_', 1)[-1]
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+def count_tokens(text: Union[str, bytes]) -> int:
+    """Prompt tokens of a text, for budgets that must not be exceeded
+
+    Uses tiktoken when installed. Otherwise assumes 3 characters per token,
+    which French and number-heavy table text rarely goes below.
+    """
+    if isinstance(text, (bytes, bytearray, memoryview)):
+        text = bytes(text).decode('utf-8', errors='ignore')
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + 2) // 3
+
 def estimate_tokens(text: str) -> int:
     """Rough estimation of token count (1 token ≈ 0.75 words)"""
     word_count = len(text.split())
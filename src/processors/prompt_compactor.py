@@ -0,0 +1,154 @@
+# src/processors/prompt_compactor.py
+import bisect
+import re
+import threading
+from typing import Dict, Any, List, Optional
+
+from .markdown_chunker import count_tokens
+
+# Rewrite rules by name, each a pattern and its replacement; applied in one
+# left-to-right scan, earlier rules winning where several match
+COMPACTION_RULES = {
+    'images': (r'!\[[^\]\n]*\]\([^)\n]*\)', ''),
+    'leaders': (r'[ \t]*(?:\.{4,}|…{2,})[ \t]*', ' '),
+    'table_padding': (r'-{4,}', '---'),
+    'whitespace': (r'[ \t]+(?=\n|$)|[ \t]{2,}|\t|\n(?:[ \t]*\n){2,}', None),
+}
+
+class Compaction:
+    """Compacted text with a map from its positions back to the original text"""
+
+    def __init__(self, original: str, text: str, compact_starts: List[int],
+                 original_starts: List[int], verbatim: List[bool]):
+        self.original = original
+        self.text = text
+        # Segment i starts at compact_starts[i] / original_starts[i]; verbatim
+        # segments map position by position, replaced ones to their start
+        self._compact_starts = compact_starts
+        self._original_starts = original_starts
+        self._verbatim = verbatim
+
+    def to_original(self, position: int) -> int:
+        """Original offset of a position in the compacted text"""
+        segment = bisect.bisect_right(self._compact_starts, position) - 1
+        if segment < 0:
+            return 0
+        if not self._verbatim[segment]:
+            return self._original_starts[segment]
+        return self._original_starts[segment] + (position - self._compact_starts[segment])
+
+    def to_original_end(self, position: int) -> int:
+        """Original offset just after the character before an exclusive end position
+
+        Text removed right after the end (leader dots, trailing spaces) is not included.
+        """
+        if position <= 0:
+            return 0
+        segment = bisect.bisect_right(self._compact_starts, position - 1) - 1
+        if self._verbatim[segment]:
+            return self._original_starts[segment] + (position - self._compact_starts[segment])
+        # A replaced span ends where the next segment starts
+        if segment + 1 < len(self._original_starts):
+            return self._original_starts[segment + 1]
+        return len(self.original)
+
+    def find_original(self, text: str, start: int = 0) -> Optional[tuple]:
+        """Original (start, end) of the first occurrence of text in the compacted text"""
+        position = self.text.find(text, start) if text else -1
+        if position == -1:
+            return None
+        return self.to_original(position), self.to_original_end(position + len(text))
+
+    @property
+    def tokens_saved(self) -> int:
+        return count_tokens(self.original) - count_tokens(self.text)
+
+class CompactionTotals:
+    """Content tokens before and after compaction, per phase, for one document
+
+    Created per document run so that reports of concurrent runs stay apart.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: Dict[str, List[int]] = {}
+
+    def add(self, phase: str, before: int, after: int):
+        with self._lock:
+            totals = self._totals.setdefault(phase, [0, 0])
+            totals[0] += before
+            totals[1] += after
+
+    def report(self, phase: str) -> Optional[str]:
+        """Tokens saved in a phase, None when nothing was compacted"""
+        with self._lock:
+            totals = self._totals.get(phase)
+        if not totals:
+            return None
+        before, after = totals
+        return (f"Prompt compaction ({phase}): {before - after} of {before} content tokens saved "
+                f"({(before - after) / max(1, before):.0%})")
+
+class PromptCompactor:
+    """Shrinks chunk and item content before it is put in a prompt
+
+    Strips image references and leader dots, shortens table separator rows,
+    and collapses padding, trailing spaces and blank line runs. Phase 2 maps
+    the delimiters returned for the compacted text back to the original
+    with the Compaction offset map. Savings are totalled per phase in the
+    caller's CompactionTotals.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.enabled = config.get('prompt_compaction', False)
+        rules = config.get('compaction_rules', list(COMPACTION_RULES))
+        self._pattern = re.compile('|'.join(
+            f'(?P<{name}>{COMPACTION_RULES[name][0]})' for name in COMPACTION_RULES if name in rules
+        )) if rules else None
+
+    def compact(self, text: str, phase: Optional[str] = None,
+                totals: Optional[CompactionTotals] = None) -> Compaction:
+        """Compacted text and offset map; an identity compaction when disabled"""
+        if not self.enabled or self._pattern is None:
+            return Compaction(text, text, [0], [0], [True])
+
+        pieces = []
+        compact_starts, original_starts, verbatim = [], [], []
+        compact_position = 0
+        last_end = 0
+
+        def add_segment(original_start: int, piece: str, is_verbatim: bool):
+            nonlocal compact_position
+            compact_starts.append(compact_position)
+            original_starts.append(original_start)
+            verbatim.append(is_verbatim)
+            pieces.append(piece)
+            compact_position += len(piece)
+
+        for match in self._pattern.finditer(text):
+            if match.start() > last_end:
+                add_segment(last_end, text[last_end:match.start()], True)
+            add_segment(match.start(), self._replacement(match), False)
+            last_end = match.end()
+        if last_end < len(text) or not pieces:
+            add_segment(last_end, text[last_end:], True)
+
+        compaction = Compaction(text, ''.join(pieces), compact_starts, original_starts, verbatim)
+        if phase and totals is not None:
+            totals.add(phase, count_tokens(text), count_tokens(compaction.text))
+        return compaction
+
+    def compact_text(self, text: str, phase: Optional[str] = None,
+                     totals: Optional[CompactionTotals] = None) -> str:
+        return self.compact(text, phase, totals).text
+
+    @staticmethod
+    def _replacement(match: re.Match) -> str:
+        replacement = COMPACTION_RULES[match.lastgroup][1]
+        if replacement is None:
+            # Whitespace: keep one blank line of a run, single spaces otherwise
+            replacement = '\n\n' if '\n' in match.group() else ' '
+        if replacement == ' ' and (match.end() == len(match.string) or match.string[match.end()] == '\n'):
+            # Nothing trails a line
+            return ''
+        return replacement
@@ -1,10 +1,20 @@
 # src/processors/section_detail_analyzer.py
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Tuple
+import hashlib
+import json
 
 from ..utils.enhanced_llm_client import EnhancedLLMClient
 
-from ..prompts.section_details_prompt import get_section_detail_prompt
+from ..prompts.section_details_prompt import (get_section_detail_prompt, get_batch_item_detail_prompt,
+                                               get_minimal_item_detail_prompt,
+                                               get_minimal_batch_item_detail_prompt,
+                                               get_document_fields_prompt)
 from ..utils.json_cleaner import JSONResponseCleaner
+from ..utils.delimiter_index import DelimiterIndex, normalize_whitespace
+from ..utils.item_dedup_index import normalize_item_name
+from ..utils.article_catalog import ArticleCatalog, CONFIDENCE_LEVELS
+from .table_item_parser import TableItemParser
+from .prompt_compactor import PromptCompactor, CompactionTotals
 import re
 
 class SectionDetailAnalyzer:
@@ -16,7 +26,61 @@ class SectionDetailAnalyzer:
 
         self.json_cleaner = JSONResponseCleaner()
         
-        self.item_detail_prompt = get_section_detail_prompt()
+        # "minimal" asks only for the fields found in the content; the other
+        # fields get their defaults from _create_empty_details
+        self.item_output_schema = config.get('item_output_schema', 'full')
+        if self.item_output_schema == 'minimal':
+            self.item_detail_prompt = get_minimal_item_detail_prompt()
+            self.batch_item_detail_prompt = get_minimal_batch_item_detail_prompt()
+        else:
+            self.item_detail_prompt = get_section_detail_prompt()
+            self.batch_item_detail_prompt = get_batch_item_detail_prompt()
+        self.document_fields_prompt = get_document_fields_prompt()
+        
+        # "batched" sends each chunk once with all of its items instead of once per item
+        self.item_analysis_mode = config.get('item_analysis_mode', 'per_item')
+        provider_config = config.get('llm_providers', {}).get(self.task_name, {})
+        self.batch_output_tokens = config.get('batch_output_tokens', provider_config.get('max_tokens', 2048))
+        # Expected response size of one item's details
+        self.item_output_tokens = config.get('item_output_tokens',
+                                             200 if self.item_output_schema == 'minimal' else 600)
+        
+        # "slice" sends each item's own lines located by its delimiters, "chunk" the whole chunk
+        self.item_content_mode = config.get('item_content_mode', 'slice')
+        self.max_item_chars = config.get('max_item_chars', 4000)
+        # Analyze repeated identical items (same name and content) once
+        self.coalesce_items = config.get('coalesce_items', True)
+        
+        # Article-level fields known from earlier documents are not re-derived
+        self.catalog = None
+        if config.get('article_catalog_path'):
+            self.catalog = ArticleCatalog(config['article_catalog_path'],
+                                          config.get('catalog_min_confidence', 'high'))
+        
+        # Two-tier cascade: a small model first, the large model only for uncertain items
+        self.cascade_config = {
+            'first_tier_task': 'item_analysis_local',
+            'second_tier_task': self.task_name,
+            'min_confidence': 'medium',
+            'require_quantity': True,
+            'require_price': False,
+            **config.get('analysis_cascade', {})
+        }
+        self.cascade_enabled = self.cascade_config.get('enabled', False)
+        if self.cascade_enabled:
+            # Without a first-tier provider every item would fail there and be escalated
+            configured_tasks = config.get('llm_providers', {})
+            missing_tasks = [self.cascade_config[tier] for tier in ('first_tier_task', 'second_tier_task')
+                             if self.cascade_config[tier] not in configured_tasks]
+            if missing_tasks:
+                print(f"⚠️  Analysis cascade disabled: no llm_providers entry for {', '.join(missing_tasks)}")
+                self.cascade_enabled = False
+        
+        # Item content is compacted before it is put in a prompt
+        self.compactor = PromptCompactor(config)
+        
+        # Plain table rows are read directly; needs item slices
+        self.table_parser = TableItemParser() if config.get('table_fast_path', True) else None
     
     def analyze_sections_detailed(self, structure_with_delimiters: Dict[str, Any], 
                                  content_for_analysis: str,
@@ -71,40 +135,400 @@ class SectionDetailAnalyzer:
     
 
     def analyze_offer_items_detailed(self, offer_structure: Dict[str, Any], 
-                                   overlapping_chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Analyze each offer item in detail using chunk content and delimiters"""
+                                   overlapping_chunks: List[Dict[str, Any]],
+                                   completed_items: Optional[Dict[str, Dict[str, Any]]] = None,
+                                   on_item_analyzed: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Analyze each offer item in detail using chunk content and delimiters
+        
+        Items whose offer_item_id is in completed_items reuse those details;
+        on_item_analyzed is called after each successful item analysis.
+        """
+        completed_items = completed_items or {}
         
         # Create chunk lookup
         chunk_lookup = {chunk['chunk_id']: chunk for chunk in overlapping_chunks}
         
-        # Process all offer items
-        processed_structure = self._deep_copy_structure(offer_structure)
+        # The Phase 2 structure is only read; details are collected per item
+        # and attached to copies of those items at the end
+        item_details_overlay: Dict[int, Dict[str, Any]] = {}
         total_items_processed = 0
+        delimiter_index = self._build_delimiter_index(offer_structure, overlapping_chunks)
+        # Compaction savings of this document only
+        compaction_totals = CompactionTotals()
         
         print("Phase 3: Detailed analysis of individual offer items...")
         
-        for main_group in processed_structure.get('offer_item_groups', []):
+        pending_items = []
+        for main_group in offer_structure.get('offer_item_groups', []):
             for sub_group in main_group.get('offer_groups', []):
                 items = sub_group.get('offer_items', [])
                 print(f"  Processing {len(items)} items in sub-group: {sub_group.get('name', 'Unnamed')}")
                 
                 for item in items:
-                    item_details = self._analyze_single_item(item, main_group, sub_group, chunk_lookup)
-                    if item_details:
-                        item['details'] = item_details
+                    if item.get('offer_item_id') in completed_items:
+                        item_details_overlay[id(item)] = completed_items[item['offer_item_id']]
                         total_items_processed += 1
-                    else:
-                        item['details'] = self._create_empty_details()
+                        continue
+                    pending_items.append((item, main_group, sub_group))
+        
+        # Repeated identical items are analyzed once
+        representatives, duplicates = self._coalesce_items(pending_items, chunk_lookup, delimiter_index)
+        
+        # Known articles only need their offer-specific fields
+        catalog_entries = {}
+        if self.catalog:
+            for item, _, _ in representatives:
+                catalog_entry = self.catalog.lookup(item)
+                if catalog_entry:
+                    catalog_entries[id(item)] = catalog_entry
+            print(f"  Article catalog: {len(catalog_entries)}/{len(representatives)} items known")
+        
+        occurrences: Dict[int, List[Dict[str, Any]]] = {id(item): [item] for item, _, _ in representatives}
+        for item, representative in duplicates:
+            occurrences[id(representative)].append(item)
+        
+        # Each result is recorded as soon as it arrives, so an interrupted run
+        # keeps every item analyzed so far
+        analyzed_items = set()
+        
+        def record_result(item: Dict[str, Any], item_details: Dict[str, Any], from_table: bool = False):
+            nonlocal total_items_processed
+            if not item_details or id(item) in analyzed_items:
+                return
+            analyzed_items.add(id(item))
+            # The representative's details are fanned out to every occurrence
+            for occurrence in occurrences[id(item)]:
+                total_items_processed += self._set_item_details(item_details_overlay, occurrence, item_details,
+                                                                on_item_analyzed)
+            if self.catalog and id(item) not in catalog_entries and not from_table:
+                self.catalog.record(item, item_details)
+        
+        # Items resolved from their table row skip the LLM
+        table_results = self._parse_table_items(representatives, catalog_entries, chunk_lookup, delimiter_index)
+        for item, _, _ in representatives:
+            if id(item) in table_results:
+                record_result(item, table_results[id(item)], from_table=True)
+        llm_items = [entry for entry in representatives if id(entry[0]) not in table_results]
+        
+        if self.cascade_enabled:
+            self._analyze_cascade(llm_items, catalog_entries, chunk_lookup, delimiter_index,
+                                  record_result, compaction_totals)
+        else:
+            self._analyze_representatives(llm_items, catalog_entries, chunk_lookup, delimiter_index,
+                                          self.task_name, record_result, compaction_totals)
+        
+        # Items without a usable analysis keep empty details
+        for item, _, _ in representatives:
+            if id(item) not in analyzed_items:
+                for occurrence in occurrences[id(item)]:
+                    self._set_item_details(item_details_overlay, occurrence, None, on_item_analyzed)
         
         print(f"  Completed detailed analysis of {total_items_processed} items")
+        compaction_report = compaction_totals.report('phase_3')
+        if compaction_report:
+            print(f"  {compaction_report}")
+        
+        return self._apply_details_overlay(offer_structure, item_details_overlay)
+    
+    def _analyze_representatives(self, entries: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]],
+                                 catalog_entries: Dict[int, Dict[str, Any]],
+                                 chunk_lookup: Dict[str, Dict[str, Any]],
+                                 delimiter_index: Optional[DelimiterIndex],
+                                 task_name: str,
+                                 on_result: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None,
+                                 compaction_totals: Optional[CompactionTotals] = None) -> Dict[int, Dict[str, Any]]:
+        """Analyze items with one provider, per item or batched; results keyed by item identity
+        
+        on_result is called with each item and its details as soon as they arrive.
+        """
+        results = {}
+        
+        def add_result(item: Dict[str, Any], item_details: Optional[Dict[str, Any]]):
+            if item_details:
+                results[id(item)] = item_details
+                if on_result:
+                    on_result(item, item_details)
+        
+        if self.item_analysis_mode == 'batched':
+            self._analyze_items_batched(
+                [entry for entry in entries if id(entry[0]) not in catalog_entries],
+                chunk_lookup, delimiter_index, task_name, add_result, compaction_totals
+            )
+        
+        for item, main_group, sub_group in entries:
+            if id(item) in results:
+                continue
+            # Catalog items, unbatched items and items missing from a batch response
+            add_result(item, self._analyze_single_item(item, main_group, sub_group, chunk_lookup,
+                                                       delimiter_index, catalog_entries.get(id(item)),
+                                                       task_name, compaction_totals))
+        return results
+    
+    def _parse_table_items(self, entries: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]],
+                           catalog_entries: Dict[int, Dict[str, Any]],
+                           chunk_lookup: Dict[str, Dict[str, Any]],
+                           delimiter_index: Optional[DelimiterIndex]) -> Dict[int, Dict[str, Any]]:
+        """Details of items whose lines are a plain table row, keyed by item identity"""
+        if self.table_parser is None or delimiter_index is None or not entries:
+            return {}
+        
+        results = {}
+        for item, _, _ in entries:
+            chunk = chunk_lookup.get(item.get('chunk_id'))
+            item_slice = self._slice_item(item, chunk, delimiter_index) if chunk else None
+            if item_slice is None:
+                continue
+            parsed = self.table_parser.parse(self._sliced_content(*item_slice, delimiter_index))
+            if parsed is None:
+                continue
+            if id(item) in catalog_entries:
+                results[id(item)] = self._merge_catalog_entry(catalog_entries[id(item)], parsed)
+            else:
+                details = self._create_empty_details()
+                details['item_details'].update(parsed['item_details'])
+                details['extraction_metadata'] = parsed['extraction_metadata']
+                results[id(item)] = details
+        
+        print(f"  Table fast path: {len(results)}/{len(entries)} items read from their table row, "
+              f"{len(entries) - len(results)} left for the LLM")
+        return results
+    
+    def _analyze_cascade(self, entries: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]],
+                         catalog_entries: Dict[int, Dict[str, Any]],
+                         chunk_lookup: Dict[str, Dict[str, Any]],
+                         delimiter_index: Optional[DelimiterIndex],
+                         on_result: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None,
+                         compaction_totals: Optional[CompactionTotals] = None) -> Dict[int, Dict[str, Any]]:
+        """Analyze all items with the small model, then re-run uncertain ones on the large model
+        
+        on_result only sees each item's final answer: settled first-tier answers
+        right away, escalated items once the second tier is done with them.
+        """
+        def settle_first_tier(item: Dict[str, Any], item_details: Dict[str, Any]):
+            if on_result and not self._needs_escalation(item_details):
+                on_result(item, item_details)
+        
+        results = self._analyze_representatives(entries, catalog_entries, chunk_lookup,
+                                                 delimiter_index, self.cascade_config['first_tier_task'],
+                                                 settle_first_tier, compaction_totals)
+        
+        escalated = [entry for entry in entries if self._needs_escalation(results.get(id(entry[0])))]
+        second_tier_results = self._analyze_representatives(escalated, catalog_entries, chunk_lookup,
+                                                            delimiter_index, self.cascade_config['second_tier_task'],
+                                                            on_result, compaction_totals)
+        # A failed large-model call keeps the small model's answer
+        results.update(second_tier_results)
+        if on_result:
+            for item, _, _ in escalated:
+                if id(item) not in second_tier_results and id(item) in results:
+                    on_result(item, results[id(item)])
+        
+        print(f"  Analysis cascade: {len(entries) - len(escalated)} items settled by "
+              f"{self.cascade_config['first_tier_task']}, {len(escalated)} escalated to "
+              f"{self.cascade_config['second_tier_task']} ({len(second_tier_results)} answered)")
+        return results
+    
+    def _needs_escalation(self, item_details: Optional[Dict[str, Any]]) -> bool:
+        """Whether a first-tier answer is too uncertain or incomplete to keep"""
+        if not item_details:
+            return True
+        metadata = item_details.get('extraction_metadata', {})
+        confidence = CONFIDENCE_LEVELS.get(metadata.get('confidence_level', 'none'), 0)
+        if confidence < CONFIDENCE_LEVELS.get(self.cascade_config['min_confidence'], 2):
+            return True
+        if self.cascade_config['require_quantity'] and not metadata.get('found_quantity'):
+            return True
+        if self.cascade_config['require_price'] and not metadata.get('found_price'):
+            return True
+        return False
+    
+    def _coalesce_items(self, pending_items: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]],
+                        chunk_lookup: Dict[str, Dict[str, Any]],
+                        delimiter_index: Optional[DelimiterIndex]) -> Tuple[List, List]:
+        """Group items by a fingerprint of normalized name and content slice
+        
+        Returns the items to analyze and (duplicate, representative) pairs.
+        Items whose slice cannot be located are always analyzed on their own.
+        """
+        representatives = []
+        duplicates = []
+        by_fingerprint: Dict[str, Dict[str, Any]] = {}
+        
+        for entry in pending_items:
+            item = entry[0]
+            chunk = chunk_lookup.get(item.get('chunk_id'))
+            item_slice = self._slice_item(item, chunk, delimiter_index) if chunk else None
+            if not self.coalesce_items or item_slice is None:
+                representatives.append(entry)
+                continue
+            
+            slice_text = normalize_whitespace(delimiter_index.document[item_slice[0]:item_slice[1]])
+            fingerprint = hashlib.sha1(
+                f"{normalize_item_name(item.get('name', ''))}\0{slice_text}".encode('utf-8')
+            ).hexdigest()
+            if fingerprint in by_fingerprint:
+                duplicates.append((item, by_fingerprint[fingerprint]))
+            else:
+                by_fingerprint[fingerprint] = item
+                representatives.append(entry)
+        
+        if duplicates:
+            print(f"  Coalesced {len(duplicates)} repeated items into {len(representatives)} analyses "
+                  f"({len(duplicates)} calls saved)")
+        return representatives, duplicates
+    
+    def _build_delimiter_index(self, offer_structure: Dict[str, Any],
+                               overlapping_chunks: List[Dict[str, Any]]) -> Optional[DelimiterIndex]:
+        """Index all items' delimiters in the document once, for per-item content slices"""
+        if self.item_content_mode != 'slice' or not overlapping_chunks:
+            return None
+        document = getattr(overlapping_chunks[0], 'document', None)
+        if not isinstance(document, str):
+            # Memory-mapped input is analyzed with whole chunks
+            return None
+        
+        items = [item
+                 for main_group in offer_structure.get('offer_item_groups', [])
+                 for sub_group in main_group.get('offer_groups', [])
+                 for item in sub_group.get('offer_items', [])]
+        delimiter_index = DelimiterIndex(document, self.max_item_chars)
+        delimiter_index.index_items(items)
+        return delimiter_index
+    
+    def _slice_item(self, item: Dict[str, Any], chunk: Dict[str, Any],
+                    delimiter_index: Optional[DelimiterIndex]) -> Optional[Tuple[int, int]]:
+        """Document offsets of the item's lines, None when its start delimiter is not found"""
+        if delimiter_index is None:
+            return None
+        search_start = chunk['start_char']
+        start_offset = item.get('start_offset')
+        if start_offset is not None and chunk['start_char'] <= start_offset < chunk['end_char']:
+            search_start = start_offset
+        return delimiter_index.locate(item, search_start, chunk['end_char'])
+    
+    def _sliced_content(self, start: int, end: int, delimiter_index: DelimiterIndex) -> str:
+        """Item lines, preceded by the header of the table they belong to"""
+        return delimiter_index.table_header(start) + delimiter_index.document[start:end]
+    
+    def _set_item_details(self, item_details_overlay: Dict[int, Dict[str, Any]], item: Dict[str, Any],
+                          item_details: Optional[Dict[str, Any]],
+                          on_item_analyzed: Optional[Callable[[str, Dict[str, Any]], None]]) -> int:
+        """Record analysis results for an item, returns 1 when the analysis succeeded"""
+        if not item_details:
+            item_details_overlay[id(item)] = self._create_empty_details()
+            return 0
         
-        return processed_structure
+        item_details_overlay[id(item)] = item_details
+        if on_item_analyzed:
+            on_item_analyzed(item['offer_item_id'], item_details)
+        return 1
+    
+    def _analyze_items_batched(self, pending_items: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]],
+                               chunk_lookup: Dict[str, Dict[str, Any]],
+                               delimiter_index: Optional[DelimiterIndex] = None,
+                               task_name: Optional[str] = None,
+                               on_result: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None,
+                               compaction_totals: Optional[CompactionTotals] = None) -> Dict[str, Dict[str, Any]]:
+        """Analyze items one chunk at a time, batches sized by the output token budget
+        
+        on_result is called for each answered item as soon as its batch returns.
+        """
+        items_by_chunk: Dict[str, List] = {}
+        for entry in pending_items:
+            chunk_id = entry[0].get('chunk_id')
+            if chunk_id in chunk_lookup:
+                items_by_chunk.setdefault(chunk_id, []).append(entry)
+        
+        batch_size = max(1, self.batch_output_tokens // self.item_output_tokens)
+        details = {}
+        calls = 0
+        for chunk_id, entries in items_by_chunk.items():
+            for batch_start in range(0, len(entries), batch_size):
+                batch = entries[batch_start:batch_start + batch_size]
+                batch_details = self._analyze_item_batch(batch, chunk_lookup[chunk_id], delimiter_index,
+                                                         task_name, compaction_totals)
+                details.update(batch_details)
+                calls += 1
+                if on_result:
+                    for item, _, _ in batch:
+                        if item['offer_item_id'] in batch_details:
+                            on_result(item, batch_details[item['offer_item_id']])
+        
+        print(f"  Batched analysis: {len(pending_items)} items in {calls} calls, "
+              f"{len(pending_items) - len(details)} left for individual analysis")
+        return details
+    
+    def _analyze_item_batch(self, batch: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]],
+                            chunk: Dict[str, Any],
+                            delimiter_index: Optional[DelimiterIndex] = None,
+                            task_name: Optional[str] = None,
+                            compaction_totals: Optional[CompactionTotals] = None) -> Dict[str, Dict[str, Any]]:
+        """Analyze several items of one chunk in a single call, keyed by offer_item_id"""
+        try:
+            # Send the span covering the batch's items when all of them were located
+            batch_content = chunk['content']
+            slices = [self._slice_item(item, chunk, delimiter_index) for item, _, _ in batch]
+            if slices and all(slices):
+                batch_content = self._sliced_content(min(start for start, _ in slices),
+                                                     max(end for _, end in slices), delimiter_index)
+            
+
+            items_info = []
+            for item, main_group, sub_group in batch:
+                item_line = (f"- item_key: {item['offer_item_id']} | Name: {item.get('name')} | "
+                             f"Main Category: {main_group.get('name', 'Unknown')} | "
+                             f"Sub-Category: {sub_group.get('name', 'Unknown')}")
+                if 'start_delimiter' in item:
+                    item_line += f" | Start Delimiter: {item.get('start_delimiter', 'None')}"
+                if 'end_delimiter' in item:
+                    item_line += f" | End Delimiter: {item.get('end_delimiter', 'None')}"
+                items_info.append(item_line)
+            
+            response = self.llm_client.invoke(
+                task_name or self.task_name,
+                self.batch_item_detail_prompt.format(
+                    items_info='\n'.join(items_info),
+                    chunk_content=self.compactor.compact_text(batch_content, 'phase_3', compaction_totals)
+                )
+            )
+            
+            analysis = self.json_cleaner.extract_json(response)
+            if not analysis:
+                print(f"    Warning: Could not extract JSON for batch of {len(batch)} items in chunk {chunk['chunk_id']}")
+                return {}
+            
+            expected_keys = {item['offer_item_id'] for item, _, _ in batch}
+            details = {}
+            for entry in analysis.get('items', []):
+                item_key = str(entry.pop('item_key', ''))
+                if item_key not in expected_keys:
+                    continue
+                if self.item_output_schema == 'minimal' and 'extraction_metadata' in entry:
+                    # Nothing found is a valid minimal answer
+                    details[item_key] = self._with_defaults(entry)
+                elif entry.get('item_details'):
+                    details[item_key] = entry
+            
+            print(f"    ✓ Analyzed {len(details)}/{len(batch)} items from chunk {chunk['chunk_id']}")
+            return details
+            
+        except Exception as e:
+            print(f"    Error analyzing batch in chunk {chunk.get('chunk_id')}: {e}")
+            return {}
     
     def _analyze_single_item(self, item: Dict[str, Any], 
                            main_group: Dict[str, Any], 
                            sub_group: Dict[str, Any],
-                           chunk_lookup: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        """Analyze a single offer item in detail"""
+                           chunk_lookup: Dict[str, Dict[str, Any]],
+                           delimiter_index: Optional[DelimiterIndex] = None,
+                           catalog_entry: Optional[Dict[str, Any]] = None,
+                           task_name: Optional[str] = None,
+                           compaction_totals: Optional[CompactionTotals] = None) -> Optional[Dict[str, Any]]:
+        """Analyze a single offer item in detail, using its own lines when they can be located
+        
+        With a catalog_entry, only the offer-specific fields are requested and
+        merged over the article fields from the catalog.
+        """
         try:
             # Get chunk content
             chunk_id = item.get('chunk_id')
@@ -114,9 +538,12 @@ class SectionDetailAnalyzer:
             
             chunk = chunk_lookup[chunk_id]
             
-            # # Extract item content using delimiters
-            # item_content = self._extract_item_content(item, chunk['content'])
-            item_content = chunk['content']
+            # Slice the item from the document, falling back to the whole chunk
+            item_slice = self._slice_item(item, chunk, delimiter_index)
+            if item_slice:
+                item_content = self._sliced_content(*item_slice, delimiter_index)
+            else:
+                item_content = chunk['content']
             
             if not item_content.strip():
                 print(f"    Warning: No content extracted for item: {item.get('name', 'Unnamed')}")
@@ -133,15 +560,23 @@ class SectionDetailAnalyzer:
             if 'end_delimiter' in item:
                 item_info += f" | End Delimiter: {item.get('end_delimiter', 'None')}"
             
+            item_content = self.compactor.compact_text(item_content, 'phase_3', compaction_totals)
+            
             # Analyze with LLM
-            response = self.llm_client.invoke(
-                self.task_name,
-                self.item_detail_prompt.format(
+            if catalog_entry:
+                prompt = self.document_fields_prompt.format(
+                    item_content=item_content,
+                    item_info=item_info,
+                    context_info=context_info,
+                    known_fields=json.dumps(catalog_entry, ensure_ascii=False)
+                )
+            else:
+                prompt = self.item_detail_prompt.format(
                     item_content=item_content,
                     item_info=item_info,
                     context_info=context_info
                 )
-            )
+            response = self.llm_client.invoke(task_name or self.task_name, prompt)
             
             # Parse response
             analysis = self.json_cleaner.extract_json(response)
@@ -150,6 +585,11 @@ class SectionDetailAnalyzer:
                 print(f"    Warning: Could not extract JSON for item: {item.get('name', 'Unnamed')}")
                 return None
             
+            if catalog_entry:
+                analysis = self._merge_catalog_entry(catalog_entry, analysis)
+            elif self.item_output_schema == 'minimal':
+                analysis = self._with_defaults(analysis)
+            
             print(f"    ✓ Analyzed item: {item.get('name', 'Unnamed')[:50]}...")
             return analysis
             
@@ -157,78 +597,27 @@ class SectionDetailAnalyzer:
             print(f"    Error analyzing item {item.get('name', 'Unnamed')}: {e}")
             return None
     
-    def _extract_item_content(self, item: Dict[str, Any], chunk_content: str) -> str:
-        """Extract specific item content using delimiters"""
-        start_delimiter = item.get('start_delimiter', '')
-        end_delimiter = item.get('end_delimiter', '')
-        
-        if not start_delimiter:
-            # If no delimiter, try to find content around item name
-            item_name = item.get('name', '')
-            if item_name:
-                return self._extract_content_around_name(item_name, chunk_content)
-            return ""
-        
-        # Extract using delimiters
-        start_pos = chunk_content.find(start_delimiter)
-        if start_pos == -1:
-            # Try fuzzy matching
-            start_pos = self._fuzzy_find_delimiter(chunk_content, start_delimiter)
-            if start_pos == -1:
-                return ""
-        
-        # Find end position
-        if end_delimiter:
-            end_pos = chunk_content.find(end_delimiter, start_pos + len(start_delimiter))
-            if end_pos == -1:
-                end_pos = min(start_pos + 1000, len(chunk_content))  # Reasonable limit
-        else:
-            end_pos = min(start_pos + 800, len(chunk_content))
-        
-        # Extract content
-        content = chunk_content[start_pos:end_pos]
-        
-        # Include some context before and after
-        context_before = chunk_content[max(0, start_pos - 200):start_pos]
-        context_after = chunk_content[end_pos:min(len(chunk_content), end_pos + 200)]
-        
-        full_content = f"{context_before}\n--- ITEM CONTENT ---\n{content}\n--- END ITEM ---\n{context_after}"
-        
-        return full_content
-    
-    def _extract_content_around_name(self, item_name: str, chunk_content: str) -> str:
-        """Extract content around item name when no delimiters available"""
-        # Find item name in content
-        name_pos = chunk_content.find(item_name)
-        if name_pos == -1:
-            # Try partial matching
-            name_words = item_name.split()[:3]  # First 3 words
-            for word in name_words:
-                name_pos = chunk_content.find(word)
-                if name_pos != -1:
-                    break
-        
-        if name_pos == -1:
-            return chunk_content[:1000]  # Return first part of chunk
-        
-        # Extract context around the name
-        start_pos = max(0, name_pos - 300)
-        end_pos = min(len(chunk_content), name_pos + 700)
-        
-        return chunk_content[start_pos:end_pos]
+    def _merge_catalog_entry(self, catalog_entry: Dict[str, Any], analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Full details from catalog article fields and the offer-specific analysis"""
+        details = self._create_empty_details()
+        details['item_details'].update(catalog_entry.get('item_details', {}))
+        details['item_details'].update(analysis.get('item_details', {}))
+        details['additional_fields'] = catalog_entry.get('additional_fields', {})
+        details['extraction_metadata'] = {
+            **analysis.get('extraction_metadata', {}),
+            'found_technical_specs': bool(details['additional_fields']),
+            'from_catalog': True
+        }
+        return details
     
-    def _fuzzy_find_delimiter(self, content: str, delimiter: str) -> int:
-        """Find delimiter with fuzzy matching"""
-        # Try with normalized whitespace
-        normalized_delimiter = ' '.join(delimiter.split())
-        lines = content.split('\n')
-        
-        for i, line in enumerate(lines):
-            normalized_line = ' '.join(line.split())
-            if normalized_delimiter in normalized_line:
-                return sum(len(lines[j]) + 1 for j in range(i))
-        
-        return -1
+    def _with_defaults(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Full details from a minimal analysis, omitted fields taking their defaults"""
+        details = self._create_empty_details()
+        details['item_details'].update({field: value for field, value in analysis.get('item_details', {}).items()
+                                        if value is not None})
+        details['additional_fields'] = analysis.get('additional_fields') or {}
+        details['extraction_metadata'].update(analysis.get('extraction_metadata', {}))
+        return details
     
     def _build_item_context(self, item: Dict[str, Any], 
                           main_group: Dict[str, Any], 
@@ -291,7 +680,30 @@ class SectionDetailAnalyzer:
             }
         }
     
-    def _deep_copy_structure(self, structure: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a deep copy of the structure for processing"""
-        import json
-        return json.loads(json.dumps(structure))
\ No newline at end of file
+    def _apply_details_overlay(self, structure: Dict[str, Any],
+                               item_details_overlay: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+        """Copy-on-write: clone the items that got details and the containers above them
+        
+        Everything else, including the items' own values, is shared with the
+        input structure, which is left unchanged.
+        """
+        def with_children(node, key, transform):
+            children = node.get(key)
+            if not children:
+                return node
+            new_children = [transform(child) for child in children]
+            if all(new is old for new, old in zip(new_children, children)):
+                return node
+            return {**node, key: new_children}
+        
+        def item_node(item):
+            details = item_details_overlay.get(id(item))
+            return item if details is None else {**item, 'details': details}
+        
+        def sub_group_node(sub_group):
+            return with_children(sub_group, 'offer_items', item_node)
+        
+        def main_group_node(main_group):
+            return with_children(main_group, 'offer_groups', sub_group_node)
+        
+        return with_children(structure, 'offer_item_groups', main_group_node)
\ No newline at end of file
@@ -1,12 +1,20 @@
 # src/processors/structure_delimiter_extractor.py
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Iterable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import uuid
 
 from ..utils.enhanced_llm_client import EnhancedLLMClient
 
-from ..prompts.structure_prompt import get_structure_prompt
+from ..prompts.structure_prompt import get_structure_prompt, get_region_items_prompt
 import re
 from ..utils.json_cleaner import JSONResponseCleaner
+from ..utils.item_dedup_index import ItemDedupIndex
+from ..utils.group_name_index import GroupNameIndex
+from .markdown_chunker import count_tokens
+from .chunk_relevance import ChunkRelevanceFilter
+from .cfc_hierarchy import DIRECT_ITEMS_SUB_GROUP
+from .prompt_compactor import PromptCompactor, Compaction, CompactionTotals
 
 class StructureDelimiterExtractor:
     def __init__(self, config: Dict[str, Any]):
@@ -17,50 +25,132 @@ class StructureDelimiterExtractor:
         self.extraction_prompt = get_structure_prompt()
         # Use task-specific LLM
         self.task_name = "structure_extraction"
+        # Upper bound for the rendered previous_context section of the prompt
+        self.previous_context_tokens = config.get('previous_context_tokens', 300)
+        # Items extracted twice from chunk overlaps are dropped on merge
+        self.dedup_offset_tolerance = config.get('dedup_offset_tolerance', 80)
+        self.dedup_name_similarity = config.get('dedup_name_similarity', 0.85)
         
+        # Chunks of the "headings" chunking mode carry their group, so only
+        # their items are requested, several regions at a time
+        self.region_prompt = get_region_items_prompt()
+        self.region_mode = config.get('chunking_mode') == 'headings'
+        self.region_workers = config.get('region_workers', 4)
+        
+        # Chunk content is compacted for the prompt; delimiters are mapped back
+        self.compactor = PromptCompactor(config)
+        
+        # Chunks unlikely to hold offer items (legal text, tables of contents) skip the LLM
+        self.relevance_filter = None
+        if config.get('relevance_filter', False):
+            self.relevance_filter = ChunkRelevanceFilter(config.get('relevance_threshold', 0.3),
+                                                         config.get('relevance_weights_path'))
+        
+    def prompt_overhead_tokens(self) -> int:
+        """Tokens the extraction prompt uses besides the chunk content"""
+        rendered = self.extraction_prompt.format(
+            chunk_content="",
+            chunk_info="",
+            previous_context=""
+        )
+        return count_tokens(rendered) + self.previous_context_tokens
     
-    def extract_structure_from_chunks(self, chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Extract structure with delimiters from all chunks"""
+    def extract_structure_from_chunks(self, chunks: Iterable[Dict[str, Any]],
+                                      cached_chunk_items: Optional[Dict[int, Dict[str, Any]]] = None,
+                                      on_chunk_extracted: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Extract structure with delimiters from all chunks
+        
+        Chunks whose index is in cached_chunk_items reuse that extraction instead of calling the LLM.
+        chunks may be a generator, so chunking and extraction overlap on large documents;
+        on_chunk_extracted(chunk, chunk_items) runs before the next chunk is requested.
+        """
+        cached_chunk_items = cached_chunk_items or {}
         
         print("Phase 2: Extracting structure with delimiters from chunks...")
 
-        # Reset state for new document
-        # Track context across chunks
-        self.extraction_context = {
+        # Per-document state lives in a context of this call, so one extractor
+        # can serve concurrent documents
+        context = {
             'current_main_group': None,
             'current_sub_group': None,
             'all_groups': [],
-            'item_counter': 0
+            'item_counter': 0,
+            # Similar-name lookup of main groups, and of sub-groups per main group
+            'main_group_index': GroupNameIndex(),
+            'sub_group_indexes': {},
+            # Items already merged, to drop duplicates from chunk overlaps
+            'dedup_index': ItemDedupIndex(self.dedup_offset_tolerance, self.dedup_name_similarity),
+            # Relevance scores by chunk index, and the chunks that skipped extraction
+            'relevance_scores': {},
+            'skipped_chunks': [],
+            'compaction_totals': CompactionTotals()
         }
+        region_items = {}
+        if self.region_mode:
+            chunks = list(chunks)
+            region_items = self._extract_regions(context, [
+                chunk for chunk in chunks
+                if chunk.get('heading_path') and chunk['chunk_index'] not in cached_chunk_items
+                and self._is_relevant(context, chunk)
+            ])
+        
         chunk_items_list = []
         for chunk in chunks:
-            chunk_items = self._extract_from_chunk_with_context(chunk)
+            if chunk['chunk_index'] in cached_chunk_items:
+                chunk_items = cached_chunk_items[chunk['chunk_index']]
+                self._add_chunk_info_to_items(chunk_items, chunk)
+                print(f"    Reusing previous extraction for chunk {chunk['chunk_index']}")
+            elif chunk['chunk_index'] in region_items:
+                chunk_items = region_items[chunk['chunk_index']]
+            elif not self._is_relevant(context, chunk):
+                chunk_items = {"offer_item_groups": []}
+            else:
+                chunk_items = self._extract_from_chunk_with_context(context, chunk)
             chunk_items_list.append(chunk_items)
-            self._merge_chunk_items(chunk_items)
+            context['dedup_index'].add_chunk(chunk['chunk_index'], chunk['end_char'])
+            self._merge_chunk_items(context, chunk_items)
+            if on_chunk_extracted:
+                on_chunk_extracted(chunk, chunk_items)
 
         # Build final structure
-        final_structure = self._build_final_offer_structure()
+        final_structure = self._build_final_offer_structure(context)
+        final_structure['dropped_duplicates'] = context['dedup_index'].dropped
+        final_structure['skipped_chunks'] = context['skipped_chunks']
+        
+        compaction_report = context['compaction_totals'].report('phase_2')
+        if compaction_report:
+            print(f"  {compaction_report}")
+        if self.relevance_filter:
+            scored = len(context['relevance_scores'])
+            skipped = len(context['skipped_chunks'])
+            print(f"  Relevance filter skipped {skipped}/{scored} chunks "
+                  f"({skipped / max(1, scored):.0%}, threshold {self.relevance_filter.threshold})")
         
+        if context['dedup_index'].dropped:
+            print(f"  Dropped {len(context['dedup_index'].dropped)} duplicate items from chunk overlaps")
         print(f"  Final structure: {final_structure.get('total_sections', 0)} sections")
         
         return final_structure, chunk_items_list
     
-    def _extract_from_chunk_with_context(self, chunk: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_from_chunk_with_context(self, context: Dict[str, Any], chunk: Dict[str, Any]) -> Dict[str, Any]:
         """Extract offer items from chunk with previous context"""
         try:
-            chunk_info = f"Chunk {chunk['chunk_index'] + 1}/{chunk['total_chunks']} | Chars: {chunk['start_char']}-{chunk['end_char']}"
+            # Streamed chunks do not know the total yet
+            total_chunks = chunk.get('total_chunks', '?')
+            chunk_info = f"Chunk {chunk['chunk_index'] + 1}/{total_chunks} | Chars: {chunk['start_char']}-{chunk['end_char']}"
+            if chunk.get('heading_path'):
+                # Structure-aware chunks know the section they start in
+                chunk_info += f" | Section: {' > '.join(chunk['heading_path'])}"
             
-            # Clean content
-            # cleaned_content = self._clean_chunk_content(chunk['content'])
-            cleaned_content = chunk['content']
+            compaction = self.compactor.compact(chunk['content'], 'phase_2', context['compaction_totals'])
             
             # Build context from previous chunks
-            previous_context = self._build_previous_context()
+            previous_context = self._build_previous_context(context)
             
             response = self.llm_client.invoke(
                 self.task_name,
                 self.extraction_prompt.format(
-                    chunk_content=cleaned_content,
+                    chunk_content=compaction.text,
                     chunk_info=chunk_info,
                     previous_context=previous_context
                 )
@@ -80,7 +170,7 @@ class StructureDelimiterExtractor:
                 return {"offer_item_groups": []}
             
             # Add chunk information to all items
-            self._add_chunk_info_to_items(result, chunk)
+            self._add_chunk_info_to_items(result, chunk, compaction)
             
             print(f"    Successfully extracted items from chunk {chunk['chunk_index']}")
             return result
@@ -89,23 +179,96 @@ class StructureDelimiterExtractor:
             print(f"    Error extracting from chunk {chunk['chunk_id']}: {e}")
             return {"offer_item_groups": []}
     
-    def _build_previous_context(self) -> str:
+    def _is_relevant(self, context: Dict[str, Any], chunk: Dict[str, Any]) -> bool:
+        """Whether a chunk is worth a Phase 2 call, scored once per chunk"""
+        if self.relevance_filter is None:
+            return True
+        
+        chunk_index = chunk['chunk_index']
+        if chunk_index not in context['relevance_scores']:
+            score = self.relevance_filter.score(chunk['content'])
+            context['relevance_scores'][chunk_index] = score
+            if score < self.relevance_filter.threshold:
+                context['skipped_chunks'].append({
+                    'chunk_index': chunk_index,
+                    'start_char': chunk['start_char'],
+                    'end_char': chunk['end_char'],
+                    'score': round(score, 3)
+                })
+                print(f"    Skipping chunk {chunk_index}: relevance {score:.2f}")
+        return context['relevance_scores'][chunk_index] >= self.relevance_filter.threshold
+    
+    def _extract_regions(self, context: Dict[str, Any], chunks: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+        """Extract the items of group region chunks in parallel, keyed by chunk index"""
+        if not chunks:
+            return {}
+        
+        print(f"  Extracting items of {len(chunks)} group regions with {self.region_workers} workers")
+        with ThreadPoolExecutor(max_workers=self.region_workers) as executor:
+            results = list(executor.map(partial(self._extract_region_items, context), chunks))
+        return {chunk['chunk_index']: chunk_items for chunk, chunk_items in zip(chunks, results)}
+    
+    def _extract_region_items(self, context: Dict[str, Any], chunk: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract the items of a chunk whose main group and sub-group are known"""
+        heading_path = chunk['heading_path']
+        main_group = heading_path[0]
+        # Items directly under a main heading go to its neutral sub-group
+        has_sub_group = len(heading_path) > 1
+        sub_group = heading_path[1] if has_sub_group else DIRECT_ITEMS_SUB_GROUP
+        try:
+            chunk_info = f"Chunk {chunk['chunk_index'] + 1} | Chars: {chunk['start_char']}-{chunk['end_char']}"
+            compaction = self.compactor.compact(chunk['content'], 'phase_2', context['compaction_totals'])
+            response = self.llm_client.invoke(
+                self.task_name,
+                self.region_prompt.format(
+                    chunk_info=chunk_info,
+                    main_group=main_group,
+                    sub_group=sub_group if has_sub_group else "none, items directly under the main category",
+                    chunk_content=compaction.text
+                )
+            )
+            
+            result = self.json_cleaner.extract_json(response)
+            if not result:
+                print(f"    Warning: Could not extract valid JSON from chunk {chunk['chunk_index']}")
+                return {"offer_item_groups": []}
+            
+            # Same shape as a contextual extraction, so merging and caching are shared
+            chunk_items = {"offer_item_groups": [{
+                "name": main_group,
+                "group_type": "BASE",
+                "offer_groups": [{
+                    "name": sub_group,
+                    "group_type": "SUB",
+                    "offer_items": result.get('offer_items', [])
+                }]
+            }]}
+            self._add_chunk_info_to_items(chunk_items, chunk, compaction)
+            
+            print(f"    Extracted {len(result.get('offer_items', []))} items from region chunk {chunk['chunk_index']} ({sub_group})")
+            return chunk_items
+            
+        except Exception as e:
+            print(f"    Error extracting from chunk {chunk['chunk_id']}: {e}")
+            return {"offer_item_groups": []}
+    
+    def _build_previous_context(self, context: Dict[str, Any]) -> str:
         """Build context string from previous extractions"""
-        if not self.extraction_context['all_groups']:
+        if not context['all_groups']:
             return "No previous context (first chunk)"
         
         context_lines = ["Current document structure:"]
         
         # Show current hierarchy
-        if self.extraction_context['current_main_group']:
-            context_lines.append(f"Current main group: {self.extraction_context['current_main_group']['name']}")
+        if context['current_main_group']:
+            context_lines.append(f"Current main group: {context['current_main_group']['name']}")
         
-        if self.extraction_context['current_sub_group']:
-            context_lines.append(f"Current sub group: {self.extraction_context['current_sub_group']['name']}")
+        if context['current_sub_group']:
+            context_lines.append(f"Current sub group: {context['current_sub_group']['name']}")
         
         # Show recent groups
         context_lines.append("\nRecent groups extracted:")
-        recent_groups = self.extraction_context['all_groups'][-3:]  # Last 3 groups
+        recent_groups = context['all_groups'][-3:]  # Last 3 groups
         
         for group in recent_groups:
             context_lines.append(f"- {group['name']} ({group['group_type']})")
@@ -113,12 +276,77 @@ class StructureDelimiterExtractor:
                 item_count = len(sub_group.get('offer_items', []))
                 context_lines.append(f"  - {sub_group['name']} ({item_count} items)")
         
-        context_lines.append(f"\nTotal items extracted so far: {self.extraction_context['item_counter']}")
+        context_lines.append(f"\nTotal items extracted so far: {context['item_counter']}")
         
         return "\n".join(context_lines)
     
-    def _add_chunk_info_to_items(self, result: Dict[str, Any], chunk: Dict[str, Any]):
-        """Add chunk information to all extracted items"""
+    def last_complete_item_end(self, chunk: Dict[str, Any], chunk_items: Dict[str, Any]) -> Optional[int]:
+        """Document offset where the chunk's last complete item ends
+        
+        An item is complete when its end delimiter is found in the chunk before
+        the chunk's final line, which may have been cut by the chunk boundary.
+        """
+        content = chunk['content']
+        last_line_start = content.rstrip('\n').rfind('\n') + 1 if chunk.get('overlap_with_next') else len(content)
+        
+        last_end = None
+        for group in chunk_items.get('offer_item_groups', []):
+            for sub_group in group.get('offer_groups', []):
+                for item in sub_group.get('offer_items', []):
+                    end_delimiter = (item.get('end_delimiter') or '').strip()
+                    if not end_delimiter:
+                        continue
+                    start_pos = content.find((item.get('start_delimiter') or '').strip())
+                    end_pos = content.find(end_delimiter, max(start_pos, 0))
+                    if end_pos == -1:
+                        continue
+                    item_end = end_pos + len(end_delimiter)
+                    if item_end <= last_line_start and (last_end is None or item_end > last_end):
+                        last_end = item_end
+        
+        return chunk.document_offset(last_end) if last_end is not None else None
+    
+    def _add_chunk_info_to_items(self, result: Dict[str, Any], chunk: Dict[str, Any],
+                                 compaction: Optional[Compaction] = None):
+        """Add chunk information and the document offset of the start delimiter to all extracted items
+        
+        With a compaction, delimiters were copied from the compacted content;
+        they are located there and replaced by the original text they map to.
+        """
+        content = chunk['content']
+        if compaction is not None and compaction.text == content:
+            compaction = None
+        searched = compaction.text if compaction is not None else content
+        # Identical rows share their delimiters, so each item is searched after
+        # the previous one; items listed out of order fall back to earlier matches
+        cursors = [0, 0]
+        
+        def locate_start(item) -> int:
+            """Position of the item in content, mapping delimiters back from a compaction"""
+            start_delimiter = (item.get('start_delimiter') or '').strip()
+            if not start_delimiter:
+                return -1
+            for search_start in cursors + [0]:
+                position = searched.find(start_delimiter, search_start)
+                if position != -1:
+                    break
+            else:
+                return -1
+            
+            end_delimiter = (item.get('end_delimiter') or '').strip()
+            end_position = searched.find(end_delimiter, position) if end_delimiter else -1
+            item_end = end_position + len(end_delimiter) if end_position != -1 else position + len(start_delimiter)
+            cursors[:] = [item_end, position + 1]
+            
+            if compaction is None:
+                return position
+            item['start_delimiter'] = content[compaction.to_original(position):
+                                              compaction.to_original_end(position + len(start_delimiter))]
+            if end_position != -1:
+                item['end_delimiter'] = content[compaction.to_original(end_position):
+                                                compaction.to_original_end(item_end)]
+            return compaction.to_original(position)
+        
         def add_chunk_recursive(groups):
             for group in groups:
                 # Add to sub-groups
@@ -127,6 +355,8 @@ class StructureDelimiterExtractor:
                     for item in sub_group.get('offer_items', []):
                         item['chunk_id'] = chunk['chunk_id']
                         item['chunk_index'] = chunk['chunk_index']
+                        position = locate_start(item)
+                        item['start_offset'] = chunk.document_offset(position) if position != -1 else None
                         if 'offer_item_id' not in item:
                             item['offer_item_id'] = str(uuid.uuid4())
                     
@@ -136,36 +366,41 @@ class StructureDelimiterExtractor:
         
         add_chunk_recursive(result.get('offer_item_groups', []))
     
-    def _merge_chunk_items(self, chunk_items: Dict[str, Any]):
+    def _merge_chunk_items(self, context: Dict[str, Any], chunk_items: Dict[str, Any]):
         """Merge items from current chunk with accumulated structure"""
         new_groups = chunk_items.get('offer_item_groups', [])
         
         for new_group in new_groups:
             # Find or create main group
-            existing_main = self._find_or_create_main_group(new_group)
+            existing_main = self._find_or_create_main_group(context, new_group)
             
             # Merge sub-groups and items
             for new_sub_group in new_group.get('offer_groups', []):
-                existing_sub = self._find_or_create_sub_group(existing_main, new_sub_group)
+                existing_sub = self._find_or_create_sub_group(context, existing_main, new_sub_group)
                 
-                # Add items to sub-group
-                new_items = new_sub_group.get('offer_items', [])
-                existing_sub['offer_items'].extend(new_items)
-                self.extraction_context['item_counter'] += len(new_items)
+                # Add items to sub-group, skipping items already extracted from the overlap
+                for new_item in new_sub_group.get('offer_items', []):
+                    duplicate_of = context['dedup_index'].find_duplicate(new_item, existing_sub)
+                    if duplicate_of is not None:
+                        context['dedup_index'].record_dropped(new_item, duplicate_of)
+                        continue
+                    context['dedup_index'].add(new_item, existing_sub)
+                    existing_sub['offer_items'].append(new_item)
+                    context['item_counter'] += 1
                 
                 # Update current context
-                self.extraction_context['current_sub_group'] = existing_sub
+                context['current_sub_group'] = existing_sub
             
-            self.extraction_context['current_main_group'] = existing_main
+            context['current_main_group'] = existing_main
     
-    def _find_or_create_main_group(self, new_group: Dict[str, Any]) -> Dict[str, Any]:
+    def _find_or_create_main_group(self, context: Dict[str, Any], new_group: Dict[str, Any]) -> Dict[str, Any]:
         """Find existing main group or create new one"""
         group_name = new_group['name'].strip()
         
         # Look for existing group with similar name
-        for existing_group in self.extraction_context['all_groups']:
-            if self._is_similar_group_name(existing_group['name'], group_name):
-                return existing_group
+        existing_group = context['main_group_index'].find(group_name)
+        if existing_group is not None:
+            return existing_group
         
         # Create new main group
         main_group = {
@@ -175,17 +410,19 @@ class StructureDelimiterExtractor:
             'offer_groups': []
         }
         
-        self.extraction_context['all_groups'].append(main_group)
+        context['all_groups'].append(main_group)
+        context['main_group_index'].add(group_name, main_group)
         return main_group
     
-    def _find_or_create_sub_group(self, main_group: Dict[str, Any], new_sub_group: Dict[str, Any]) -> Dict[str, Any]:
+    def _find_or_create_sub_group(self, context: Dict[str, Any], main_group: Dict[str, Any], new_sub_group: Dict[str, Any]) -> Dict[str, Any]:
         """Find existing sub-group or create new one"""
         sub_group_name = new_sub_group['name'].strip()
         
         # Look for existing sub-group
-        for existing_sub in main_group['offer_groups']:
-            if self._is_similar_group_name(existing_sub['name'], sub_group_name):
-                return existing_sub
+        sub_group_index = context['sub_group_indexes'].setdefault(id(main_group), GroupNameIndex())
+        existing_sub = sub_group_index.find(sub_group_name)
+        if existing_sub is not None:
+            return existing_sub
         
         # Create new sub-group
         sub_group = {
@@ -196,28 +433,13 @@ class StructureDelimiterExtractor:
         }
         
         main_group['offer_groups'].append(sub_group)
+        sub_group_index.add(sub_group_name, sub_group)
         return sub_group
     
-    def _is_similar_group_name(self, name1: str, name2: str) -> bool:
-        """Check if two group names are similar"""
-        # Normalize names for comparison
-        norm1 = re.sub(r'[^\w\s]', '', name1.lower()).strip()
-        norm2 = re.sub(r'[^\w\s]', '', name2.lower()).strip()
-        
-        # Check for exact match or significant overlap
-        if norm1 == norm2:
-            return True
-        
-        # Check if one contains the other (for partial matches)
-        if len(norm1) > 10 and len(norm2) > 10:
-            return norm1 in norm2 or norm2 in norm1
-        
-        return False
-    
-    def _build_final_offer_structure(self) -> Dict[str, Any]:
+    def _build_final_offer_structure(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Build final offer structure with incremental hierarchical IDs"""
         # Assign incremental IDs to main groups
-        for main_index, main_group in enumerate(self.extraction_context['all_groups'], 1):
+        for main_index, main_group in enumerate(context['all_groups'], 1):
             main_group['offer_item_group_id'] = str(main_index)
             
             # Assign incremental IDs to sub-groups
@@ -236,21 +458,21 @@ class StructureDelimiterExtractor:
                 sub_group['parent_main_group_id'] = main_group['offer_item_group_id']
         
         return {
-            'offer_item_groups': self.extraction_context['all_groups'],
-            'total_main_groups': len(self.extraction_context['all_groups']),
-            'total_items': self.extraction_context['item_counter'],
+            'offer_item_groups': context['all_groups'],
+            'total_main_groups': len(context['all_groups']),
+            'total_items': context['item_counter'],
             'id_structure': {
-                'main_groups': f"1 to {len(self.extraction_context['all_groups'])}",
+                'main_groups': f"1 to {len(context['all_groups'])}",
                 'sub_groups': "X.Y format where X is main group ID",
                 'items': "X.Y.Z format where X.Y is sub-group ID"
             }
         }
 
-    def _assign_hierarchical_ids(self):
+    def _assign_hierarchical_ids(self, context: Dict[str, Any]):
         """Alternative method to assign IDs after all extraction is complete"""
         main_counter = 1
         
-        for main_group in self.extraction_context['all_groups']:
+        for main_group in context['all_groups']:
             # Assign main group ID
             main_group['offer_item_group_id'] = str(main_counter)
             
@@ -273,10 +495,10 @@ class StructureDelimiterExtractor:
             
             main_counter += 1
 
-    def _validate_id_structure(self) -> bool:
+    def _validate_id_structure(self, context: Dict[str, Any]) -> bool:
         """Validate that all IDs follow the correct hierarchical pattern"""
         try:
-            for main_group in self.extraction_context['all_groups']:
+            for main_group in context['all_groups']:
                 main_id = main_group['offer_item_group_id']
                 
                 # Validate main ID is a number
@@ -313,30 +535,3 @@ class StructureDelimiterExtractor:
             for sub_group in main_group.get('offer_groups', []):
                 total += len(sub_group.get('offer_items', []))
         return total
-    
-    def _clean_chunk_content(self, content: str) -> str:
-        """Clean chunk content"""
-        lines = content.split('\n')
-        cleaned_lines = []
-        
-        for line in lines:
-            line = line.strip()
-            
-            # Skip image references
-            if line.startswith('![](') and line.endswith('.jpeg)'):
-                continue
-                
-            # Skip total/summary lines
-            if any(keyword in line.lower() for keyword in ['total', 'fr.', '................', 'a reporter']):
-                continue
-                
-            # Skip empty lines with only dots or dashes
-            if re.match(r'^[\.\-\s]*$', line):
-                continue
-                
-            cleaned_lines.append(line)
-        
-        return '\n'.join(cleaned_lines)
-
-
-
@@ -0,0 +1,174 @@
+# src/processors/table_item_parser.py
+import html
+import re
+import unicodedata
+from typing import Dict, Any, List, Optional
+
+# Header cell texts (lowercased, accents removed) by column role
+COLUMN_ROLES = {
+    'quantity': ('qte', 'qt', 'quantite', 'quant', 'qty', 'nombre', 'nb'),
+    'unit': ('unite', 'unit', 'u', 'un'),
+    'unit_price': ('pu', 'p u', 'prix unitaire', 'prix unit', 'prix u', 'unit price'),
+    'amount': ('montant', 'total', 'prix total', 'montant total', 'amount'),
+    'description': ('designation', 'description', 'libelle', 'texte', 'article', 'prestation'),
+}
+
+UNIT_ALIASES = {
+    'm2': 'm²', 'm3': 'm³', 'ml': 'm',
+    'pce': 'pcs', 'pces': 'pcs', 'pc': 'pcs', 'p': 'pcs', 'piece': 'pcs', 'pieces': 'pcs',
+    'st': 'pcs', 'stk': 'pcs', 'u': 'pcs',
+    'hr': 'h', 'heure': 'h', 'heures': 'h',
+}
+
+LABOR_UNITS = {'h'}
+
+CURRENCY_PATTERN = re.compile(r'(chf|eur|fr\.?|sfr\.?|€)', re.IGNORECASE)
+SEPARATOR_ROW_PATTERN = re.compile(r'^\|?\s*:?-{2,}:?\s*(\|\s*:?-{2,}:?\s*)*\|?\s*$')
+
+def _fold(text: str) -> str:
+    """Lowercase without accents or punctuation, for header matching"""
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(re.sub(r'[^\w\s]', ' ', text).split())
+
+def parse_number(text: str) -> Optional[float]:
+    """Parse Swiss/French formatted numbers: 1'234.50, 1 234,50, 1.234,50, Fr. 12.50"""
+    text = CURRENCY_PATTERN.sub('', text or '')
+    text = re.sub(r"[\s'’ʼ  ]", '', text).rstrip('.-–')
+    if not text:
+        return None
+
+    if ',' in text and '.' in text:
+        # The last separator is the decimal one
+        if text.rfind(',') > text.rfind('.'):
+            text = text.replace('.', '').replace(',', '.')
+        else:
+            text = text.replace(',', '')
+    elif ',' in text:
+        if text.count(',') > 1:
+            text = text.replace(',', '')
+        else:
+            text = text.replace(',', '.')
+    elif text.count('.') > 1:
+        text = text.replace('.', '')
+
+    if not re.fullmatch(r'-?\d+(\.\d+)?', text):
+        return None
+    return float(text)
+
+def split_row(line: str) -> List[str]:
+    """Cells of a markdown table row"""
+    line = line.strip()
+    if line.startswith('|'):
+        line = line[1:]
+    if line.endswith('|'):
+        line = line[:-1]
+    return [cell.strip() for cell in line.split('|')]
+
+class TableItemParser:
+    """Reads quantity, unit and prices of an item straight from its markdown table row
+
+    Column roles come from the table header. An item is only resolved when its
+    lines are table rows with exactly one row carrying a quantity, a unit, and
+    prices consistent with the amount column when one is filled in; anything
+    else (prose specifications, several value rows, unparsable cells) is left
+    to the LLM.
+    """
+
+    def __init__(self, amount_tolerance: float = 0.01):
+        # Relative tolerance of quantity × unit price against the amount
+        self.amount_tolerance = amount_tolerance
+
+    def detect_columns(self, header_cells: List[str]) -> Dict[str, int]:
+        """Column index by role, from header cell texts"""
+        columns = {}
+        for index, cell in enumerate(header_cells):
+            folded = _fold(cell)
+            for role, names in COLUMN_ROLES.items():
+                if role in columns:
+                    continue
+                # "PU CHF", "Qté (m)" and similar carry extra words after the name
+                if folded in names or any(folded.startswith(name + ' ') for name in names if len(name) > 1):
+                    columns[role] = index
+                    break
+        return columns
+
+    def parse(self, table_text: str) -> Optional[Dict[str, Any]]:
+        """Item detail fields from a table header followed by the item's rows, None if unresolved"""
+        lines = [line for line in table_text.split('\n') if line.strip()]
+        header_index = next((i for i in range(len(lines) - 1)
+                             if lines[i].lstrip().startswith('|') and SEPARATOR_ROW_PATTERN.match(lines[i + 1].strip())),
+                            None)
+        if header_index is None:
+            return None
+
+        columns = self.detect_columns(split_row(lines[header_index]))
+        if 'quantity' not in columns or 'unit' not in columns:
+            return None
+
+        rows = lines[header_index + 2:]
+        if not rows or any(not row.lstrip().startswith('|') for row in rows):
+            # Prose around the row holds specifications only the LLM extracts
+            return None
+
+        value_rows = []
+        descriptions = []
+        for row in rows:
+            cells = split_row(row)
+            cell = lambda role: cells[columns[role]] if role in columns and columns[role] < len(cells) else ''
+            if cell('description'):
+                descriptions.append(cell('description'))
+            if cell('quantity'):
+                value_rows.append({role: cell(role) for role in ('quantity', 'unit', 'unit_price', 'amount')})
+
+        if len(value_rows) != 1:
+            return None
+        values = value_rows[0]
+
+        quantity = parse_number(values['quantity'])
+        unit = self._normalize_unit(values['unit'])
+        if quantity is None or not unit:
+            return None
+
+        unit_price = None
+        if values['unit_price']:
+            unit_price = parse_number(values['unit_price'])
+            if unit_price is None:
+                return None
+
+        confidence = 'medium'
+        if values['amount']:
+            amount = parse_number(values['amount'])
+            if amount is None:
+                return None
+            if unit_price is None:
+                unit_price = round(amount / quantity, 2) if quantity else None
+            elif abs(quantity * unit_price - amount) > max(0.05, abs(amount) * self.amount_tolerance):
+                return None
+            confidence = 'high'
+
+        item_details = {
+            "unit_quantity": quantity,
+            "unit": unit,
+            "unit_price": unit_price,
+            "unit_type": "LABOR" if unit in LABOR_UNITS else "MATERIAL"
+        }
+        if descriptions:
+            item_details["desc_html"] = f"<p>{html.escape(' '.join(descriptions))}</p>"
+        return {
+            "item_details": item_details,
+            "extraction_metadata": {
+                "found_quantity": True,
+                "found_price": unit_price is not None,
+                "found_technical_specs": False,
+                "confidence_level": confidence,
+                "parsed_from_table": True
+            }
+        }
+
+    @staticmethod
+    def _normalize_unit(text: str) -> str:
+        unit = ' '.join(text.split()).rstrip('.')
+        if not unit or parse_number(unit) is not None:
+            return ''
+        return UNIT_ALIASES.get(_fold(unit), unit)
@@ -1,7 +1,12 @@
 # src/processors/translator.py
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from ..utils.enhanced_llm_client import EnhancedLLMClient
 from ..prompts.fr_to_en_translation_prompt import fr_to_en_prompt, en_to_fr_prompt
+from ..translation.backend_factory import TranslationBackendFactory
+from ..translation.base_backend import TranslationResult
+from ..translation.llm_backend import LLMTranslationBackend
+from ..translation.glossary import TranslationGlossary
+from ..translation.markdown_segmenter import MarkdownSegmenter
 import re
 
 class DocumentTranslator:
@@ -13,30 +18,57 @@ class DocumentTranslator:
         self.fr_to_en_prompt = fr_to_en_prompt
         self.en_to_fr_prompt = en_to_fr_prompt
         
+        self.translation_config = config.get('translation', {})
+        self.source_language = config.get('source_language', 'french')
+        self.target_language = config.get('target_language', 'english')
+        self.confidence_threshold = self.translation_config.get('confidence_threshold', 0.5)
+        
+        # Glossary seeded from the reference terms, extended from config
+        french_terms = self._extract_french_technical_terms()
+        self.glossary = TranslationGlossary.from_reference_text(french_terms)
+        for french, english in self.translation_config.get('glossary', {}).items():
+            self.glossary.add_term(french, english)
+        
+        # LLM backend is always available as fallback for low-confidence segments
+        self.llm_backend = LLMTranslationBackend(config, llm_client=self.llm_client,
+                                                 reference_terms=french_terms)
+        backend_name = self.translation_config.get('backend', 'llm')
+        if backend_name == 'llm':
+            self.backend = self.llm_backend
+        else:
+            self.backend = TranslationBackendFactory.create_backend(backend_name, config)
+        self.segmenter = MarkdownSegmenter()
+        
     def translate_markdown_to_english(self, french_markdown: str) -> Optional[str]:
         """Translate French markdown to English while preserving structure"""
         if not self.config.get('enable_translation', False):
             return None
         
         try:
-            print("Translating markdown from French to English...")
-            
-            # Split into chunks if too large
-            chunks = self._split_for_translation(french_markdown)
-            translated_chunks = []
+            print(f"Translating markdown from French to English ({self.backend.name} backend)...")
             
-            for i, chunk in enumerate(chunks, 1):
-                print(f"  Translating chunk {i}/{len(chunks)}")
-                
-                translated_chunk = self.llm_client.invoke(
-                    self.task_name,
-                    self.fr_to_en_prompt.format(french_content=chunk)
+            if self.backend.requires_segmentation:
+                # Segment-level backends translate the whole document in batches
+                segments, template = self.segmenter.segment(french_markdown)
+                print(f"  Translating {len(segments)} segments")
+                translated_segments = self._translate_texts(segments, self.source_language, self.target_language)
+                translated_markdown = self.segmenter.rebuild(
+                    template,
+                    [source if translated is None else translated
+                     for source, translated in zip(segments, translated_segments)]
                 )
+            else:
+                # Split into chunks if too large
+                chunks = self._split_for_translation(french_markdown)
+                translated_chunks = []
                 
-                translated_chunks.append(translated_chunk)
-            
-            # Combine translated chunks
-            translated_markdown = '\n\n'.join(translated_chunks)
+                for i, chunk in enumerate(chunks, 1):
+                    print(f"  Translating chunk {i}/{len(chunks)}")
+                    translated = self._translate_texts([chunk], self.source_language, self.target_language)[0]
+                    translated_chunks.append(chunk if translated is None else translated)
+                
+                # Combine translated chunks
+                translated_markdown = '\n\n'.join(translated_chunks)
             
             print(f"  Translation complete: {len(french_markdown)} -> {len(translated_markdown)} characters")
             return translated_markdown
@@ -53,21 +85,19 @@ class DocumentTranslator:
         try:
             print("Translating final offer back to French...")
             
-            # Extract French terms from original content for reference
-            french_terms = self._extract_french_technical_terms()
-            
             # Create a copy of the offer for translation
             offer_dict = processed_offer.model_dump()
             
-            # Translate offer-level fields
-            offer_dict = self._translate_offer_fields(offer_dict, french_terms)
+            # Collect every translatable field so the backend sees one batch
+            field_refs = self._collect_offer_fields(offer_dict)
+            texts = [text for _, _, text, _ in field_refs]
+            translations = self._translate_texts(texts, self.target_language, self.source_language)
             
-            # Translate item groups recursively
-            if 'offer_item_groups' in offer_dict:
-                offer_dict['offer_item_groups'] = self._translate_item_groups(
-                    offer_dict['offer_item_groups'], 
-                    french_terms
-                )
+            for (container, field, _, is_html), translated in zip(field_refs, translations):
+                if translated is None:
+                    # Keep the original field, as it was before translation
+                    continue
+                container[field] = f"<p>{translated.strip()}</p>" if is_html else translated.strip()
             
             # Create new ProcessedOffer instance
             from ..models.invoice_models import ProcessedOffer
@@ -80,6 +110,64 @@ class DocumentTranslator:
             print(f"Error translating offer to French: {e}")
             return None
     
+    def _translate_texts(self, texts: List[str], source_language: str, target_language: str) -> List[Optional[str]]:
+        """Translate texts with the configured backend, falling back to the LLM when needed
+
+        Texts whose translation failed are None, so callers keep the source text.
+        """
+        if not texts:
+            return []
+        
+        results = self._translate_with(self.backend, texts, source_language, target_language)
+        
+        translations: List[Optional[str]] = []
+        fallback_indices = []
+        for index, (source, result) in enumerate(zip(texts, results)):
+            if result is None:
+                translations.append(None)
+                continue
+            translated, missing_terms = self.glossary.enforce(source, result.text, source_language)
+            translations.append(translated)
+            if result.confidence < self.confidence_threshold or missing_terms:
+                fallback_indices.append(index)
+        
+        if fallback_indices and self.backend is not self.llm_backend:
+            print(f"  {len(fallback_indices)}/{len(texts)} segments low confidence, using LLM fallback")
+            fallback_results = self._translate_with(
+                self.llm_backend, [texts[i] for i in fallback_indices], source_language, target_language
+            )
+            for index, result in zip(fallback_indices, fallback_results):
+                # A failed fallback keeps the MT output
+                if result is not None:
+                    translations[index] = result.text
+        
+        failed = sum(translation is None for translation in translations)
+        if failed:
+            print(f"  Warning: {failed}/{len(texts)} texts could not be translated, keeping the original text")
+        return translations
+    
+    def _translate_with(self, backend, texts: List[str], source_language: str,
+                        target_language: str) -> List[Optional[TranslationResult]]:
+        """Results of a backend, None for texts whose call failed
+
+        Batching backends get the whole batch and are retried text by text
+        when it fails; other backends are called once per text.
+        """
+        if backend.batches_requests:
+            try:
+                return list(backend.translate_batch(texts, source_language, target_language))
+            except Exception as e:
+                print(f"Warning: batch translation failed, retrying text by text: {e}")
+        
+        results: List[Optional[TranslationResult]] = []
+        for text in texts:
+            try:
+                results.extend(backend.translate_batch([text], source_language, target_language))
+            except Exception as e:
+                print(f"Warning: could not translate text: {e}")
+                results.append(None)
+        return results
+    
     def _split_for_translation(self, content: str, max_chunk_size: int = 3000) -> List[str]:
         """Split content into translation-friendly chunks"""
         if len(content) <= max_chunk_size:
@@ -124,87 +212,33 @@ class DocumentTranslator:
         - Intérieur = Interior
         """
     
-    def _translate_offer_fields(self, offer_dict: Dict[str, Any], french_terms: str) -> Dict[str, Any]:
-        """Translate main offer fields"""
-        fields_to_translate = ['project_name', 'vendor', 'customer']
-        
-        for field in fields_to_translate:
-            if field in offer_dict and offer_dict[field]:
-                try:
-                    translated = self.llm_client.invoke(
-                        self.task_name,
-                        self.en_to_fr_prompt.format(
-                            english_content=offer_dict[field],
-                            original_french_terms=french_terms
-                        )
-                    )
-                    offer_dict[field] = translated.strip()
-                except Exception as e:
-                    print(f"Warning: Could not translate field {field}: {e}")
-        
-        return offer_dict
+    def _collect_offer_fields(self, offer_dict: Dict[str, Any]) -> List[Tuple[Dict[str, Any], str, str, bool]]:
+        """Collect (container, field, text, is_html) for every translatable field"""
+        field_refs = []
+        
+        for field in ['project_name', 'vendor', 'customer']:
+            if offer_dict.get(field):
+                field_refs.append((offer_dict, field, offer_dict[field], False))
+        
+        self._collect_group_fields(offer_dict.get('offer_item_groups', []), field_refs)
+        return field_refs
     
-    def _translate_item_groups(self, groups: List[Dict[str, Any]], french_terms: str) -> List[Dict[str, Any]]:
-        """Translate item groups recursively"""
+    def _collect_group_fields(self, groups: List[Dict[str, Any]], field_refs: List):
+        """Collect translatable fields of item groups recursively"""
         for group in groups:
-            # Translate group name
-            if 'name' in group and group['name']:
-                try:
-                    translated_name = self.llm_client.invoke(
-                        self.task_name,
-                        self.en_to_fr_prompt.format(
-                            english_content=group['name'],
-                            original_french_terms=french_terms
-                        )
-                    )
-                    group['name'] = translated_name.strip()
-                except Exception as e:
-                    print(f"Warning: Could not translate group name: {e}")
+            if group.get('name'):
+                field_refs.append((group, 'name', group['name'], False))
             
-            # Translate offer items
-            if 'offer_items' in group:
-                group['offer_items'] = self._translate_offer_items(group['offer_items'], french_terms)
-            
-            # Translate sub-groups recursively
-            if 'offer_groups' in group:
-                group['offer_groups'] = self._translate_item_groups(group['offer_groups'], french_terms)
-        
-        return groups
-    
-    def _translate_offer_items(self, items: List[Dict[str, Any]], french_terms: str) -> List[Dict[str, Any]]:
-        """Translate individual offer items"""
-        for item in items:
-            # Fields to translate
-            fields_to_translate = ['name', 'desc_html', 'category']
+            for item in group.get('offer_items', []):
+                for field in ['name', 'desc_html', 'category']:
+                    if not item.get(field):
+                        continue
+                    if field == 'desc_html':
+                        # Extract text from HTML for translation
+                        text_content = re.sub(r'<[^>]+>', '', item[field])
+                        if text_content.strip():
+                            field_refs.append((item, field, text_content, True))
+                    else:
+                        field_refs.append((item, field, item[field], False))
             
-            for field in fields_to_translate:
-                if field in item and item[field]:
-                    try:
-                        if field == 'desc_html':
-                            # Handle HTML content
-                            html_content = item[field]
-                            # Extract text from HTML for translation
-                            text_content = re.sub(r'<[^>]+>', '', html_content)
-                            if text_content.strip():
-                                translated_text = self.llm_client.invoke(
-                                    self.task_name,
-                                    self.en_to_fr_prompt.format(
-                                        english_content=text_content,
-                                        original_french_terms=french_terms
-                                    )
-                                )
-                                # Rebuild HTML
-                                item[field] = f"<p>{translated_text.strip()}</p>"
-                        else:
-                            translated = self.llm_client.invoke(
-                                self.task_name,
-                                self.en_to_fr_prompt.format(
-                                    english_content=item[field],
-                                    original_french_terms=french_terms
-                                )
-                            )
-                            item[field] = translated.strip()
-                    except Exception as e:
-                        print(f"Warning: Could not translate item field {field}: {e}")
-        
-        return items
+            self._collect_group_fields(group.get('offer_groups', []), field_refs)
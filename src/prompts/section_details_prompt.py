@@ -7,6 +7,214 @@ def get_section_detail_prompt() -> PromptTemplate:
             template= template_v2
         )
 
+def get_batch_item_detail_prompt() -> PromptTemplate:
+    return PromptTemplate(
+            input_variables=["items_info", "chunk_content"],
+            template= batch_template_v1
+        )
+
+def get_minimal_item_detail_prompt() -> PromptTemplate:
+    return PromptTemplate(
+            input_variables=["item_info", "context_info", "item_content"],
+            template= minimal_template_v1
+        )
+
+def get_minimal_batch_item_detail_prompt() -> PromptTemplate:
+    return PromptTemplate(
+            input_variables=["items_info", "chunk_content"],
+            template= minimal_batch_template_v1
+        )
+
+def get_document_fields_prompt() -> PromptTemplate:
+    return PromptTemplate(
+            input_variables=["item_info", "context_info", "known_fields", "item_content"],
+            template= document_fields_template_v1
+        )
+
+# Fields the minimal templates may return; anything omitted keeps its default
+MINIMAL_FIELDS_GUIDE = """
+            Allowed item_details fields (include a field ONLY if its value is stated in the content):
+            - unit_quantity (number), unit ("m|m²|m³|kg|h|pcs|etc"), unit_price (number)
+            - unit_type ("MATERIAL|LABOR|SERVICE"), percentage, discount_value, taxes_rate_percent (numbers)
+            - supplier_id, article_id, article_number (text)
+            - desc_html ("<p>HTML formatted description</p>"), is_optional, is_ttc (true/false)
+            Allowed additional_fields: material_type, brand, model, installation_notes,
+            technical_specs with diameter, pressure, temperature, connection_type.
+            Do NOT output fields that are absent, null, empty, zero, false or "not_available".
+"""
+
+minimal_template_v1 = """
+            Analyze this specific offer item from a construction/engineering document and extract the
+            specifications that are actually present. Focus only on the item targeted by the item info.
+            
+            Item Info: {item_info}
+            
+            Context: {context_info}
+            
+            Item Content:
+            {item_content}
+            """ + MINIMAL_FIELDS_GUIDE + """
+            Return compact JSON, for example:
+            {{
+                "item_details": {{"unit_quantity": 12, "unit": "m", "desc_html": "<p>Tube acier DN 50</p>"}},
+                "additional_fields": {{"material_type": "acier", "technical_specs": {{"diameter": "DN 50"}}}},
+                "extraction_metadata": {{"found_quantity": true, "found_price": false,
+                                        "found_technical_specs": true, "confidence_level": "high|medium|low"}}
+            }}
+            
+            extraction_metadata is always required. Return valid JSON only.
+            """
+
+minimal_batch_template_v1 = """
+            Analyze the listed offer items from this construction/engineering document chunk and extract,
+            for each of them, the specifications that are actually present.
+            
+            Items (one per line, each with its item_key and context):
+            {items_info}
+            
+            Chunk Content:
+            {chunk_content}
+            """ + MINIMAL_FIELDS_GUIDE + """
+            Return compact JSON with one entry per item, using the exact item_key given above:
+            {{
+                "items": [
+                    {{
+                        "item_key": "item_key_from_the_list",
+                        "item_details": {{"unit_quantity": 12, "unit": "m"}},
+                        "additional_fields": {{"technical_specs": {{"diameter": "DN 50"}}}},
+                        "extraction_metadata": {{"found_quantity": true, "found_price": false,
+                                                "found_technical_specs": true, "confidence_level": "high|medium|low"}}
+                    }}
+                ]
+            }}
+            
+            Do not mix up values between items of the same table. extraction_metadata is always
+            required. Return valid JSON only, with exactly one entry per listed item.
+            """
+
+document_fields_template_v1 = """
+            Extract the offer-specific values of this construction item. The article itself is already known.
+            
+            Item Info: {item_info}
+            
+            Context: {context_info}
+            
+            Known article fields (do not re-derive them):
+            {known_fields}
+            
+            Item Content:
+            {item_content}
+            
+            Return JSON format with only these fields:
+            {{
+                "item_details": {{
+                    "unit_quantity": number_or_null,
+                    "unit_price": number_or_null,
+                    "percentage": number_or_0,
+                    "discount_value": number_or_0,
+                    "is_optional": false,
+                    "desc_html": "<p>HTML formatted description</p>",
+                    "supplier_id": "supplier_id_if_found",
+                    "article_id": "article_id_if_found",
+                    "article_number": "article_number_if_found"
+                }},
+                "extraction_metadata": {{
+                    "found_quantity": true,
+                    "found_price": false,
+                    "found_technical_specs": true,
+                    "confidence_level": "high|medium|low"
+                }}
+            }}
+            
+            - If information is not available, use null for numbers
+            - Extract quantities from table cells or text (look for numbers followed by units)
+            - Look for prices in currency format (€, EUR, Fr.)
+            Return valid JSON only.
+            """
+
+batch_template_v1 = """
+            Analyze the listed offer items from this construction/engineering document chunk and extract detailed specifications for each of them.
+            
+            Items (one per line, each with its item_key and context):
+            {items_info}
+            
+            Chunk Content:
+            {chunk_content}
+            
+            For EVERY listed item, extract from the content the part that belongs to that item only. Look for:
+            - Quantities and units (m, m², m³, kg, pieces, hours)
+            - Prices and costs
+            - Technical specifications (DN sizes, diameters, materials)
+            - Supplier information
+            - Article/reference numbers
+            - Material types and grades
+            
+            Return JSON format with one entry per item, using the exact item_key given above:
+            {{
+                "items": [
+                    {{
+                        "item_key": "item_key_from_the_list",
+                        "item_details": {{
+                            "supplier_id": "supplier_id_if_found",
+                            "unit_quantity": number_or_null,
+                            "unit_type": "MATERIAL|LABOR|SERVICE",
+                            "percentage": number_or_0,
+                            "unit": "m|m²|m³|kg|h|pcs|etc",
+                            "unit_price": number_or_null,
+                            "margin": number_or_25,
+                            "auction_discount": number_or_0,
+                            "supplier_discount_goal": number_or_0,
+                            "billing_percent_situations": [],
+                            "gantt_schedules": [],
+                            "progress": number_or_0,
+                            "employees_ids": [],
+                            "article_id": "article_id_if_found",
+                            "article_number": "article_number_if_found",
+                            "desc_html": "<p>HTML formatted description</p>",
+                            "is_ttc": false,
+                            "taxes_rate_percent": number_or_0,
+                            "apply_discount": false,
+                            "isPageBreakBefore": false,
+                            "isSellingPriceLocked": false,
+                            "isInvalid": false,
+                            "isCostPriceLocked": false,
+                            "discount_value": number_or_0,
+                            "is_optional": false,
+                            "variants": [],
+                            "articles": []
+                        }},
+                        "additional_fields": {{
+                            "material_type": "material_if_specified",
+                            "brand": "brand_if_specified",
+                            "model": "model_if_specified",
+                            "technical_specs": {{
+                                "diameter": "DN_size_if_applicable",
+                                "pressure": "pressure_rating_if_applicable",
+                                "temperature": "temperature_rating_if_applicable",
+                                "connection_type": "connection_type_if_applicable"
+                            }},
+                            "installation_notes": "installation_requirements_if_any"
+                        }},
+                        "extraction_metadata": {{
+                            "found_quantity": true,
+                            "found_price": false,
+                            "found_technical_specs": true,
+                            "confidence_level": "high|medium|low"
+                        }}
+                    }}
+                ]
+            }}
+            
+            EXTRACTION GUIDELINES:
+            - If information is not available, use null for numbers, empty string for text, or "not_available"
+            - Extract quantities from table cells or text (look for numbers followed by units)
+            - Look for prices in currency format (€, EUR, Fr.)
+            - Technical specs often in format "DN 100", "PN16", "∅ 3/4\""
+            - Do not mix up values between items of the same table
+            
+            Return valid JSON only, with exactly one entry per listed item.
+            """
+
 template_v2=template="""
             Analyze this specific offer item from a construction/engineering document and extract detailed specifications.
             Focus only on the item targeted by the item info.
@@ -9,6 +9,54 @@ def get_structure_prompt() -> PromptTemplate:
             template= template_v5
         )
 
+def get_region_items_prompt() -> PromptTemplate:
+    return PromptTemplate(
+            input_variables=["chunk_info", "main_group", "sub_group", "chunk_content"],
+            template= region_items_template_v1
+        )
+
+region_items_template_v1 = """
+            List the offer items in this section of a construction/engineering document.
+
+            Chunk Info: {chunk_info}
+
+            The section belongs to:
+            - Main category: {main_group}
+            - Sub-category: {sub_group}
+
+            Content:
+            {chunk_content}
+
+            EXTRACTION RULES:
+            1. IGNORE: Image references, totals, summary lines, "A reporter" lines, page headers/footers
+            2. EXTRACT: Every individual offer item from tables, lists, and descriptions
+            3. Do not extract the category headings themselves
+
+            ITEM IDENTIFICATION:
+            - Table rows with specifications (DN sizes, diameters, quantities)
+            - Numbered items (1. Compteur de chaleur, 2. Vanne d'arrêt)
+            - Equipment descriptions with technical specs
+            - Material specifications with quantities and units
+
+            For each item, provide exact start and end delimiters for precise text extraction,
+            a clean item name/description and its article/reference number when one is printed.
+
+            Return JSON format:
+            {{
+                "offer_items": [
+                    {{
+                        "name": "Item description",
+                        "start_delimiter": "exact text that starts this item",
+                        "end_delimiter": "exact text that ends this item",
+                        "article_number": "article/reference number printed for this item, empty if none",
+                        "estimated_content": "brief description of item specs"
+                    }}
+                ]
+            }}
+
+            Return valid JSON only.
+            """
+
 template_v5 = """
             Extract offer items from this construction/engineering document chunk, maintaining hierarchical structure and avoiding duplicates.
 
@@ -53,6 +101,7 @@ template_v5 = """
             For each NEW offer item, provide:
             - Exact start and end delimiters for precise text extraction
             - Clean item name/description
+            - Article/reference number, when one is printed for the item
             - Parent hierarchy (main category → sub-category → item)
             - Indicate if this item continues a previous category
 
@@ -74,6 +123,7 @@ template_v5 = """
                                         "start_delimiter": "exact text that starts this item",
                                         "end_delimiter": "exact text that ends this item",
                                         "chunk_id": "current_chunk_id",
+                                        "article_number": "article/reference number printed for this item, empty if none",
                                         "estimated_content": "brief description of item specs",
                                     }}
                                 ]
@@ -0,0 +1,23 @@
+# src/translation/backend_factory.py
+from typing import Dict, Any, Type
+from .base_backend import BaseTranslationBackend
+from .llm_backend import LLMTranslationBackend
+from .local_mt_backend import LocalMTBackend
+
+class TranslationBackendFactory:
+    _backends: Dict[str, Type[BaseTranslationBackend]] = {
+        "llm": LLMTranslationBackend,
+        "local_mt": LocalMTBackend
+    }
+
+    @classmethod
+    def create_backend(cls, name: str, config: Dict[str, Any], **kwargs) -> BaseTranslationBackend:
+        backend_class = cls._backends.get(name)
+        if not backend_class:
+            raise ValueError(f"Unsupported translation backend: {name}")
+        return backend_class(config, **kwargs)
+
+    @classmethod
+    def register_backend(cls, name: str, backend_class: Type[BaseTranslationBackend]):
+        """Register custom translation backend"""
+        cls._backends[name] = backend_class
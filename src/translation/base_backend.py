@@ -0,0 +1,29 @@
+# src/translation/base_backend.py
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Any, List
+
+@dataclass
+class TranslationResult:
+    text: str
+    confidence: float = 1.0
+    backend: str = ""
+
+class BaseTranslationBackend(ABC):
+    # Backends that cannot handle markdown structure themselves get
+    # line/cell-level segments from the translator instead of whole blocks
+    requires_segmentation: bool = False
+    # Backends that translate a batch in one call; others are sent one text
+    # at a time so a failed call only loses that text
+    batches_requests: bool = False
+    name: str = "base"
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+
+    @abstractmethod
+    def translate_batch(self, texts: List[str],
+                        source_language: str,
+                        target_language: str) -> List[TranslationResult]:
+        """Translate a batch of texts, one result per input text"""
+        pass
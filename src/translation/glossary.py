@@ -0,0 +1,54 @@
+# src/translation/glossary.py
+import re
+from typing import Dict, List, Tuple
+
+class TranslationGlossary:
+    """French/English term pairs that machine translations must respect"""
+
+    def __init__(self, terms: Dict[str, str]):
+        # french term -> list of accepted english renderings
+        self.terms: Dict[str, List[str]] = {}
+        for french, english in terms.items():
+            self.add_term(french, english)
+
+    @classmethod
+    def from_reference_text(cls, reference_text: str) -> 'TranslationGlossary':
+        """Build glossary from '- Français = English' reference lines"""
+        terms = {}
+        for line in reference_text.splitlines():
+            match = re.match(r'^\s*-\s*(.+?)\s*=\s*(.+?)\s*$', line)
+            if match:
+                terms[match.group(1)] = match.group(2)
+        return cls(terms)
+
+    def add_term(self, french: str, english: str):
+        """Add a term; 'Faucet/Tap' style alternatives are all accepted"""
+        alternatives = [alt.strip() for alt in english.split('/') if alt.strip()]
+        self.terms[french.strip()] = alternatives
+
+    def _term_pairs(self, source_language: str) -> List[Tuple[str, List[str]]]:
+        """Return (source term, accepted target terms) for a direction"""
+        if source_language == 'french':
+            return list(self.terms.items())
+        return [(english, [french]) for french, alternatives in self.terms.items()
+                for english in alternatives]
+
+    @staticmethod
+    def _contains(text: str, term: str) -> bool:
+        return re.search(rf'(?<!\w){re.escape(term)}(?!\w)', text, re.IGNORECASE) is not None
+
+    def enforce(self, source: str, translation: str, source_language: str) -> Tuple[str, List[str]]:
+        """Fix untranslated glossary terms and return (translation, missing terms)"""
+        missing = []
+        for source_term, target_terms in self._term_pairs(source_language):
+            if not self._contains(source, source_term):
+                continue
+            if any(self._contains(translation, target) for target in target_terms):
+                continue
+            # Term copied through untranslated: substitute the glossary rendering
+            if source_term.lower() != target_terms[0].lower() and self._contains(translation, source_term):
+                translation = re.sub(rf'(?<!\w){re.escape(source_term)}(?!\w)',
+                                     target_terms[0], translation, flags=re.IGNORECASE)
+                continue
+            missing.append(source_term)
+        return translation, missing
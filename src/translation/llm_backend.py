@@ -0,0 +1,32 @@
+# src/translation/llm_backend.py
+from typing import Dict, Any, List, Optional
+from .base_backend import BaseTranslationBackend, TranslationResult
+from ..utils.enhanced_llm_client import EnhancedLLMClient
+from ..prompts.fr_to_en_translation_prompt import fr_to_en_prompt, en_to_fr_prompt
+
+class LLMTranslationBackend(BaseTranslationBackend):
+    name = "llm"
+
+    def __init__(self, config: Dict[str, Any],
+                 llm_client: Optional[EnhancedLLMClient] = None,
+                 reference_terms: str = ""):
+        super().__init__(config)
+        self.llm_client = llm_client or EnhancedLLMClient(config)
+        self.task_name = "translation"
+        self.reference_terms = reference_terms
+
+    def translate_batch(self, texts: List[str],
+                        source_language: str,
+                        target_language: str) -> List[TranslationResult]:
+        results = []
+        for text in texts:
+            if target_language == 'english':
+                prompt = fr_to_en_prompt.format(french_content=text)
+            else:
+                prompt = en_to_fr_prompt.format(
+                    english_content=text,
+                    original_french_terms=self.reference_terms
+                )
+            translated = self.llm_client.invoke(self.task_name, prompt)
+            results.append(TranslationResult(text=translated.strip(), confidence=1.0, backend=self.name))
+        return results
@@ -0,0 +1,91 @@
+# src/translation/local_mt_backend.py
+import math
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+from .base_backend import BaseTranslationBackend, TranslationResult
+
+LANGUAGE_CODES = {
+    'french': 'fr',
+    'english': 'en',
+    'german': 'de',
+    'italian': 'it',
+}
+
+class LocalMTBackend(BaseTranslationBackend):
+    """CPU machine translation with CTranslate2-converted OPUS-MT/Marian models"""
+    requires_segmentation = True
+    batches_requests = True
+    name = "local_mt"
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.mt_config = config.get('translation', {}).get('local_mt', {})
+        self.batch_size = self.mt_config.get('batch_size', 32)
+        self.beam_size = self.mt_config.get('beam_size', 2)
+        self.max_decoding_length = self.mt_config.get('max_decoding_length', 512)
+        self.inter_threads = self.mt_config.get('inter_threads', 1)
+        self.intra_threads = self.mt_config.get('intra_threads', 4)
+        # Models are loaded lazily, one per language direction
+        self._models: Dict[str, Tuple[Any, Any, Any]] = {}
+
+    def _model_path(self, direction: str) -> Path:
+        model_paths = self.mt_config.get('model_paths', {})
+        if direction not in model_paths:
+            raise ValueError(f"No local MT model configured for direction: {direction}")
+        return Path(model_paths[direction])
+
+    def _load_model(self, direction: str) -> Tuple[Any, Any, Any]:
+        """Load translator and SentencePiece tokenizers for a direction"""
+        if direction in self._models:
+            return self._models[direction]
+
+        try:
+            import ctranslate2
+            import sentencepiece as spm
+        except ImportError as ie:
+            raise RuntimeError(
+                f"Local MT backend unavailable: {str(ie)}. "
+                "Please install: pip install ctranslate2 sentencepiece"
+            )
+
+        model_path = self._model_path(direction)
+        print(f"Loading local MT model for {direction} from {model_path}...")
+        translator = ctranslate2.Translator(
+            str(model_path),
+            device="cpu",
+            inter_threads=self.inter_threads,
+            intra_threads=self.intra_threads
+        )
+        source_sp = spm.SentencePieceProcessor(model_file=str(model_path / "source.spm"))
+        target_sp = spm.SentencePieceProcessor(model_file=str(model_path / "target.spm"))
+
+        self._models[direction] = (translator, source_sp, target_sp)
+        return self._models[direction]
+
+    def translate_batch(self, texts: List[str],
+                        source_language: str,
+                        target_language: str) -> List[TranslationResult]:
+        direction = f"{LANGUAGE_CODES.get(source_language, source_language)}-" \
+                    f"{LANGUAGE_CODES.get(target_language, target_language)}"
+        translator, source_sp, target_sp = self._load_model(direction)
+
+        results = []
+        for batch_start in range(0, len(texts), self.batch_size):
+            batch = texts[batch_start:batch_start + self.batch_size]
+            tokenized = [source_sp.encode(text, out_type=str) for text in batch]
+
+            outputs = translator.translate_batch(
+                tokenized,
+                beam_size=self.beam_size,
+                max_decoding_length=self.max_decoding_length,
+                return_scores=True,
+                normalize_scores=True
+            )
+
+            for output in outputs:
+                hypothesis = target_sp.decode(output.hypotheses[0])
+                # Length-normalized log probability -> per-token probability
+                confidence = math.exp(output.scores[0]) if output.scores else 0.0
+                results.append(TranslationResult(text=hypothesis, confidence=confidence, backend=self.name))
+
+        return results
@@ -0,0 +1,63 @@
+# src/translation/markdown_segmenter.py
+import re
+from typing import List, Tuple, Union
+
+# A template line is a list of literal strings and segment indices
+TemplateLine = List[Union[str, int]]
+
+HEADING_PATTERN = re.compile(r'^(\s*#+\s*)(.*?)(\s*)$')
+LIST_PATTERN = re.compile(r'^(\s*(?:[-*+]|\d+[.)])\s+)(.*?)(\s*)$')
+TABLE_SEPARATOR_PATTERN = re.compile(r'^\s*\|?[\s:\-|]+\|?\s*$')
+
+def _has_words(text: str) -> bool:
+    return re.search(r'[^\W\d_]{2,}', text) is not None
+
+class MarkdownSegmenter:
+    """Split markdown into translatable text segments around its syntax"""
+
+    def segment(self, markdown: str) -> Tuple[List[str], List[TemplateLine]]:
+        """Return segments to translate and a template to rebuild the markdown"""
+        segments: List[str] = []
+        template: List[TemplateLine] = []
+
+        def add_segment(prefix: str, body: str, suffix: str) -> TemplateLine:
+            if not _has_words(body):
+                return [prefix + body + suffix]
+            segments.append(body)
+            return [prefix, len(segments) - 1, suffix]
+
+        for line in markdown.split('\n'):
+            stripped = line.strip()
+
+            if not stripped or not _has_words(stripped):
+                template.append([line])
+            elif stripped.startswith('|'):
+                if TABLE_SEPARATOR_PATTERN.match(line):
+                    template.append([line])
+                    continue
+                parts: TemplateLine = []
+                cells = line.split('|')
+                for cell_index, cell in enumerate(cells):
+                    if cell_index > 0:
+                        parts.append('|')
+                    leading = cell[:len(cell) - len(cell.lstrip())]
+                    trailing = cell[len(cell.rstrip()):]
+                    parts.extend(add_segment(leading, cell.strip(), trailing))
+                template.append(parts)
+            elif HEADING_PATTERN.match(line) and stripped.startswith('#'):
+                template.append(add_segment(*HEADING_PATTERN.match(line).groups()))
+            elif LIST_PATTERN.match(line):
+                template.append(add_segment(*LIST_PATTERN.match(line).groups()))
+            else:
+                leading = line[:len(line) - len(line.lstrip())]
+                template.append(add_segment(leading, stripped, line[len(line.rstrip()):]))
+
+        return segments, template
+
+    def rebuild(self, template: List[TemplateLine], translations: List[str]) -> str:
+        """Reassemble markdown from a template and translated segments"""
+        lines = []
+        for parts in template:
+            lines.append(''.join(translations[part] if isinstance(part, int) else part
+                                 for part in parts))
+        return '\n'.join(lines)
@@ -0,0 +1,107 @@
+# src/utils/article_catalog.py
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from .item_dedup_index import normalize_item_name
+
+# Item detail fields that describe the article itself rather than this offer.
+# Supplier, article ID and article number belong to one supplier's offer: the
+# article number only indexes entries and none of them is reused
+CATALOG_FIELDS = ('unit', 'unit_type')
+
+CONFIDENCE_LEVELS = {'none': 0, 'low': 1, 'medium': 2, 'high': 3}
+
+class ArticleCatalog:
+    """Cross-document store of article-level item details, backed by SQLite
+
+    Entries are indexed by article number and by normalized item description,
+    and hold the fields in CATALOG_FIELDS plus additional_fields (technical
+    specs, material, brand). Quantities, prices and supplier-specific fields
+    stay with their document.
+    """
+
+    def __init__(self, path: str, min_confidence: str = 'high'):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.min_confidence = CONFIDENCE_LEVELS.get(min_confidence, 3)
+        # One connection shared by pipeline threads, serialized by the lock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS articles (
+                    description TEXT PRIMARY KEY,
+                    article_number TEXT,
+                    fields TEXT NOT NULL,
+                    additional_fields TEXT NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS articles_by_number ON articles (article_number)"
+            )
+
+    def lookup(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Catalog entry for an item, by its article number or else its description"""
+        # Phase 2 extracts the article number printed with the item
+        article_number = self._article_number(item.get('article_number'))
+        description = normalize_item_name(item.get('name', ''))
+        with self._lock:
+            row = None
+            if article_number:
+                row = self._connection.execute(
+                    "SELECT description, fields, additional_fields FROM articles WHERE article_number = ?",
+                    (article_number,)
+                ).fetchone()
+            if row is None and description:
+                row = self._connection.execute(
+                    "SELECT description, fields, additional_fields FROM articles WHERE description = ?",
+                    (description,)
+                ).fetchone()
+            if row is None:
+                return None
+            with self._connection:
+                self._connection.execute("UPDATE articles SET hits = hits + 1 WHERE description = ?", (row[0],))
+        # Entries written before supplier fields were excluded may still hold them
+        fields = {field: value for field, value in json.loads(row[1]).items() if field in CATALOG_FIELDS}
+        return {"item_details": fields, "additional_fields": json.loads(row[2])}
+
+    def record(self, item: Dict[str, Any], details: Dict[str, Any]) -> bool:
+        """Store an item's article-level details if the analysis was confident enough"""
+        confidence = details.get('extraction_metadata', {}).get('confidence_level', 'none')
+        description = normalize_item_name(item.get('name', ''))
+        if CONFIDENCE_LEVELS.get(confidence, 0) < self.min_confidence or not description:
+            return False
+
+        item_details = details.get('item_details', {})
+        fields = {field: item_details[field] for field in CATALOG_FIELDS
+                  if item_details.get(field) not in (None, '', 'not_available')}
+        additional_fields = details.get('additional_fields') or {}
+        if not fields and not additional_fields:
+            return False
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                """INSERT INTO articles (description, article_number, fields, additional_fields, updated_at)
+                   VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT (description) DO UPDATE SET
+                       article_number = excluded.article_number, fields = excluded.fields,
+                       additional_fields = excluded.additional_fields, updated_at = excluded.updated_at""",
+                (description, self._article_number(item_details.get('article_number'))
+                 or self._article_number(item.get('article_number')),
+                 json.dumps(fields, ensure_ascii=False),
+                 json.dumps(additional_fields, ensure_ascii=False),
+                 datetime.now().isoformat())
+            )
+        return True
+
+    @staticmethod
+    def _article_number(value: Any) -> Optional[str]:
+        if value in (None, '', 'not_available'):
+            return None
+        return ''.join(str(value).split()).upper()
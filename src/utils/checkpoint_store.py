@@ -0,0 +1,92 @@
+# src/utils/checkpoint_store.py
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
+
+# Config keys that do not change pipeline output and must not invalidate checkpoints
+VOLATILE_CONFIG_KEYS = ('results_dir', 'checkpoint_dir', 'enable_checkpoints',
+                        'debug_json_responses')
+
+def hash_document(content: Union[str, bytes, memoryview]) -> str:
+    """Hash input document content, given as text or a buffer of its UTF-8 bytes"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+def hash_config(config: Dict[str, Any]) -> str:
+    """Hash the output-relevant part of the configuration"""
+    relevant = {key: value for key, value in config.items() if key not in VOLATILE_CONFIG_KEYS}
+    serialized = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+class CheckpointStore:
+    """Phase and item checkpoints keyed by (document hash, config hash, phase)"""
+
+    def __init__(self, checkpoint_dir: Path, document_hash: str, config_hash: str):
+        self.document_hash = document_hash
+        self.config_hash = config_hash
+        self.run_dir = Path(checkpoint_dir) / f"{document_hash[:16]}_{config_hash[:12]}"
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def for_document(cls, config: Dict[str, Any], content: Union[str, bytes, memoryview]) -> 'CheckpointStore':
+        checkpoint_dir = config.get('checkpoint_dir') or \
+            Path(config.get('results_dir', 'pipeline_results')) / 'checkpoints'
+        return cls(checkpoint_dir, hash_document(content), hash_config(config))
+
+    def _phase_path(self, phase: str) -> Path:
+        return self.run_dir / f"phase_{phase}.json"
+
+    def _items_path(self, phase: str) -> Path:
+        return self.run_dir / f"phase_{phase}_items.jsonl"
+
+    def load_phase(self, phase: str) -> Optional[Any]:
+        """Load a completed phase output, or None if not checkpointed"""
+        path = self._phase_path(phase)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable checkpoint {path}: {e}")
+            return None
+
+    def save_phase(self, phase: str, data: Any) -> None:
+        """Atomically save a completed phase output"""
+        path = self._phase_path(phase)
+        temp_path = path.with_suffix('.json.tmp')
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, default=str)
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f"Error saving checkpoint for phase {phase}: {e}")
+
+    def load_items(self, phase: str) -> Dict[str, Any]:
+        """Load per-item results completed within a phase"""
+        path = self._items_path(phase)
+        items = {}
+        if not path.exists():
+            return items
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    items[record['item_id']] = record['data']
+                except (json.JSONDecodeError, KeyError):
+                    # A crash can leave a truncated last line
+                    continue
+        return items
+
+    def save_item(self, phase: str, item_id: str, data: Any) -> None:
+        """Append a completed item result, flushed to disk immediately"""
+        try:
+            with open(self._items_path(phase), 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'item_id': item_id, 'data': data}, ensure_ascii=False, default=str) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            print(f"Error saving item checkpoint {item_id}: {e}")
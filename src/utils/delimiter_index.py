@@ -0,0 +1,189 @@
+# src/utils/delimiter_index.py
+import bisect
+import re
+from array import array
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple, Iterable
+
+WHITESPACE_RUN_PATTERN = re.compile(r'\s+')
+COLLAPSED_RUN_PATTERN = re.compile(r'\s{2,}')
+NON_WHITESPACE_PATTERN = re.compile(r'\S')
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse whitespace runs into single spaces"""
+    return ' '.join(text.split())
+
+class AhoCorasick:
+    """Multi-pattern matcher finding all occurrences of many strings in one pass"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+
+        for pattern in set(patterns):
+            if pattern:
+                self._add(pattern)
+        self._build_failure_links()
+
+    def _add(self, pattern: str):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(pattern)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find_all(self, text: str) -> Dict[str, List[int]]:
+        """Start positions of every pattern occurrence, in increasing order"""
+        occurrences: Dict[str, List[int]] = {}
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern in output[state]:
+                occurrences.setdefault(pattern, []).append(position - len(pattern) + 1)
+        return occurrences
+
+class DelimiterIndex:
+    """Locates items' delimiters in a document and slices their content
+
+    Built once per document: line start offsets, a whitespace-normalized copy
+    of the text with a sparse map back to original offsets, and an
+    Aho-Corasick automaton over all normalized start/end delimiters, so every
+    item is located in one pass over the document regardless of chunk
+    boundaries.
+    """
+
+    def __init__(self, document: str, max_item_chars: int = 4000):
+        self.document = document
+        self.max_item_chars = max_item_chars
+        self.line_starts = array('q', [0])
+        self.line_starts.extend(match.end() for match in re.finditer('\n', document))
+
+        # Every whitespace run becomes one space. Offsets only shift where a
+        # run of two or more characters collapses, so the map holds one
+        # (normalized, original) pair per collapsed run: the positions where
+        # the text after the run starts
+        self.normalized = self._normalize_blocks(document)
+        self.norm_starts = array('q', [0])
+        self.original_starts = array('q', [0])
+        shift = 0
+        for match in COLLAPSED_RUN_PATTERN.finditer(document):
+            shift += len(match.group()) - 1
+            self.norm_starts.append(match.end() - shift)
+            self.original_starts.append(match.end())
+        self.occurrences: Dict[str, List[int]] = {}
+
+    @staticmethod
+    def _normalize_blocks(document: str, block_size: int = 1 << 20) -> str:
+        """Collapse whitespace runs block by block, bounding the substitution's temporary memory"""
+        blocks = []
+        start = 0
+        while start < len(document):
+            # Cut before a non-whitespace character so no run spans two blocks
+            match = NON_WHITESPACE_PATTERN.search(document, start + block_size)
+            end = match.start() if match else len(document)
+            blocks.append(WHITESPACE_RUN_PATTERN.sub(' ', document[start:end]))
+            start = end
+        return ''.join(blocks)
+
+    def to_original(self, norm_position: int) -> int:
+        """Original document offset of a position in the normalized text"""
+        segment = bisect.bisect_right(self.norm_starts, norm_position) - 1
+        return self.original_starts[segment] + (norm_position - self.norm_starts[segment])
+
+    def to_normalized(self, position: int) -> int:
+        """Normalized position of an original offset; offsets inside a collapsed run map to its space"""
+        segment = bisect.bisect_right(self.original_starts, position) - 1
+        norm_position = self.norm_starts[segment] + (position - self.original_starts[segment])
+        if segment + 1 < len(self.norm_starts):
+            norm_position = min(norm_position, self.norm_starts[segment + 1] - 1)
+        return norm_position
+
+    def index_items(self, items: Iterable[Dict[str, Any]]):
+        """Find all occurrences of the items' delimiters in one pass"""
+        patterns = set()
+        for item in items:
+            for key in ('start_delimiter', 'end_delimiter'):
+                pattern = normalize_whitespace(item.get(key) or '')
+                if pattern:
+                    patterns.add(pattern)
+        self.occurrences = AhoCorasick(patterns).find_all(self.normalized) if patterns else {}
+
+    def locate(self, item: Dict[str, Any], search_start: int = 0,
+               search_end: Optional[int] = None) -> Optional[Tuple[int, int]]:
+        """Original (start, end) offsets of an item, expanded to whole lines
+
+        The start delimiter occurrence is searched from search_start: the
+        item's own start offset when known, so identical rows each get their
+        own slice, otherwise the start of its chunk. The item may extend past
+        its chunk.
+        """
+        start_pattern = normalize_whitespace(item.get('start_delimiter') or '')
+        start_norm = self._first_occurrence(start_pattern, self.to_normalized(search_start))
+        if start_norm is None:
+            return None
+        start = self.to_original(start_norm)
+        if search_end is not None and start >= search_end:
+            return None
+
+        end = None
+        end_pattern = normalize_whitespace(item.get('end_delimiter') or '')
+        end_norm = self._first_occurrence(end_pattern, start_norm)
+        if end_norm is not None:
+            end = self.to_original(end_norm + len(end_pattern) - 1) + 1
+        if end is None or end - start > self.max_item_chars:
+            end = min(len(self.document), start + self.max_item_chars)
+
+        return self._line_start(start), self._line_end(end)
+
+    def table_header(self, start: int) -> str:
+        """Header and separator rows of the markdown table containing start, if any"""
+        line = bisect.bisect_right(self.line_starts, start) - 1
+        if not self._line(line).lstrip().startswith('|'):
+            return ''
+        first = line
+        while first > 0 and self._line(first - 1).lstrip().startswith('|'):
+            first -= 1
+        if first >= line - 1:
+            # The item already starts on the header or separator row
+            return ''
+        return self._line(first) + self._line(first + 1)
+
+    def _first_occurrence(self, pattern: str, from_position: int) -> Optional[int]:
+        positions = self.occurrences.get(pattern) if pattern else None
+        if not positions:
+            return None
+        index = bisect.bisect_left(positions, from_position)
+        return positions[index] if index < len(positions) else None
+
+    def _line(self, line: int) -> str:
+        end = self.line_starts[line + 1] if line + 1 < len(self.line_starts) else len(self.document)
+        return self.document[self.line_starts[line]:end]
+
+    def _line_start(self, position: int) -> int:
+        return self.line_starts[bisect.bisect_right(self.line_starts, position) - 1]
+
+    def _line_end(self, position: int) -> int:
+        line = bisect.bisect_left(self.line_starts, position)
+        return self.line_starts[line] if line < len(self.line_starts) else len(self.document)
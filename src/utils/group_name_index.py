@@ -0,0 +1,71 @@
+# src/utils/group_name_index.py
+import re
+from typing import Dict, Any, List, Optional, Set
+
+# Names shorter than this only match exactly
+MIN_CONTAINMENT_LENGTH = 11
+
+def normalize_group_name(name: str) -> str:
+    """Lowercase and strip punctuation, as used for group name comparison"""
+    return re.sub(r'[^\w\s]', '', name.lower()).strip()
+
+class GroupNameIndex:
+    """Lookup of groups by similar name in near-constant time
+
+    Two names are similar when their normalized forms are equal, or when both
+    are longer than 10 characters and one contains the other. Exact matches go
+    through a dict. Indexed names containing the query are scanned from the
+    posting list of the query's rarest trigram; indexed names inside the
+    query are exact lookups of its substrings, for each length a long indexed
+    name has. Like a linear scan, the earliest added matching group wins.
+    """
+
+    def __init__(self):
+        self._groups: List[Dict[str, Any]] = []
+        self._exact: Dict[str, int] = {}
+        # Long names by each trigram they contain (query inside an indexed name)
+        self._by_trigram: Dict[str, List[int]] = {}
+        # Lengths of long names (indexed name inside the query)
+        self._long_lengths: Set[int] = set()
+        self._names: List[str] = []
+
+    def find(self, name: str) -> Optional[Dict[str, Any]]:
+        normalized = normalize_group_name(name)
+        candidates = []
+
+        if normalized in self._exact:
+            candidates.append(self._exact[normalized])
+
+        if len(normalized) >= MIN_CONTAINMENT_LENGTH:
+            # Indexed names containing the query share all its trigrams;
+            # scan the shortest posting list
+            postings = [self._by_trigram.get(trigram, []) for trigram in self._trigrams(normalized)]
+            for position in min(postings, key=len):
+                if normalized in self._names[position]:
+                    candidates.append(position)
+                    break
+
+            # Indexed names inside the query are substrings of one of their lengths
+            for length in self._long_lengths:
+                for offset in range(len(normalized) - length + 1):
+                    position = self._exact.get(normalized[offset:offset + length])
+                    if position is not None:
+                        candidates.append(position)
+
+        return self._groups[min(candidates)] if candidates else None
+
+    def add(self, name: str, group: Dict[str, Any]):
+        normalized = normalize_group_name(name)
+        position = len(self._groups)
+        self._groups.append(group)
+        self._names.append(normalized)
+        self._exact.setdefault(normalized, position)
+
+        if len(normalized) >= MIN_CONTAINMENT_LENGTH:
+            for trigram in self._trigrams(normalized):
+                self._by_trigram.setdefault(trigram, []).append(position)
+            self._long_lengths.add(len(normalized))
+
+    @staticmethod
+    def _trigrams(normalized: str) -> set:
+        return {normalized[i:i + 3] for i in range(len(normalized) - 2)}
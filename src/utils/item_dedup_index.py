@@ -0,0 +1,91 @@
+# src/utils/item_dedup_index.py
+import bisect
+import re
+from difflib import SequenceMatcher
+from typing import Dict, Any, List, Optional, Tuple
+
+def normalize_item_name(name: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace"""
+    return ' '.join(re.sub(r'[^\w\s]', ' ', (name or '').lower()).split())
+
+class ItemDedupIndex:
+    """Index of merged items keyed on normalized name and absolute document offset
+
+    Items extracted twice from the overlap between consecutive chunks start at
+    the same document offset; a new item is a duplicate when an indexed item
+    of an earlier chunk, whose range covers the new item's offset, starts
+    within offset_tolerance characters and has a near-identical name. Items of
+    the same chunk are never duplicates: identical rows are separate items.
+    Items whose start delimiter could not be located fall back to matching
+    names among items of the previous chunk in the same sub-group.
+    """
+
+    def __init__(self, offset_tolerance: int = 80, name_similarity: float = 0.85):
+        self.offset_tolerance = offset_tolerance
+        self.name_similarity = name_similarity
+        self._offsets: List[int] = []
+        self._entries_at: List[Tuple[str, Dict[str, Any]]] = []
+        self._by_chunk: Dict[int, List[Tuple[str, int, Dict[str, Any]]]] = {}
+        self._chunk_ends: Dict[int, int] = {}
+        self.dropped: List[Dict[str, Any]] = []
+
+    def find_duplicate(self, item: Dict[str, Any], sub_group: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Indexed item that the given item duplicates, if any"""
+        name = normalize_item_name(item.get('name', ''))
+        offset = item.get('start_offset')
+
+        if offset is not None:
+            # Only items starting near the same offset can be the same item
+            low = bisect.bisect_left(self._offsets, offset - self.offset_tolerance)
+            high = bisect.bisect_right(self._offsets, offset + self.offset_tolerance)
+            for existing_name, existing in self._entries_at[low:high]:
+                if self._in_overlap(item, existing) and self._similar(name, existing_name):
+                    return existing
+            return None
+
+        chunk_index = item.get('chunk_index')
+        if chunk_index is None:
+            return None
+        for existing_name, group_id, existing in self._by_chunk.get(chunk_index - 1, []):
+            if group_id == id(sub_group) and self._similar(name, existing_name):
+                return existing
+        return None
+
+    def add_chunk(self, chunk_index: int, end_offset: int):
+        """Record where a chunk ends, bounding the overlap with the chunks after it"""
+        self._chunk_ends[chunk_index] = end_offset
+
+    def add(self, item: Dict[str, Any], sub_group: Dict[str, Any]):
+        name = normalize_item_name(item.get('name', ''))
+        offset = item.get('start_offset')
+        if offset is not None:
+            position = bisect.bisect_right(self._offsets, offset)
+            self._offsets.insert(position, offset)
+            self._entries_at.insert(position, (name, item))
+        if item.get('chunk_index') is not None:
+            self._by_chunk.setdefault(item['chunk_index'], []).append((name, id(sub_group), item))
+
+    def record_dropped(self, item: Dict[str, Any], kept: Dict[str, Any]):
+        self.dropped.append({
+            'name': item.get('name'),
+            'chunk_index': item.get('chunk_index'),
+            'start_offset': item.get('start_offset'),
+            'kept_chunk_index': kept.get('chunk_index')
+        })
+
+    def _in_overlap(self, item: Dict[str, Any], existing: Dict[str, Any]) -> bool:
+        """Whether the item lies in the range of the existing item's chunk, another chunk"""
+        chunk_index = item.get('chunk_index')
+        existing_chunk = existing.get('chunk_index')
+        if chunk_index is not None and chunk_index == existing_chunk:
+            return False
+        chunk_end = self._chunk_ends.get(existing_chunk)
+        return chunk_end is None or item['start_offset'] < chunk_end
+
+    def _similar(self, name: str, existing_name: str) -> bool:
+        if name == existing_name:
+            return True
+        # Sizes and positions distinguish otherwise identical rows (DN 80 / DN 65)
+        if re.findall(r'\d+', name) != re.findall(r'\d+', existing_name):
+            return False
+        return SequenceMatcher(None, name, existing_name).ratio() >= self.name_similarity
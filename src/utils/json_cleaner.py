@@ -24,6 +24,14 @@ class JSONResponseCleaner:
         # Remove <think> blocks entirely
         cleaned_response = self._remove_think_blocks(response)
         
+        # A bare JSON object is parsed whole; the patterns below would stop at
+        # the first closing brace of a nested object
+        if cleaned_response.startswith('{'):
+            try:
+                return json.loads(cleaned_response)
+            except json.JSONDecodeError:
+                pass
+        
         # Try to extract JSON using patterns
         for pattern in self.json_patterns:
             json_content = self._extract_with_pattern(cleaned_response, pattern)
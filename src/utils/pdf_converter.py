@@ -31,6 +31,10 @@ class PDFToMarkdownConverter:
             if self.marker_config.get('languages'):
                 config['langs'] = self.marker_config['languages']
             
+            # Page separators let boilerplate stripping look at page edges only
+            if self.config.get('strip_boilerplate', False):
+                config['paginate_output'] = True
+            
             # Create config parser and converter
             config_parser = ConfigParser(config)
             converter = PdfConverter(
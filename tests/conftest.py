@@ -0,0 +1,3 @@
+# tests/conftest.py
+# Live provider checks that need network access and API keys; run them directly
+collect_ignore = ["test_edenai.py", "test_ollama.py"]
@@ -0,0 +1,27 @@
+# tests/test_article_catalog.py
+from src.utils.article_catalog import ArticleCatalog
+
+def _details(article_number='', confidence='high'):
+    return {'item_details': {'unit': 'm', 'unit_type': 'MATERIAL', 'unit_price': 12.5,
+                             'supplier_id': 'S-1', 'article_number': article_number},
+            'additional_fields': {'material_type': 'acier'},
+            'extraction_metadata': {'confidence_level': confidence}}
+
+def test_lookup_by_phase_2_article_number(tmp_path):
+    catalog = ArticleCatalog(str(tmp_path / 'catalog.sqlite'))
+    assert catalog.record({'name': 'Tube acier DN 50', 'article_number': 'AB 123'}, _details())
+    
+    # Another document describes the article differently but prints the same number
+    entry = catalog.lookup({'name': 'Tube en acier noir DN50', 'article_number': 'ab123'})
+    assert entry == {'item_details': {'unit': 'm', 'unit_type': 'MATERIAL'},
+                     'additional_fields': {'material_type': 'acier'}}
+    assert catalog.lookup({'name': 'Tube en acier noir DN50'}) is None
+
+def test_lookup_by_description_and_confidence_gate(tmp_path):
+    catalog = ArticleCatalog(str(tmp_path / 'catalog.sqlite'))
+    assert not catalog.record({'name': 'Coude acier DN 50'}, _details(confidence='medium'))
+    assert catalog.lookup({'name': 'Coude acier DN 50'}) is None
+    assert catalog.record({'name': 'Coude acier DN 50'}, _details(article_number='C-50'))
+    # Prices and supplier fields stay with their document
+    assert catalog.lookup({'name': 'coude acier dn 50'})['item_details'] == {'unit': 'm', 'unit_type': 'MATERIAL'}
+    assert catalog.lookup({'name': 'Autre', 'article_number': 'c-50'}) is not None
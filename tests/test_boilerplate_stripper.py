@@ -0,0 +1,52 @@
+# tests/test_boilerplate_stripper.py
+from src.processors.boilerplate_stripper import BoilerplateStripper
+
+def _page(number):
+    return (f"Entreprise SA - Offre 2024-117\n"
+            f"Page {number} / 4\n\n"
+            f"| Pos | Désignation | Qté |\n"
+            f"| --- | --- | --- |\n"
+            f"| {number} | Tube acier | 12 |\n"
+            f"Suite du tableau\n"
+            f"| {number}b | Coude acier | 4 |\n\n"
+            f"- Vanne 1/2 pouce\n"
+            f"Tube acier DN 50, {number * 3} m\n\n"
+            f"Genève, rue du Lac 12\n"
+            f"A reporter Fr. {number * 1234}'{number * 7:02d}.50\n")
+
+def _paginated(pages):
+    return "".join(page + (f"\n{{{index}}}" + "-" * 48 + "\n" if index < len(pages) - 1 else "")
+                   for index, page in enumerate(pages))
+
+def test_running_headers_and_footers_are_removed():
+    stripped, report = BoilerplateStripper({}).strip(_paginated([_page(n) for n in range(1, 5)]))
+    assert 'Entreprise SA' not in stripped
+    assert 'Page ' not in stripped
+    assert 'rue du Lac' not in stripped
+    assert '-----' not in stripped
+    assert report['page_separators'] == 3
+    assert 'A reporter' not in stripped
+    assert report['removed_lines'] == 16
+    assert report['tokens_saved'] == report['tokens_before'] - report['tokens_after'] > 0
+
+def test_items_tables_and_lists_are_kept():
+    stripped, _ = BoilerplateStripper({}).strip(_paginated([_page(n) for n in range(1, 5)]))
+    # Quantities are not masked, so item lines that differ by them stay
+    for number in range(1, 5):
+        assert f"Tube acier DN 50, {number * 3} m" in stripped
+    assert stripped.count("| Pos | Désignation | Qté |") == 4
+    assert stripped.count("Suite du tableau") == 4
+    assert stripped.count("- Vanne 1/2 pouce") == 4
+
+def test_unpaginated_markdown_is_unchanged():
+    document = "\n".join(["Fourniture et pose de tube DN 50"] + ["texte"] * 25) * 4
+    stripped, report = BoilerplateStripper({}).strip(document)
+    assert stripped == document
+    assert report['removed_lines'] == 0
+
+def test_form_feeds_are_page_breaks():
+    document = "".join(f"\fACME SA Page {number}\nArticle {number}\n\nTexte de l'offre {number}\n"
+                       for number in range(4))
+    stripped, _ = BoilerplateStripper({}).strip(document)
+    assert 'ACME SA' not in stripped
+    assert all(f"Article {number}" in stripped for number in range(4))
@@ -0,0 +1,71 @@
+# tests/test_cfc_hierarchy.py
+import json
+
+import pytest
+
+from src.processors.cfc_hierarchy import DIRECT_ITEMS_SUB_GROUP, parse_cfc_regions, has_body
+from src.processors.prompt_compactor import CompactionTotals
+
+DOCUMENT = (
+    "Offre no 2024-117\n\n"
+    "# 243. A. DISTRIBUTION DE CHALEUR\n\n"
+    "#### 243. A. 1. Tuyauteries\n\n"
+    "| 1 | Tube acier DN 50 | 12 | m |\n\n"
+    "**243. A. 2. Accessoires**\n\n"
+    "| 2 | Vanne d'arrêt DN 50 | 4 | pce |\n\n"
+    "#### 243. A. 1. Tuyauteries (suite)\n\n"
+    "| 3 | Coude acier DN 50 | 6 | pce |\n"
+)
+
+def test_regions_follow_headings_and_repeats_map_to_first_occurrence():
+    regions = parse_cfc_regions(DOCUMENT)
+    assert [region.heading_path for region in regions] == [
+        ['243. A. DISTRIBUTION DE CHALEUR'],
+        ['243. A. DISTRIBUTION DE CHALEUR', '243. A. 1. Tuyauteries'],
+        ['243. A. DISTRIBUTION DE CHALEUR', '243. A. 2. Accessoires'],
+        ['243. A. DISTRIBUTION DE CHALEUR', '243. A. 1. Tuyauteries'],
+    ]
+    # Text before the first heading belongs to no region; regions tile the rest
+    assert regions[0].start == DOCUMENT.index('# 243. A.')
+    assert all(previous.end == region.start for previous, region in zip(regions, regions[1:]))
+    assert regions[-1].end == len(DOCUMENT)
+    assert not has_body(DOCUMENT, regions[0])
+    assert 'Coude acier' in DOCUMENT[regions[3].start:regions[3].end]
+
+def test_late_main_heading_replaces_its_code_placeholder():
+    document = (
+        "#### 243. A. 1. Tuyauteries\n| 1 | Tube |\n"
+        "# 243. A. DISTRIBUTION DE CHALEUR\nTexte\n"
+        "#### 243. A. 2. Accessoires\n| 2 | Vanne |\n"
+    )
+    regions = parse_cfc_regions(document)
+    assert {region.main_name for region in regions} == {'243. A. DISTRIBUTION DE CHALEUR'}
+    assert regions[0].heading_path == ['243. A. DISTRIBUTION DE CHALEUR', '243. A. 1. Tuyauteries']
+
+def test_table_of_contents_entries_are_not_headings():
+    document = "243. A. DISTRIBUTION DE CHALEUR ........ 3\n\nTexte\n"
+    assert parse_cfc_regions(document) == []
+
+def test_region_without_sub_group_uses_the_neutral_sub_group():
+    pytest.importorskip('langchain')
+    from src.processors.markdown_chunker import MarkdownChunker
+    from src.processors.structure_delimiter_extractor import StructureDelimiterExtractor
+
+    class RegionClient:
+        prompts = []
+        def invoke(self, task, prompt):
+            self.prompts.append(prompt)
+            return json.dumps({'offer_items': [{'name': 'Tube', 'start_delimiter': '| 1 | Tube',
+                                                'end_delimiter': 'm |'}]})
+
+    document = "# 243. A. DISTRIBUTION DE CHALEUR\n\n| 1 | Tube | 12 | m |\n"
+    chunk = MarkdownChunker({'chunking_mode': 'headings'}).create_overlapping_chunks(document)[0]
+    extractor = StructureDelimiterExtractor({})
+    extractor.llm_client = RegionClient()
+    context = {'compaction_totals': CompactionTotals()}
+    chunk_items = extractor._extract_region_items(context, chunk)
+    
+    main_group = chunk_items['offer_item_groups'][0]
+    assert main_group['name'] == '243. A. DISTRIBUTION DE CHALEUR'
+    assert main_group['offer_groups'][0]['name'] == DIRECT_ITEMS_SUB_GROUP
+    assert RegionClient.prompts[0].count('DISTRIBUTION DE CHALEUR') == 2  # heading line and main category
@@ -0,0 +1,76 @@
+# tests/test_checkpoint_store.py
+import json
+
+import pytest
+
+from src.processors.section_detail_analyzer import SectionDetailAnalyzer
+from src.utils.checkpoint_store import CheckpointStore
+
+CONTENT = "\n".join(f"Article {index} description du produit numero {index}" for index in range(6))
+
+class _InterruptedRun(BaseException):
+    """Stops the run like a killed process; per-item error handling does not catch it"""
+
+class _FakeClient:
+    """Answers every item, failing once max_calls calls were made"""
+    def __init__(self, max_calls=None):
+        self.max_calls = max_calls
+        self.calls = 0
+    
+    def invoke(self, task, prompt):
+        self.calls += 1
+        if self.max_calls is not None and self.calls > self.max_calls:
+            raise _InterruptedRun()
+        return json.dumps({'item_details': {'unit_quantity': 1},
+                           'extraction_metadata': {'found_quantity': True, 'confidence_level': 'high'}})
+
+def _structure():
+    items = [{'offer_item_id': f"1.1.{index}", 'name': f"Article {index}", 'chunk_id': 'chunk_0',
+              'start_delimiter': f"Article {index}", 'end_delimiter': f"numero {index}"}
+             for index in range(6)]
+    return {'offer_item_groups': [{'name': 'Sanitaire', 'offer_groups': [
+        {'name': 'Tuyauteries', 'offer_items': items}]}]}
+
+def _analyze(store, client):
+    analyzer = SectionDetailAnalyzer({'table_fast_path': False})
+    analyzer.llm_client = client
+    chunk = {'chunk_id': 'chunk_0', 'content': CONTENT, 'start_char': 0, 'end_char': len(CONTENT)}
+    return analyzer.analyze_offer_items_detailed(
+        _structure(), [chunk],
+        completed_items=store.load_items('3_detailed_structure'),
+        on_item_analyzed=lambda item_id, details: store.save_item('3_detailed_structure', item_id, details)
+    )
+
+def test_phase_checkpoints_are_keyed_by_document_and_config(tmp_path):
+    config = {'checkpoint_dir': str(tmp_path), 'chunk_size': 4000}
+    store = CheckpointStore.for_document(config, CONTENT)
+    assert store.load_phase('2_structure') is None
+    store.save_phase('2_structure', {'offer_item_groups': []})
+    
+    # Output-irrelevant keys do not invalidate the checkpoint, others do
+    same = CheckpointStore.for_document({**config, 'results_dir': 'elsewhere'}, CONTENT.encode('utf-8'))
+    assert same.load_phase('2_structure') == {'offer_item_groups': []}
+    assert CheckpointStore.for_document({**config, 'chunk_size': 2000}, CONTENT).load_phase('2_structure') is None
+    assert CheckpointStore.for_document(config, CONTENT + "\n").load_phase('2_structure') is None
+
+def test_truncated_item_line_is_ignored(tmp_path):
+    store = CheckpointStore.for_document({'checkpoint_dir': str(tmp_path)}, CONTENT)
+    store.save_item('3_detailed_structure', '1.1.0', {'item_details': {}})
+    with open(store._items_path('3_detailed_structure'), 'a', encoding='utf-8') as f:
+        f.write('{"item_id": "1.1.1", "da')
+    assert list(store.load_items('3_detailed_structure')) == ['1.1.0']
+
+def test_interrupted_item_analysis_resumes_with_remaining_items(tmp_path):
+    config = {'checkpoint_dir': str(tmp_path)}
+    with pytest.raises(_InterruptedRun):
+        _analyze(CheckpointStore.for_document(config, CONTENT), _FakeClient(max_calls=2))
+    
+    store = CheckpointStore.for_document(config, CONTENT)
+    assert sorted(store.load_items('3_detailed_structure')) == ['1.1.0', '1.1.1']
+    
+    resumed = _FakeClient()
+    result = _analyze(store, resumed)
+    assert resumed.calls == 4
+    items = result['offer_item_groups'][0]['offer_groups'][0]['offer_items']
+    assert all(item['details']['item_details']['unit_quantity'] == 1 for item in items)
+    assert len(store.load_items('3_detailed_structure')) == 6
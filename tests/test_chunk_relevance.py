@@ -0,0 +1,40 @@
+# tests/test_chunk_relevance.py
+import json
+
+from src.processors.chunk_relevance import ChunkRelevanceFilter
+
+ITEMS = (
+    "#### 243. A. 1. Tuyauteries\n\n"
+    "| Pos | Désignation | Qté | Unité | PU |\n|---|---|---|---|---|\n"
+    "| 1 | Fourniture et pose tube acier DN 50 | 12 | m | 45.00 |\n"
+    "| 2 | Coude acier DN 50, y compris raccordement | 4 | pce | 18.50 |\n"
+    "| 3 | Vanne d'arrêt PN 16 | 2 | pce | 85.00 |\n"
+)
+CONDITIONS = (
+    "Conditions générales\n\n"
+    "Le soumissionnaire accepte les conditions du contrat. La garantie, les assurances et la "
+    "responsabilité de l'entreprise sont réglées par la norme SIA 118. Les paiements sont "
+    "effectués selon l'article 12; en cas de litige, la juridiction est celle du maître d'ouvrage.\n"
+)
+CONTENTS = "Table des matières\n\n" + "".join(f"243. A. {i}. Chapitre {i} ........ {i + 2}\n" for i in range(1, 9))
+
+def test_item_tables_score_above_the_threshold():
+    relevance = ChunkRelevanceFilter()
+    assert relevance.score(ITEMS) > 0.9
+    assert relevance.is_relevant(ITEMS)
+
+def test_legal_text_and_table_of_contents_score_below_the_threshold():
+    relevance = ChunkRelevanceFilter()
+    assert relevance.score(CONDITIONS) < relevance.threshold
+    assert relevance.score(CONTENTS) < relevance.threshold
+    assert not relevance.is_relevant(CONDITIONS)
+    assert not relevance.is_relevant(CONTENTS)
+
+def test_threshold_and_weights_file(tmp_path):
+    score = ChunkRelevanceFilter().score(CONDITIONS)
+    assert ChunkRelevanceFilter(threshold=score).is_relevant(CONDITIONS)
+    assert not ChunkRelevanceFilter(threshold=min(1.0, score + 1e-6)).is_relevant(CONDITIONS)
+    
+    weights_path = tmp_path / 'weights.json'
+    weights_path.write_text(json.dumps({'legal_keywords': 0.0, 'bias': 2.0}))
+    assert ChunkRelevanceFilter(weights_path=str(weights_path)).is_relevant(CONDITIONS)
@@ -0,0 +1,73 @@
+# tests/test_chunk_view.py
+import pytest
+
+from src.processors.markdown_chunker import ChunkView, MarkdownChunker
+
+# Accented text so that byte and character offsets differ
+DOCUMENT = "".join(f"## Section {i}\n\nTuyauterie en acier, coude à 90° DN {i}\n\n" * 3 for i in range(40))
+
+def _write(tmp_path):
+    path = tmp_path / "document.md"
+    path.write_bytes(DOCUMENT.encode('utf-8'))
+    return path
+
+def test_text_chunks_use_character_offsets():
+    chunks = MarkdownChunker({'chunk_size': 800, 'overlap_size': 100}).create_overlapping_chunks(DOCUMENT)
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert chunk['content'] == DOCUMENT[chunk['start_char']:chunk['end_char']]
+        assert chunk.to_dict()['offset_unit'] == 'chars'
+    assert chunks[0]['start_char'] == 0 and chunks[-1]['end_char'] == len(DOCUMENT)
+
+@pytest.mark.parametrize('chunking_mode', ['fixed', 'content_defined'])
+def test_mapped_chunks_use_byte_offsets(tmp_path, chunking_mode):
+    encoded = DOCUMENT.encode('utf-8')
+    chunker = MarkdownChunker({'chunking_mode': chunking_mode, 'chunk_size': 800, 'overlap_size': 100})
+    chunks = list(chunker.iter_chunks(_write(tmp_path)))
+    assert len(chunks) > 1
+    for chunk in chunks:
+        # Boundaries fall between characters, so the slice decodes strictly
+        assert chunk['content'] == encoded[chunk['start_char']:chunk['end_char']].decode('utf-8')
+        assert chunk.to_dict()['offset_unit'] == 'bytes'
+    assert chunks[-1]['end_char'] == len(encoded)
+
+def test_document_offset_maps_characters_to_bytes(tmp_path):
+    chunker = MarkdownChunker({'chunk_size': 800, 'overlap_size': 100})
+    chunk = list(chunker.iter_chunks(_write(tmp_path)))[1]
+    position = chunk['content'].index('°')
+    offset = chunk.document_offset(position)
+    assert DOCUMENT.encode('utf-8')[offset:offset + len('°'.encode('utf-8'))].decode('utf-8') == '°'
+
+def test_structure_mode_decodes_mapped_input_to_characters(tmp_path):
+    chunker = MarkdownChunker({'chunking_mode': 'structure', 'chunk_size': 800, 'overlap_size': 100})
+    chunks = list(chunker.iter_chunks(_write(tmp_path)))
+    assert all(chunk.to_dict()['offset_unit'] == 'chars' for chunk in chunks)
+    assert all(chunk['content'] == DOCUMENT[chunk['start_char']:chunk['end_char']] for chunk in chunks)
+
+def test_from_dict_round_trip_and_unit_mismatch():
+    chunk = MarkdownChunker({'chunk_size': 800, 'overlap_size': 100}).create_overlapping_chunks(DOCUMENT)[2]
+    restored = ChunkView.from_dict(DOCUMENT, chunk.to_dict())
+    assert restored.to_dict() == chunk.to_dict()
+    assert restored['content'] == chunk['content']
+    # Character offsets must not be applied to the file's bytes
+    with pytest.raises(ValueError):
+        ChunkView.from_dict(DOCUMENT.encode('utf-8'), chunk.to_dict())
+
+def test_overlap_must_be_smaller_than_chunk_size():
+    with pytest.raises(ValueError):
+        MarkdownChunker({'chunk_size': 1000, 'overlap_size': 1500})
+
+@pytest.mark.parametrize('overlap_mode', ['fixed', 'adaptive'])
+def test_mapped_chunk_starts_advance_inside_multibyte_text(tmp_path, overlap_mode):
+    # No line or sentence breaks: every boundary falls inside a run of two-byte characters
+    path = tmp_path / "accents.md"
+    path.write_bytes(("é" * 5000).encode('utf-8'))
+    chunker = MarkdownChunker({'chunk_size': 1000, 'overlap_size': 999, 'overlap_mode': overlap_mode})
+    if overlap_mode == 'adaptive':
+        chunks = list(chunker.iter_adaptive_chunks(path, lambda chunk: None))
+    else:
+        chunks = list(chunker.iter_chunks(path))
+    starts = [chunk['start_char'] for chunk in chunks]
+    assert starts == sorted(set(starts))
+    assert len(chunks) < 10000
+    assert all(set(chunk['content']) == {'é'} for chunk in chunks)
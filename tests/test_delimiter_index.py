@@ -0,0 +1,42 @@
+# tests/test_delimiter_index.py
+from src.utils.delimiter_index import DelimiterIndex
+
+DOCUMENT = (
+    "#### 243. A. 1. Tuyauteries\n\n"
+    "| Pos |  Désignation          | Qté | U   |\n"
+    "|-----|-----------------------|-----|-----|\n"
+    "| 1   |  Coude acier DN 50    | 4   | pce |\n"
+    "| 1   |  Coude acier DN 50    | 4   | pce |\n"
+)
+
+def test_locate_ignores_whitespace_differences():
+    index = DelimiterIndex(DOCUMENT)
+    item = {'start_delimiter': '| 1 | Coude acier DN 50 |', 'end_delimiter': '4 | pce |'}
+    missing = {'start_delimiter': 'Tube acier'}
+    index.index_items([item, missing])
+    start, end = index.locate(item)
+    assert start == DOCUMENT.index("| 1   |  Coude")
+    assert DOCUMENT[end - 1] == '\n' and DOCUMENT[start:end].count('\n') == 1
+    assert index.locate(missing) is None
+
+def test_offsets_round_trip_through_normalized_text():
+    index = DelimiterIndex(DOCUMENT)
+    for position, char in enumerate(DOCUMENT):
+        if not char.isspace():
+            assert index.to_original(index.to_normalized(position)) == position
+
+def test_repeated_rows_are_located_from_their_own_offset():
+    index = DelimiterIndex(DOCUMENT)
+    item = {'start_delimiter': '| 1 | Coude acier DN 50', 'end_delimiter': 'pce |'}
+    index.index_items([item])
+
+    first = index.locate(item)
+    second = index.locate(item, DOCUMENT.rindex("| 1   |  Coude"))
+    assert DOCUMENT[first[0]:first[1]] == DOCUMENT[second[0]:second[1]]
+    assert first[0] < second[0]
+    assert second[1] == len(DOCUMENT)
+
+def test_table_header_of_a_row():
+    index = DelimiterIndex(DOCUMENT)
+    header = index.table_header(DOCUMENT.rindex("| 1   |"))
+    assert header.startswith("| Pos |") and header.count('\n') == 2
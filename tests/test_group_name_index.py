@@ -0,0 +1,37 @@
+# tests/test_group_name_index.py
+import random
+
+from src.utils.group_name_index import GroupNameIndex, normalize_group_name
+
+def _similar(name1, name2):
+    """Group name similarity as a linear scan would test it"""
+    norm1, norm2 = normalize_group_name(name1), normalize_group_name(name2)
+    if norm1 == norm2:
+        return True
+    if len(norm1) > 10 and len(norm2) > 10:
+        return norm1 in norm2 or norm2 in norm1
+    return False
+
+def test_matches_linear_scan():
+    random.seed(3)
+    words = ['243.', 'A.', '1.', 'tuyauterie', 'acier', 'DN', '80', 'vanne', 'isolation', 'réseau']
+    index = GroupNameIndex()
+    groups = []
+    for _ in range(2000):
+        name = ' '.join(random.choices(words, k=random.randint(1, 6)))
+        expected = next((group for group in groups if _similar(group['name'], name)), None)
+        found = index.find(name)
+        assert found is expected
+        if found is None:
+            group = {'name': name}
+            groups.append(group)
+            index.add(name, group)
+
+def test_containment_both_ways():
+    index = GroupNameIndex()
+    group = {'name': '243. A. 1. Tuyauteries'}
+    index.add(group['name'], group)
+    assert index.find('243. A. 1. Tuyauteries (suite)') is group
+    assert index.find('A. 1. Tuyauteries') is group
+    # Short names only match exactly
+    assert index.find('Tuyaut') is None
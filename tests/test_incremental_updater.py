@@ -0,0 +1,74 @@
+# tests/test_incremental_updater.py
+from src.processors.incremental_updater import IncrementalUpdater
+from src.processors.markdown_chunker import MarkdownChunker
+
+def _document(revised):
+    return "".join(
+        f"## Section {i}\n\nTuyauterie en acier DN {i}{' révisée' if revised and i == 20 else ''}, "
+        f"coude et raccord\n\n" * 3
+        for i in range(40)
+    )
+
+def _chunks(revised):
+    chunker = MarkdownChunker({'chunking_mode': 'content_defined', 'chunk_size': 800, 'overlap_size': 100})
+    return chunker.create_overlapping_chunks(_document(revised))
+
+def _structure(chunks, names):
+    items = [{'name': name, 'start_delimiter': f"| {name} |", 'chunk_id': chunks[index]['chunk_id']}
+             for name, index in names]
+    return {'offer_item_groups': [{'name': '243. Sanitaire', 'offer_groups': [
+        {'name': '243.1 Tuyauteries', 'offer_items': items}]}]}
+
+def _items(structure):
+    return structure['offer_item_groups'][0]['offer_groups'][0]['offer_items']
+
+def _first_run(config, chunks):
+    updater = IncrementalUpdater(config, 'offer.md')
+    assert updater.reusable_chunk_items(chunks) == {}
+    updater.record_structure_chunks(chunks, [{'chunk': chunk['chunk_index']} for chunk in chunks])
+    
+    structure = _structure(chunks, [(f"Article {index}", index) for index in range(len(chunks))])
+    structure['offer_item_groups'][0]['offer_item_group_id'] = '1'
+    structure['offer_item_groups'][0]['offer_groups'][0]['offer_item_group_id'] = '1.1'
+    for number, item in enumerate(_items(structure), 1):
+        item['offer_item_id'] = f"1.1.{number}"
+        item['details'] = {'item_details': {'unit_quantity': number},
+                           'extraction_metadata': {'confidence_level': 'high'}}
+    updater.save(structure)
+
+def test_changed_chunk_and_its_successor_are_reprocessed(tmp_path):
+    config = {'checkpoint_dir': str(tmp_path)}
+    first_chunks, revised_chunks = _chunks(False), _chunks(True)
+    changed = [index for index, (old, new) in enumerate(zip(first_chunks, revised_chunks))
+               if old['chunk_id'] != new['chunk_id']]
+    assert len(changed) == 1 and 0 < changed[0] < len(revised_chunks) - 1
+    _first_run(config, first_chunks)
+    
+    updater = IncrementalUpdater(config, 'offer.md')
+    reusable = updater.reusable_chunk_items(revised_chunks)
+    dirty = {changed[0], changed[0] + 1}
+    assert set(reusable) == {chunk['chunk_index'] for chunk in revised_chunks} - dirty
+    assert all(reusable[index] == {'chunk': index} for index in reusable)
+
+def test_ids_and_details_carry_over_to_the_revision(tmp_path):
+    config = {'checkpoint_dir': str(tmp_path)}
+    first_chunks, revised_chunks = _chunks(False), _chunks(True)
+    _first_run(config, first_chunks)
+    
+    updater = IncrementalUpdater(config, 'offer.md')
+    updater.reusable_chunk_items(revised_chunks)
+    names = [('Article nouveau', 0)] + [(f"Article {index}", index) for index in range(len(revised_chunks))]
+    structure = _structure(revised_chunks, names)
+    updater.assign_stable_ids(structure)
+    
+    items = _items(structure)
+    # Known items keep their IDs, the new one is numbered after them
+    assert [item['offer_item_id'] for item in items[1:]] == \
+        [f"1.1.{number}" for number in range(1, len(revised_chunks) + 1)]
+    assert items[0]['offer_item_id'] == f"1.1.{len(revised_chunks) + 1}"
+    
+    details = updater.reusable_details(structure)
+    clean_ids = {item['offer_item_id'] for item in items[1:]
+                 if item['chunk_id'].rsplit('_', 1)[-1] in updater.clean_hashes}
+    assert set(details) == clean_ids
+    assert len(clean_ids) == len(revised_chunks) - 2
@@ -0,0 +1,79 @@
+# tests/test_item_dedup_index.py
+import pytest
+
+from src.utils.item_dedup_index import ItemDedupIndex
+
+def _item(name, chunk_index, start_offset):
+    return {'name': name, 'chunk_index': chunk_index, 'start_offset': start_offset}
+
+def _merge(index, items, sub_group):
+    """Merge items the way the extractor does, returning those kept"""
+    kept = []
+    for item in items:
+        duplicate_of = index.find_duplicate(item, sub_group)
+        if duplicate_of is not None:
+            index.record_dropped(item, duplicate_of)
+            continue
+        index.add(item, sub_group)
+        kept.append(item)
+    return kept
+
+def test_identical_rows_in_one_chunk_are_kept():
+    index = ItemDedupIndex()
+    sub_group = {}
+    index.add_chunk(0, 500)
+    # Even at the same offset, items of one chunk are distinct rows
+    items = [_item('Coude acier DN 50', 0, 100), _item('Coude acier DN 50', 0, 100)]
+    assert len(_merge(index, items, sub_group)) == 2
+    assert index.dropped == []
+
+def test_item_repeated_in_chunk_overlap_is_dropped():
+    index = ItemDedupIndex()
+    sub_group = {}
+    index.add_chunk(0, 500)
+    _merge(index, [_item('Coude acier DN 50', 0, 450)], sub_group)
+    index.add_chunk(1, 900)
+    kept = _merge(index, [_item('Coude acier DN 50', 1, 452), _item('Tube acier DN 50', 1, 520)], sub_group)
+    assert [item['name'] for item in kept] == ['Tube acier DN 50']
+    assert index.dropped[0]['kept_chunk_index'] == 0
+
+def test_identical_row_after_previous_chunk_end_is_kept():
+    index = ItemDedupIndex(offset_tolerance=80)
+    sub_group = {}
+    index.add_chunk(0, 500)
+    _merge(index, [_item('Coude acier DN 50', 0, 460)], sub_group)
+    index.add_chunk(1, 900)
+    # Within the offset tolerance, but outside chunk 0: a separate row
+    assert len(_merge(index, [_item('Coude acier DN 50', 1, 510)], sub_group)) == 1
+
+def test_sizes_distinguish_similar_names():
+    index = ItemDedupIndex()
+    sub_group = {}
+    index.add_chunk(0, 500)
+    _merge(index, [_item('Vanne DN 80', 0, 450)], sub_group)
+    index.add_chunk(1, 900)
+    assert len(_merge(index, [_item('Vanne DN 65', 1, 450)], sub_group)) == 1
+
+def test_unlocated_items_match_previous_chunk_names():
+    index = ItemDedupIndex()
+    sub_group = {}
+    _merge(index, [_item('Purgeur automatique', 0, None)], sub_group)
+    assert _merge(index, [_item('Purgeur automatique', 1, None)], sub_group) == []
+    assert len(_merge(index, [_item('Purgeur automatique', 3, None)], sub_group)) == 1
+
+def test_identical_rows_get_separate_offsets():
+    pytest.importorskip('langchain')
+    from src.processors.markdown_chunker import MarkdownChunker
+    from src.processors.structure_delimiter_extractor import StructureDelimiterExtractor
+
+    row = "| 1 | Coude acier DN 50 | 4 | pce |"
+    document = f"#### 243. A. 1. Tuyauteries\n\n{row}\n{row}\n"
+    chunk = MarkdownChunker({}).create_overlapping_chunks(document)[0]
+    result = {'offer_item_groups': [{'name': '243. A.', 'offer_groups': [{
+        'name': '243. A. 1. Tuyauteries',
+        'offer_items': [{'name': 'Coude', 'start_delimiter': row, 'end_delimiter': row} for _ in range(2)]
+    }]}]}
+
+    StructureDelimiterExtractor({})._add_chunk_info_to_items(result, chunk)
+    offsets = [item['start_offset'] for item in result['offer_item_groups'][0]['offer_groups'][0]['offer_items']]
+    assert offsets == [document.index(row), document.rindex(row)]
@@ -0,0 +1,113 @@
+# tests/test_markdown_chunker.py
+import pytest
+
+from src.processors.markdown_chunker import (MarkdownChunker, chunk_content_hash,
+                                             compute_chunk_token_budget, count_tokens)
+
+def _document(item_count):
+    lines = []
+    for i in range(item_count):
+        if i % 25 == 0:
+            lines.append(f"\n## CFC {200 + i // 25} Installations\n")
+        lines.append(f"- Pos {i}: Tube acier DN {15 + i % 7 * 5}, {i % 13 + 1} m, Fr. {i * 17 % 900}.{i % 100:02d}")
+    return "\n".join(lines) + "\n"
+
+def _cdc_chunker():
+    return MarkdownChunker({'chunking_mode': 'content_defined', 'chunk_size': 1200, 'overlap_size': 150})
+
+def test_content_defined_chunks_cover_document():
+    document = _document(400)
+    chunks = _cdc_chunker().create_overlapping_chunks(document)
+    assert len(chunks) > 5
+    assert chunks[0]['start_char'] == 0
+    assert chunks[-1]['end_char'] == len(document)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk['start_char'] <= previous['end_char']
+
+def test_content_defined_boundaries_survive_an_edit():
+    document = _document(400)
+    middle = document.index("- Pos 200:")
+    edited = document[:middle] + "- Pos 199b: Coude acier 90° DN 25, 4 pièces\n" + document[middle:]
+    
+    chunker = _cdc_chunker()
+    before = [chunk_content_hash(chunk) for chunk in chunker.create_overlapping_chunks(document)]
+    after = [chunk_content_hash(chunk) for chunk in chunker.create_overlapping_chunks(edited)]
+    
+    changed = set(after) - set(before)
+    # Only the chunks around the edit (and their overlap neighbour) change
+    assert 1 <= len(changed) <= 3
+    assert len(set(before) & set(after)) >= len(before) - 3
+
+def _table(number, rows):
+    lines = [f"| Pos | Désignation table {number} | Qté | Prix |", "| --- | --- | --- | ---: |"]
+    lines += [f"| {number}.{row} | Tube acier DN {20 + row} | {row + 1} | {row * 12}.50 |" for row in range(rows)]
+    return "\n".join(lines) + "\n"
+
+def _tables_document():
+    sections = []
+    for number in range(12):
+        sections.append(f"## CFC {250 + number} Sanitaire\n\nFourniture et pose selon plans.\n\n"
+                        f"{_table(number, 4 + number % 5)}\n")
+    return "".join(sections)
+
+def _structure_chunker(budget):
+    return MarkdownChunker({'chunking_mode': 'structure', 'chunk_size': 1000, 'overlap_size': 0,
+                            'chunk_token_budget': budget})
+
+def test_structure_mode_never_splits_tables():
+    document = _tables_document()
+    chunks = _structure_chunker(200).create_overlapping_chunks(document)
+    assert len(chunks) > 3
+    
+    for number in range(12):
+        table = _table(number, 4 + number % 5)
+        table_start = document.index(table)
+        table_end = table_start + len(table)
+        holding = [chunk for chunk in chunks
+                   if chunk['start_char'] < table_end and chunk['end_char'] > table_start]
+        assert len(holding) == 1
+        assert table in holding[0].content
+
+def test_structure_chunks_carry_their_heading():
+    document = _tables_document()
+    chunks = _structure_chunker(200).create_overlapping_chunks(document)
+    for chunk in chunks:
+        # The last heading at or before the chunk start encloses it
+        heading_start = document.rindex("## CFC", 0, chunk['start_char'] + len("## CFC"))
+        heading = document[heading_start + 3:document.index("\n", heading_start)]
+        assert chunk['heading_path'] == [heading]
+    # A chunk never ends on a heading whose content is in the next chunk
+    for chunk in chunks[:-1]:
+        assert not chunk.content.rstrip().split("\n")[-1].startswith("## ")
+
+def test_oversized_table_is_split_at_row_boundaries():
+    table = _table(1, 60)
+    document = f"## CFC 251 Sanitaire\n\n{table}"
+    chunks = _structure_chunker(150).create_overlapping_chunks(document)
+    assert len(chunks) > 2
+    assert "".join(chunk.content for chunk in chunks) == document
+    for chunk in chunks:
+        assert chunk.content.endswith("\n")
+
+@pytest.mark.parametrize("mode", ['fixed', 'content_defined', 'structure'])
+def test_chunks_respect_token_budget(mode):
+    document = _document(300) + _tables_document() + "Remarque: " + "prix nets hors TVA, " * 200 + "\n"
+    chunker = MarkdownChunker({'chunking_mode': mode, 'chunk_size': 4000, 'overlap_size': 200})
+    chunker.set_token_budget(300)
+    chunks = chunker.create_overlapping_chunks(document)
+    
+    assert len(chunks) > 5
+    for chunk in chunks:
+        assert count_tokens(chunk.content) <= 300
+        assert chunk['estimated_tokens'] == count_tokens(chunk.content)
+    assert chunks[-1]['end_char'] == len(document)
+
+def test_token_budget_leaves_room_for_prompt_and_output():
+    config = {'context_window_size': 8192, 'chunk_token_margin': 0.1,
+              'llm_providers': {'structure_extraction': {'max_tokens': 2048}}}
+    assert compute_chunk_token_budget(config, 1000) == int((8192 - 1000 - 2048) * 0.9)
+
+def test_too_small_context_window_is_rejected():
+    config = {'context_window_size': 4096, 'llm_providers': {'structure_extraction': {'max_tokens': 2048}}}
+    with pytest.raises(ValueError):
+        compute_chunk_token_budget(config, 1900)
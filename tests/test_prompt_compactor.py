@@ -0,0 +1,44 @@
+# tests/test_prompt_compactor.py
+from src.processors.prompt_compactor import PromptCompactor, CompactionTotals
+
+ORIGINAL = (
+    "#### 243. A. 1. Tuyauteries\n\n\n\n"
+    "![](_page_3_Picture_1.jpeg)\n"
+    "| Pos |   Désignation        |  Qté  |\n"
+    "|-----|----------------------|-------|\n"
+    "| 1   |   Coude acier DN 50  |  4    |   \n"
+    "Raccords ..................... 12\n"
+)
+
+def test_compaction_shrinks_the_text():
+    compaction = PromptCompactor({'prompt_compaction': True}).compact(ORIGINAL)
+    assert len(compaction.text) < len(ORIGINAL)
+    assert '.jpeg' not in compaction.text and '....' not in compaction.text
+    assert '\n\n\n\n' not in compaction.text
+    assert '|---|---|---|' in compaction.text
+    assert compaction.tokens_saved > 0
+
+def test_verbatim_positions_map_back_to_the_same_characters():
+    compaction = PromptCompactor({'prompt_compaction': True}).compact(ORIGINAL)
+    for position, char in enumerate(compaction.text):
+        if not char.isspace() and char not in '-.':
+            assert ORIGINAL[compaction.to_original(position)] == char
+
+def test_delimiters_found_in_compacted_text_map_to_original_spans():
+    compaction = PromptCompactor({'prompt_compaction': True}).compact(ORIGINAL)
+    start, end = compaction.find_original("| 1 | Coude acier DN 50 | 4 |")
+    assert start == ORIGINAL.index("| 1   |")
+    # The span ends at the row's last pipe, before the trailing spaces that were removed
+    assert ORIGINAL[start:end] == "| 1   |   Coude acier DN 50  |  4    |"
+    start, end = compaction.find_original("Raccords 12")
+    assert ORIGINAL[start:end] == "Raccords ..................... 12"
+    assert compaction.find_original("Vanne") is None
+
+def test_disabled_compaction_is_identity_and_totals_are_per_phase():
+    assert PromptCompactor({}).compact(ORIGINAL).text == ORIGINAL
+    totals = CompactionTotals()
+    compactor = PromptCompactor({'prompt_compaction': True})
+    compactor.compact_text(ORIGINAL, 'phase_2', totals)
+    compactor.compact_text(ORIGINAL, 'phase_2', totals)
+    assert totals.report('phase_3') is None
+    assert totals.report('phase_2').startswith('Prompt compaction (phase_2):')
@@ -0,0 +1,143 @@
+# tests/test_section_detail_analyzer.py
+import json
+import re
+
+import pytest
+
+pytest.importorskip('langchain')
+from src.processors.section_detail_analyzer import SectionDetailAnalyzer
+
+CONTENT = "\n".join(f"Article {index} description du produit numero {index}" for index in range(4))
+CHUNK = {'chunk_id': 'chunk_0', 'content': CONTENT, 'start_char': 0, 'end_char': len(CONTENT)}
+
+class _BatchClient:
+    """Answers batch prompts for all listed keys except skipped ones, plus an unknown key"""
+    def __init__(self, skipped=()):
+        self.skipped = set(skipped)
+        self.prompts = []
+    
+    def invoke(self, task, prompt):
+        self.prompts.append(prompt)
+        keys = re.findall(r'item_key: (\S+) \|', prompt)
+        if not keys:
+            return json.dumps({'item_details': {'unit_quantity': 99},
+                               'extraction_metadata': {'confidence_level': 'high'}})
+        entries = [{'item_key': key, 'item_details': {'unit_quantity': int(key.rsplit('.', 1)[-1])},
+                    'extraction_metadata': {'confidence_level': 'high'}}
+                   for key in keys if key not in self.skipped]
+        entries.append({'item_key': '9.9.9', 'item_details': {'unit_quantity': 1}})
+        return json.dumps({'items': entries})
+
+def _structure():
+    items = [{'offer_item_id': f"1.1.{index}", 'name': f"Article {index}", 'chunk_id': 'chunk_0',
+              'start_delimiter': f"Article {index}", 'end_delimiter': f"numero {index}"}
+             for index in range(4)]
+    return {'offer_item_groups': [{'name': 'Sanitaire', 'offer_groups': [
+        {'name': 'Tuyauteries', 'offer_items': items}]}]}
+
+def _analyzer(**config):
+    return SectionDetailAnalyzer({'table_fast_path': False, **config})
+
+def _quantities(result):
+    items = result['offer_item_groups'][0]['offer_groups'][0]['offer_items']
+    return [item['details']['item_details']['unit_quantity'] for item in items]
+
+def test_batched_answers_are_matched_by_item_key():
+    analyzer = _analyzer(item_analysis_mode='batched', batch_output_tokens=2400, item_output_tokens=600)
+    analyzer.llm_client = client = _BatchClient()
+    result = analyzer.analyze_offer_items_detailed(_structure(), [CHUNK])
+    assert len(client.prompts) == 1
+    assert _quantities(result) == [0, 1, 2, 3]
+
+def test_items_missing_from_a_batch_answer_are_analyzed_alone():
+    analyzer = _analyzer(item_analysis_mode='batched', batch_output_tokens=2400, item_output_tokens=600)
+    analyzer.llm_client = client = _BatchClient(skipped={'1.1.2'})
+    result = analyzer.analyze_offer_items_detailed(_structure(), [CHUNK])
+    assert len(client.prompts) == 2
+    assert 'Article 2' in client.prompts[1] and 'item_key' not in client.prompts[1]
+    assert _quantities(result) == [0, 1, 99, 3]
+
+def test_batches_are_sized_by_the_output_token_budget():
+    analyzer = _analyzer(item_analysis_mode='batched', batch_output_tokens=1200, item_output_tokens=600)
+    analyzer.llm_client = client = _BatchClient()
+    result = analyzer.analyze_offer_items_detailed(_structure(), [CHUNK])
+    assert len(client.prompts) == 2
+    assert _quantities(result) == [0, 1, 2, 3]
+
+def _answer(confidence='high', found_quantity=True, found_price=False):
+    return {'item_details': {'unit_quantity': 1},
+            'extraction_metadata': {'confidence_level': confidence, 'found_quantity': found_quantity,
+                                    'found_price': found_price}}
+
+CASCADE_PROVIDERS = {'llm_providers': {'item_analysis_local': {}, 'structure_extraction': {}}}
+
+@pytest.mark.parametrize('answer, cascade, escalated', [
+    (None, {}, True),
+    (_answer('high'), {}, False),
+    (_answer('medium'), {}, False),
+    (_answer('low'), {}, True),
+    (_answer('high', found_quantity=False), {}, True),
+    (_answer('high', found_quantity=False), {'require_quantity': False}, False),
+    (_answer('high'), {'require_price': True}, True),
+    (_answer('high', found_price=True), {'require_price': True}, False),
+    (_answer('medium'), {'min_confidence': 'high'}, True),
+])
+def test_needs_escalation_against_the_cascade_thresholds(answer, cascade, escalated):
+    analyzer = _analyzer(analysis_cascade={'enabled': True, **cascade}, **CASCADE_PROVIDERS)
+    assert analyzer._needs_escalation(answer) is escalated
+
+def test_cascade_is_disabled_without_a_first_tier_provider():
+    assert not _analyzer(analysis_cascade={'enabled': True}).cascade_enabled
+    assert _analyzer(analysis_cascade={'enabled': True}, **CASCADE_PROVIDERS).cascade_enabled
+
+def test_cascade_persists_only_final_answers():
+    class TierClient:
+        calls = []
+        def invoke(self, task, prompt):
+            self.calls.append(task)
+            # The small model is unsure about odd items
+            uncertain = task == 'item_analysis_local' and re.search(r'Name: Article [13]', prompt)
+            return json.dumps(_answer('low' if uncertain else 'high'))
+
+    analyzer = _analyzer(analysis_cascade={'enabled': True}, **CASCADE_PROVIDERS)
+    analyzer.llm_client = TierClient()
+    saved = []
+    analyzer.analyze_offer_items_detailed(_structure(), [CHUNK],
+                                          on_item_analyzed=lambda item_id, details: saved.append(item_id))
+    assert TierClient.calls.count('item_analysis_local') == 4
+    assert TierClient.calls.count('structure_extraction') == 2
+    # Settled items are saved as they arrive, escalated ones once, after the second tier
+    assert saved == ['1.1.0', '1.1.2', '1.1.1', '1.1.3']
+
+def test_minimal_answer_takes_defaults_for_omitted_fields():
+    analyzer = _analyzer(item_output_schema='minimal')
+    details = analyzer._with_defaults({
+        'item_details': {'unit_quantity': 12, 'unit': 'm', 'unit_price': None},
+        'additional_fields': {'technical_specs': {'diameter': 'DN 50'}},
+        'extraction_metadata': {'found_quantity': True, 'confidence_level': 'high'}
+    })
+    full = analyzer._create_empty_details()
+    assert set(details['item_details']) == set(full['item_details'])
+    assert details['item_details']['unit_quantity'] == 12 and details['item_details']['unit'] == 'm'
+    # Omitted and null fields keep their defaults
+    assert details['item_details']['unit_price'] is None
+    assert details['item_details']['margin'] == 25
+    assert details['item_details']['article_number'] == 'not_available'
+    assert details['additional_fields'] == {'technical_specs': {'diameter': 'DN 50'}}
+    assert details['extraction_metadata'] == {'found_quantity': True, 'found_price': False,
+                                              'found_technical_specs': False, 'confidence_level': 'high'}
+
+def test_minimal_answer_without_findings_is_a_valid_analysis():
+    class EmptyClient:
+        def invoke(self, task, prompt):
+            return json.dumps({'extraction_metadata': {'found_quantity': False, 'confidence_level': 'low'}})
+
+    analyzer = _analyzer(item_output_schema='minimal')
+    analyzer.llm_client = EmptyClient()
+    saved = []
+    result = analyzer.analyze_offer_items_detailed(_structure(), [CHUNK],
+                                                   on_item_analyzed=lambda item_id, details: saved.append(item_id))
+    assert len(saved) == 4
+    details = result['offer_item_groups'][0]['offer_groups'][0]['offer_items'][0]['details']
+    assert details['item_details']['unit'] == 'not_available'
+    assert details['extraction_metadata']['confidence_level'] == 'low'
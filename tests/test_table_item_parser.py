@@ -0,0 +1,57 @@
+# tests/test_table_item_parser.py
+import pytest
+
+from src.processors.table_item_parser import TableItemParser, parse_number
+from src.utils.delimiter_index import DelimiterIndex
+
+HEADER = "| Pos | Désignation | Qté | Unité | PU CHF | Montant |\n|---|---|---|---|---|---|\n"
+
+@pytest.mark.parametrize('text, expected', [
+    ("1'234.50", 1234.5),
+    ("1’234.50", 1234.5),
+    ("1 234,50", 1234.5),
+    ("1.234,50", 1234.5),
+    ("1,234.50", 1234.5),
+    ("1.234.567", 1234567.0),
+    ("Fr. 12.50", 12.5),
+    ("CHF 300.-", 300.0),
+    ("12,5", 12.5),
+    ("", None),
+    ("env. 12", None),
+])
+def test_parse_number_formats(text, expected):
+    assert parse_number(text) == expected
+
+def test_row_with_consistent_amount_is_high_confidence():
+    parsed = TableItemParser().parse(HEADER + "| 1 | Tube acier DN 50 | 12 | ml | 1'234.50 | 14'814.00 |")
+    assert parsed['item_details'] == {'unit_quantity': 12.0, 'unit': 'm', 'unit_price': 1234.5,
+                                      'unit_type': 'MATERIAL', 'desc_html': '<p>Tube acier DN 50</p>'}
+    assert parsed['extraction_metadata']['confidence_level'] == 'high'
+
+def test_unit_price_derived_from_amount_and_inconsistent_amount_rejected():
+    parser = TableItemParser()
+    parsed = parser.parse(HEADER + "| 2 | Pose | 4 | h |  | 1.234,00 |")
+    assert parsed['item_details']['unit_price'] == 308.5
+    assert parsed['item_details']['unit_type'] == 'LABOR'
+    assert parser.parse(HEADER + "| 2 | Pose | 4 | h | 10.00 | 1.234,50 |") is None
+
+def test_continuation_rows_join_the_description():
+    parsed = TableItemParser().parse(HEADER + "| 3 | Vanne d'arrêt DN 50 | 4 | pce | 85.00 |  |\n"
+                                              "|   | à sphère, PN 16 |  |  |  |  |")
+    assert parsed['item_details']['desc_html'] == "<p>Vanne d&#x27;arrêt DN 50 à sphère, PN 16</p>"
+    assert parsed['item_details']['unit'] == 'pcs'
+    assert parsed['extraction_metadata']['confidence_level'] == 'medium'
+
+def test_rows_without_header_or_with_prose_are_left_to_the_llm():
+    parser = TableItemParser()
+    assert parser.parse("| 3 | Vanne d'arrêt DN 50 | 4 | pce | 85.00 |  |") is None
+    assert parser.parse(HEADER + "| 3 | Vanne | 4 | pce | 85.00 |  |\nMarque proposée: Nussbaum") is None
+    assert parser.parse(HEADER + "| 3 | Vanne | 4 | pce |  |  |\n| 4 | Coude | 2 | pce |  |  |") is None
+
+def test_continued_table_row_gets_its_header_from_the_document():
+    document = HEADER + "".join(f"| {i} | Tube DN {i} | {i} | m |  |  |\n" for i in range(1, 30))
+    index = DelimiterIndex(document)
+    row_start = document.index("| 25 |")
+    row_text = document[row_start:document.index('\n', row_start)]
+    parsed = TableItemParser().parse(index.table_header(row_start) + row_text)
+    assert parsed['item_details']['unit_quantity'] == 25.0
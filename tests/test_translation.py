@@ -0,0 +1,90 @@
+# tests/test_translation.py
+from src.translation.glossary import TranslationGlossary
+from src.translation.markdown_segmenter import MarkdownSegmenter
+
+REFERENCE = """Termes de référence:
+- Robinet = Faucet/Tap
+- Vanne = Valve
+- Chauffe-eau = Water heater
+"""
+
+def test_reference_text_accepts_alternatives():
+    glossary = TranslationGlossary.from_reference_text(REFERENCE)
+    assert glossary.terms['Robinet'] == ['Faucet', 'Tap']
+    assert glossary.terms['Chauffe-eau'] == ['Water heater']
+
+def test_accepted_rendering_is_left_alone():
+    glossary = TranslationGlossary.from_reference_text(REFERENCE)
+    translation, missing = glossary.enforce("Robinet chromé", "Chrome tap", 'french')
+    assert translation == "Chrome tap"
+    assert missing == []
+
+def test_untranslated_term_is_substituted():
+    glossary = TranslationGlossary.from_reference_text(REFERENCE)
+    translation, missing = glossary.enforce("Vanne à bille DN 25", "Ball vanne DN 25", 'french')
+    assert translation == "Ball Valve DN 25"
+    assert missing == []
+
+def test_mistranslated_term_is_reported():
+    glossary = TranslationGlossary.from_reference_text(REFERENCE)
+    translation, missing = glossary.enforce("Chauffe-eau 200 l", "Boiler 200 l", 'french')
+    assert translation == "Boiler 200 l"
+    assert missing == ['Chauffe-eau']
+
+def test_terms_match_whole_words_only():
+    glossary = TranslationGlossary({'Vanne': 'Valve'})
+    _, missing = glossary.enforce("Vannerie", "Basketry", 'french')
+    assert missing == []
+
+def test_english_to_french_direction():
+    glossary = TranslationGlossary.from_reference_text(REFERENCE)
+    translation, missing = glossary.enforce("Kitchen tap", "Tap de cuisine", 'english')
+    assert translation == "Robinet de cuisine"
+    assert missing == []
+
+def test_added_terms_override_reference():
+    glossary = TranslationGlossary.from_reference_text(REFERENCE)
+    glossary.add_term('Vanne', 'Valve/Gate valve')
+    _, missing = glossary.enforce("Vanne", "Gate valve", 'french')
+    assert missing == []
+
+MARKDOWN = """# Offre de prix
+
+## Sanitaire
+
+- Robinet chromé
+1. Vanne à bille
+
+| Pos | Désignation | Prix |
+| --- | :--- | ---: |
+| 1 | Tube acier | 12.50 |
+
+Texte libre du paragraphe.
+  Ligne indentée   
+---
+1'234.50
+"""
+
+def test_segments_cover_translatable_text_only():
+    segments, _ = MarkdownSegmenter().segment(MARKDOWN)
+    assert segments == ["Offre de prix", "Sanitaire", "Robinet chromé", "Vanne à bille",
+                        "Pos", "Désignation", "Prix", "Tube acier",
+                        "Texte libre du paragraphe.", "Ligne indentée"]
+
+def test_rebuild_with_identity_round_trips():
+    segmenter = MarkdownSegmenter()
+    segments, template = segmenter.segment(MARKDOWN)
+    assert segmenter.rebuild(template, segments) == MARKDOWN
+
+def test_rebuild_keeps_markup_around_translations():
+    segmenter = MarkdownSegmenter()
+    segments, template = segmenter.segment(MARKDOWN)
+    rebuilt = segmenter.rebuild(template, [segment.upper() for segment in segments])
+    lines = rebuilt.split('\n')
+    assert lines[0] == "# OFFRE DE PRIX"
+    assert "- ROBINET CHROMÉ" in lines
+    assert "1. VANNE À BILLE" in lines
+    assert "| --- | :--- | ---: |" in lines
+    assert "| 1 | TUBE ACIER | 12.50 |" in lines
+    assert "  LIGNE INDENTÉE   " in lines
+    assert "1'234.50" in lines